@@ -1,139 +1,205 @@
+import array
 import json
-import statistics
+import sys
+import numpy as np
 
-# Load the scores.json file
-with open('data/scores.json', 'r') as f:
-    data = json.load(f)
+# orjson is optional; it parses large score files noticeably faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Get all companies
-companies = data['companies']
+# Deletion table for markdown emphasis around scores (e.g. "**2**" -> "2")
+_MARKDOWN_CHARS = str.maketrans('', '', '*')
 
-# Get all metric names from the first company (assuming all have the same metrics)
-if companies:
-    first_ticker = list(companies.keys())[0]
-    metrics = list(companies[first_ticker].keys())
+
+def parse_cell(value, strip_markdown=True):
+    """Parse one score cell as an int.
+    
+    Plain integers and clean numeric strings take the fast path; markdown
+    asterisks are only stripped when the direct parse fails.
     
-    # Store statistics for each metric to calculate overall averages
-    all_averages = []
-    all_medians = []
-    all_mins = []
-    all_maxes = []
-    all_stdevs = []
+    Raises:
+        ValueError: If the value is not an integer score
+    """
+    if isinstance(value, int):
+        return value
+    value_str = value if isinstance(value, str) else str(value)
+    try:
+        return int(value_str)
+    except ValueError:
+        if not strip_markdown:
+            raise
+        return int(value_str.translate(_MARKDOWN_CHARS))
+
+
+def analyze(json_path='data/scores.json', strip_markdown=True):
+    """Print per-metric statistics and rankings for a scores JSON file.
     
-    # Store metric statistics for ranking
-    metric_stats = []
+    Args:
+        json_path: Path to a scores file with a top-level 'companies' dict
+        strip_markdown: If True, strip markdown asterisks (e.g. "**2**") before parsing
+    """
+    # Load the scores file
+    if orjson is not None:
+        with open(json_path, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+
+    # Get all companies
+    companies = data['companies']
+
+    # Get all metric names from the first company (assuming all have the same metrics)
+    if companies:
+        first_ticker = next(iter(companies))
+        metrics = list(companies[first_ticker])
     
-    # For each metric, collect all values across all tickers
-    for metric in metrics:
-        values = []
-        for ticker, company_data in companies.items():
-            # Get the value and handle markdown formatting (e.g., "**2**" -> "2")
-            value_str = str(company_data[metric]).strip()
-            # Remove markdown formatting (asterisks)
-            value_str = value_str.replace('*', '')
-            # Convert to int, skip if invalid
-            try:
-                value = int(value_str)
-                values.append(value)
-            except (ValueError, TypeError):
-                # Skip invalid values
+        # Store metric statistics for ranking
+        metric_stats = []
+    
+        # Pack every cell into a contiguous C double buffer in one pass, then view it
+        # as a (n_metrics, n_tickers) array without copying. Appending to an
+        # array.array is much cheaper than per-element NumPy item assignment.
+        # Invalid cells become NaN so the NaN-aware reductions below skip them.
+        cells = array.array('d')
+        for company_data in companies.values():
+            for metric in metrics:
+                # Convert to int, skip if invalid
+                try:
+                    cells.append(parse_cell(company_data.get(metric), strip_markdown))
+                except (ValueError, TypeError):
+                    # Skip invalid values
+                    cells.append(np.nan)
+        data = np.frombuffer(cells, dtype=np.float64).reshape(len(companies), len(metrics)).T
+    
+        # Compute all per-metric statistics with vectorized NumPy reductions
+        valid = ~np.isnan(data)
+        counts = valid.sum(axis=1)
+        has_values = counts > 0
+        avgs = np.full(len(metrics), np.nan)
+        medians = np.full(len(metrics), np.nan)
+        mins = np.full(len(metrics), np.nan)
+        maxes = np.full(len(metrics), np.nan)
+        stdevs = np.zeros(len(metrics))
+        if has_values.any():
+            rows = data[has_values]
+            # Mean and sample variance come from one zero-filled copy of the
+            # table rather than separate NaN-aware passes for each statistic
+            filled = np.where(valid, data, 0.0)
+            means = filled.sum(axis=1) / np.maximum(counts, 1)
+            deviations = np.where(valid, data - means[:, None], 0.0)
+            sum_sq = np.einsum('ij,ij->i', deviations, deviations)
+            avgs[has_values] = means[has_values]
+            medians[has_values] = np.nanmedian(rows, axis=1)
+            mins[has_values] = np.nanmin(rows, axis=1)
+            maxes[has_values] = np.nanmax(rows, axis=1)
+            multi = counts > 1
+            stdevs[multi] = np.sqrt(sum_sq[multi] / (counts[multi] - 1))
+    
+        # Build the per-metric report and the overall footer as one string and write it once
+        out = []
+        for metric, count, avg, median, min_val, max_val, stdev in zip(metrics, counts, avgs, medians, mins, maxes, stdevs):
+            # Skip if no valid values found
+            if count == 0:
+                out.append(f"{metric}:\n  No valid values found\n\n")
                 continue
         
-        # Skip if no valid values found
-        if len(values) == 0:
-            print(f"{metric}:")
-            print(f"  No valid values found")
-            print()
-            continue
-        
-        # Calculate statistics
-        avg = statistics.mean(values)
-        median = statistics.median(values)
-        min_val = min(values)
-        max_val = max(values)
-        stdev = statistics.stdev(values) if len(values) > 1 else 0
-        
-        # Store statistics for overall averages
-        all_averages.append(avg)
-        all_medians.append(median)
-        all_mins.append(min_val)
-        all_maxes.append(max_val)
-        all_stdevs.append(stdev)
+            avg = float(avg)
+            median = float(median)
+            min_val = int(min_val)
+            max_val = int(max_val)
+            stdev = float(stdev)
         
-        # Store metric statistics for ranking
-        metric_stats.append({
-            'metric': metric,
-            'avg': avg,
-            'median': median,
-            'min': min_val,
-            'max': max_val,
-            'stdev': stdev
-        })
+            # Store metric statistics for ranking
+            metric_stats.append({
+                'metric': metric,
+                'avg': avg,
+                'median': median,
+                'min': min_val,
+                'max': max_val,
+                'stdev': stdev
+            })
         
-        # Print results
-        print(f"{metric}:")
-        print(f"  Average: {avg:.2f}")
-        print(f"  Median: {median:.2f}")
-        print(f"  Min: {min_val}")
-        print(f"  Max: {max_val}")
-        print(f"  Std Dev: {stdev:.2f}")
-        print()
+            # Print results
+            out.append(
+                f"{metric}:\n"
+                f"  Average: {avg:.2f}\n"
+                f"  Median: {median:.2f}\n"
+                f"  Min: {min_val}\n"
+                f"  Max: {max_val}\n"
+                f"  Std Dev: {stdev:.2f}\n\n"
+            )
     
-    # Calculate and print overall averages across all metrics
-    print("=" * 50)
-    print("Overall Averages Across All Metrics:")
-    print("=" * 50)
-    print(f"  Average of Averages: {statistics.mean(all_averages):.2f}")
-    print(f"  Average of Medians: {statistics.mean(all_medians):.2f}")
-    print(f"  Average of Mins: {statistics.mean(all_mins):.2f}")
-    print(f"  Average of Maxes: {statistics.mean(all_maxes):.2f}")
-    print(f"  Average of Std Devs: {statistics.mean(all_stdevs):.2f}")
-    print()
+        # Calculate and print overall averages across all metrics
+        # Overall averages come straight from the per-metric arrays (metrics with values only)
+        rule = "=" * 50
+        out.append(
+            f"{rule}\n"
+            "Overall Averages Across All Metrics:\n"
+            f"{rule}\n"
+            f"  Average of Averages: {avgs[has_values].mean():.2f}\n"
+            f"  Average of Medians: {medians[has_values].mean():.2f}\n"
+            f"  Average of Mins: {mins[has_values].mean():.2f}\n"
+            f"  Average of Maxes: {maxes[has_values].mean():.2f}\n"
+            f"  Average of Std Devs: {stdevs[has_values].mean():.2f}\n\n"
+        )
+        sys.stdout.write(''.join(out))
     
-    # Display rankings for each statistic
-    if metric_stats:
-        # Rank by Average
-        print("=" * 50)
-        print("RANKING BY AVERAGE (Highest to Lowest):")
-        print("=" * 50)
-        sorted_by_avg = sorted(metric_stats, key=lambda x: x['avg'], reverse=True)
-        for rank, stat in enumerate(sorted_by_avg, 1):
-            print(f"  {rank:2d}. {stat['metric']:<40} {stat['avg']:>6.2f}")
-        print()
+        # Display rankings for each statistic
+        if metric_stats:
+            # Rank by Average
+            print("=" * 50)
+            print("RANKING BY AVERAGE (Highest to Lowest):")
+            print("=" * 50)
+            sorted_by_avg = sorted(metric_stats, key=lambda x: x['avg'], reverse=True)
+            for rank, stat in enumerate(sorted_by_avg, 1):
+                print(f"  {rank:2d}. {stat['metric']:<40} {stat['avg']:>6.2f}")
+            print()
         
-        # Rank by Median
-        print("=" * 50)
-        print("RANKING BY MEDIAN (Highest to Lowest):")
-        print("=" * 50)
-        sorted_by_median = sorted(metric_stats, key=lambda x: x['median'], reverse=True)
-        for rank, stat in enumerate(sorted_by_median, 1):
-            print(f"  {rank:2d}. {stat['metric']:<40} {stat['median']:>6.2f}")
-        print()
+            # Rank by Median
+            print("=" * 50)
+            print("RANKING BY MEDIAN (Highest to Lowest):")
+            print("=" * 50)
+            sorted_by_median = sorted(metric_stats, key=lambda x: x['median'], reverse=True)
+            for rank, stat in enumerate(sorted_by_median, 1):
+                print(f"  {rank:2d}. {stat['metric']:<40} {stat['median']:>6.2f}")
+            print()
         
-        # Rank by Min
-        print("=" * 50)
-        print("RANKING BY MIN (Highest to Lowest):")
-        print("=" * 50)
-        sorted_by_min = sorted(metric_stats, key=lambda x: x['min'], reverse=True)
-        for rank, stat in enumerate(sorted_by_min, 1):
-            print(f"  {rank:2d}. {stat['metric']:<40} {stat['min']:>6.0f}")
-        print()
+            # Rank by Min
+            print("=" * 50)
+            print("RANKING BY MIN (Highest to Lowest):")
+            print("=" * 50)
+            sorted_by_min = sorted(metric_stats, key=lambda x: x['min'], reverse=True)
+            for rank, stat in enumerate(sorted_by_min, 1):
+                print(f"  {rank:2d}. {stat['metric']:<40} {stat['min']:>6.0f}")
+            print()
         
-        # Rank by Max
-        print("=" * 50)
-        print("RANKING BY MAX (Highest to Lowest):")
-        print("=" * 50)
-        sorted_by_max = sorted(metric_stats, key=lambda x: x['max'], reverse=True)
-        for rank, stat in enumerate(sorted_by_max, 1):
-            print(f"  {rank:2d}. {stat['metric']:<40} {stat['max']:>6.0f}")
-        print()
+            # Rank by Max
+            print("=" * 50)
+            print("RANKING BY MAX (Highest to Lowest):")
+            print("=" * 50)
+            sorted_by_max = sorted(metric_stats, key=lambda x: x['max'], reverse=True)
+            for rank, stat in enumerate(sorted_by_max, 1):
+                print(f"  {rank:2d}. {stat['metric']:<40} {stat['max']:>6.0f}")
+            print()
         
-        # Rank by Std Dev (Highest variability to lowest)
-        print("=" * 50)
-        print("RANKING BY STANDARD DEVIATION (Highest to Lowest Variability):")
-        print("=" * 50)
-        sorted_by_stdev = sorted(metric_stats, key=lambda x: x['stdev'], reverse=True)
-        for rank, stat in enumerate(sorted_by_stdev, 1):
-            print(f"  {rank:2d}. {stat['metric']:<40} {stat['stdev']:>6.2f}")
-        print()
+            # Rank by Std Dev (Highest variability to lowest)
+            print("=" * 50)
+            print("RANKING BY STANDARD DEVIATION (Highest to Lowest Variability):")
+            print("=" * 50)
+            sorted_by_stdev = sorted(metric_stats, key=lambda x: x['stdev'], reverse=True)
+            for rank, stat in enumerate(sorted_by_stdev, 1):
+                print(f"  {rank:2d}. {stat['metric']:<40} {stat['stdev']:>6.2f}")
+            print()
+
+
+def main():
+    """Analyze the scores file given on the command line (defaults to data/scores.json)."""
+    json_path = sys.argv[1] if len(sys.argv) > 1 else 'data/scores.json'
+    analyze(json_path)
+
 
+if __name__ == "__main__":
+    main()
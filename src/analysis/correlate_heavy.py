@@ -140,7 +140,7 @@ def main():
             heavy_score_str = heavy_data_item.get(metric)
             
             # Only include if both scores exist
-            if light_score_str and heavy_score_str:
+            if light_score_str not in (None, '') and heavy_score_str not in (None, ''):
                 try:
                     light_score = float(light_score_str)
                     heavy_score = float(heavy_score_str)
@@ -3,13 +3,19 @@
 Calculate correlation between total scores and ranked stock returns
 Loads returns from returns.json and scores from scores.json
 Correlates total scores with ranked returns (not raw returns)
+Usage: python return_correlation.py [--no-pvalue]
+  --no-pvalue  Report correlations only, skipping the p-value calculations
 """
 
 import json
 import os
-from scipy.stats import pearsonr, rankdata, percentileofscore
+import sys
+from scipy.stats import rankdata, percentileofscore, t as student_t
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.utils.json_utils import read_json_file
+
 SCORES_FILE = "data/scores.json"
 RETURNS_FILE = "data/returns.json"
 TICKER_DEFINITIONS_FILE = "data/ticker_definitions.json"
@@ -64,6 +70,11 @@ SCORE_DEFINITIONS = {
     'size_well_known_score': {'is_reverse': False},
 }
 
+# Per-metric columns used to total many companies at once
+SCORE_KEYS = list(SCORE_DEFINITIONS)
+REVERSE_MASK = np.array([SCORE_DEFINITIONS[key]['is_reverse'] for key in SCORE_KEYS])
+WEIGHTS = np.array([SCORE_WEIGHTS.get(key, 1.0) for key in SCORE_KEYS], dtype=np.float64)
+
 
 def calculate_max_score():
     """Calculate the maximum possible total score.
@@ -79,6 +90,61 @@ def calculate_max_score():
     return max_score
 
 
+def _to_float(value):
+    """Parse a stored score, returning NaN if it isn't a number."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def calculate_total_scores(scores_dicts):
+    """Calculate total scores for many companies at once.
+    
+    Args:
+        scores_dicts: List of dictionaries with score keys and their string values
+        
+    Returns:
+        np.ndarray: The total weighted score of each dictionary, in order
+    """
+    # One row per company, one column per metric; a missing metric counts as 0
+    values = np.array(
+        [[_to_float(scores_dict.get(key, 0)) for key in SCORE_KEYS] for scores_dict in scores_dicts],
+        dtype=np.float64
+    ).reshape(len(scores_dicts), len(SCORE_KEYS))
+    # For reverse scores, invert to get "goodness" value
+    goodness = np.where(REVERSE_MASK, 10 - values, values)
+    # Unparseable scores add nothing to the total
+    goodness[np.isnan(goodness)] = 0.0
+    return goodness @ WEIGHTS
+
+
+def build_metric_matrix(scores_dicts):
+    """Per-metric "goodness" values for individual metric analysis.
+    
+    Args:
+        scores_dicts: List of dictionaries with score keys and their string values
+        
+    Returns:
+        np.ndarray: (companies, metrics) array in SCORE_KEYS order with reverse scores
+                    inverted, NaN where a company has no usable score for a metric
+    """
+    rows = []
+    for scores_dict in scores_dicts:
+        row = []
+        for score_key in SCORE_KEYS:
+            score_value_str = scores_dict.get(score_key)
+            # Handle moat_score backwards compatibility
+            if score_key == 'moat_score' and score_value_str in (None, ''):
+                score_value_str = scores_dict.get('score')
+            # A score of 0 is a real score; only None or an empty legacy string is missing
+            row.append(np.nan if score_value_str in (None, '') else _to_float(score_value_str))
+        rows.append(row)
+    values = np.array(rows, dtype=np.float64).reshape(len(scores_dicts), len(SCORE_KEYS))
+    # For reverse scores, invert to get "goodness" value
+    return np.where(REVERSE_MASK, 10 - values, values)
+
+
 def calculate_total_score(scores_dict):
     """Calculate total score from a dictionary of scores.
     
@@ -88,20 +154,7 @@ def calculate_total_score(scores_dict):
     Returns:
         float: The total weighted score (handling reverse scores appropriately)
     """
-    total = 0
-    for score_key in SCORE_DEFINITIONS:
-        score_def = SCORE_DEFINITIONS[score_key]
-        weight = SCORE_WEIGHTS.get(score_key, 1.0)  # Default to 1.0 if weight not found
-        try:
-            score_value = float(scores_dict.get(score_key, 0))
-            # For reverse scores, invert to get "goodness" value
-            if score_def['is_reverse']:
-                total += (10 - score_value) * weight
-            else:
-                total += score_value * weight
-        except (ValueError, TypeError):
-            pass
-    return total
+    return float(calculate_total_scores([scores_dict])[0])
 
 
 def calculate_total_score_percent(scores_dict, max_score):
@@ -120,6 +173,53 @@ def calculate_total_score_percent(scores_dict, max_score):
     return 0.0
 
 
+def pearson_correlation(x, y, with_p_value=True):
+    """Pearson correlation of two equal-length sequences, with its two-sided p-value.
+    
+    Computed directly as the normalized dot product of the mean-centered inputs; the
+    p-value comes from the equivalent t-test with n - 2 degrees of freedom.
+    
+    Args:
+        x, y: Equal-length sequences of numbers
+        with_p_value: If False, skip the t-distribution lookup (the bulk of the cost)
+                      and return None for the p-value
+    
+    Returns:
+        tuple: (correlation, p_value), both NaN if either input is constant
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    x_centered = x - x.mean()
+    y_centered = y - y.mean()
+    denominator = np.sqrt(x_centered.dot(x_centered) * y_centered.dot(y_centered))
+    if denominator == 0:
+        return np.nan, np.nan
+    correlation = float(np.clip(x_centered.dot(y_centered) / denominator, -1.0, 1.0))
+    if not with_p_value:
+        return correlation, None
+    if n <= 2 or abs(correlation) == 1.0:
+        # Two points always fit a line exactly; a perfect fit leaves no residual
+        return correlation, 1.0 if n <= 2 else 0.0
+    t_stat = correlation * np.sqrt((n - 2) / (1 - correlation * correlation))
+    p_value = float(2 * student_t.sf(abs(t_stat), n - 2))
+    return correlation, p_value
+
+
+def top_indices(values, k):
+    """Indices of the k largest values, largest first, with ties kept in their original order.
+    
+    Uses a partial partition to find the cutoff, so only the values at or above it are sorted.
+    """
+    values = np.asarray(values)
+    if k < len(values):
+        cutoff = np.partition(values, len(values) - k)[len(values) - k]
+        candidates = np.flatnonzero(values >= cutoff)
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.argsort(-values[candidates], kind='stable')][:k]
+
+
 def load_scores():
     """Load scores from scores.json."""
     if not os.path.exists(SCORES_FILE):
@@ -127,8 +227,7 @@ def load_scores():
         return None
     
     try:
-        with open(SCORES_FILE, 'r') as f:
-            data = json.load(f)
+        data = read_json_file(SCORES_FILE)
         return data.get("companies", {})
     except (json.JSONDecodeError, FileNotFoundError) as e:
         print(f"Error loading {SCORES_FILE}: {e}")
@@ -143,8 +242,7 @@ def load_returns():
         return None
     
     try:
-        with open(RETURNS_FILE, 'r') as f:
-            data = json.load(f)
+        data = read_json_file(RETURNS_FILE)
         return data
     except (json.JSONDecodeError, FileNotFoundError) as e:
         print(f"Error loading {RETURNS_FILE}: {e}")
@@ -156,8 +254,7 @@ def load_excluded_tickers():
     excluded = set()
     if os.path.exists(TICKER_DEFINITIONS_FILE):
         try:
-            with open(TICKER_DEFINITIONS_FILE, 'r') as f:
-                data = json.load(f)
+            data = read_json_file(TICKER_DEFINITIONS_FILE)
             definitions = data.get("definitions", {})
             # Extract all ticker symbols and convert to uppercase
             excluded = {ticker.upper() for ticker in definitions.keys()}
@@ -166,8 +263,12 @@ def load_excluded_tickers():
     return excluded
 
 
-def main():
-    """Main function to calculate and display correlation."""
+def main(with_p_values=True):
+    """Main function to calculate and display correlation.
+    
+    Args:
+        with_p_values: If False, report correlations without p-values or significance
+    """
     print("=" * 60)
     print("Score-Return Correlation Analysis")
     print("=" * 60)
@@ -206,40 +307,33 @@ def main():
     
     # Match companies and calculate total scores
     print("Calculating total scores and matching with returns...")
-    matched_data = []
-    excluded_count = 0
-    no_return_data_count = 0
-    failed_return_count = 0
+    # returns.json and the exclusion list are keyed by uppercase ticker
+    score_tickers = [ticker.upper() for ticker in scores_data]
+    score_dicts = list(scores_data.values())
+    # Only successful returns are usable
+    successful_tickers = {
+        ticker for ticker, return_info in returns_dict.items()
+        if return_info.get("status") == "success" and return_info.get("return") is not None
+    }
     
-    for ticker, scores_dict in scores_data.items():
-        ticker_upper = ticker.upper()
-        
-        # Skip if ticker is in excluded list
-        if ticker_upper in excluded_tickers:
-            excluded_count += 1
-            continue
-        
-        # Check if this ticker has return data
-        if ticker_upper in returns_dict:
-            return_info = returns_dict[ticker_upper]
-            
-            # Only include successful returns
-            if return_info.get("status") == "success" and return_info.get("return") is not None:
-                total_score = calculate_total_score(scores_dict)
-                total_score_percent = calculate_total_score_percent(scores_dict, max_score)
-                return_pct = return_info.get("return")
-                
-                matched_data.append({
-                    'ticker': ticker_upper,
-                    'total_score': total_score,
-                    'total_score_percent': total_score_percent,
-                    'return': return_pct,
-                    'scores_dict': scores_dict  # Store scores dict for individual metric analysis
-                })
-            else:
-                failed_return_count += 1
-        else:
-            no_return_data_count += 1
+    # Indices into scores.json order of the tickers not excluded, then of those with usable returns
+    candidate_indices = [i for i, ticker in enumerate(score_tickers) if ticker not in excluded_tickers]
+    matched_indices = [i for i in candidate_indices if score_tickers[i] in successful_tickers]
+    excluded_count = len(score_tickers) - len(candidate_indices)
+    no_return_data_count = sum(1 for i in candidate_indices if score_tickers[i] not in returns_dict)
+    failed_return_count = len(candidate_indices) - no_return_data_count - len(matched_indices)
+    
+    # Matched companies as parallel arrays, one entry per company: ticker, return, total score
+    tickers = np.array([score_tickers[i] for i in matched_indices], dtype=object)
+    matched_scores_dicts = [score_dicts[i] for i in matched_indices]  # For individual metric analysis
+    returns = np.fromiter(
+        (returns_dict[ticker]["return"] for ticker in tickers),
+        dtype=np.float64, count=len(tickers)
+    )
+    
+    # Total every matched company's scores in one pass
+    total_scores = calculate_total_scores(matched_scores_dicts)
+    total_scores_percent = total_scores / max_score * 100 if max_score > 0 else np.zeros(len(tickers))
     
     # Print diagnostic information
     print()
@@ -252,32 +346,22 @@ def main():
     print(f"Missing return data in returns.json: {no_return_data_count}")
     if failed_return_count > 0:
         print(f"Return data exists but status != 'success': {failed_return_count}")
-    print(f"Successfully matched: {len(matched_data)}")
+    print(f"Successfully matched: {len(tickers)}")
     print()
     
-    if len(matched_data) < 2:
+    if len(tickers) < 2:
         print("Error: Need at least 2 companies with both scores and returns to calculate correlation.")
         return
     
-    # Extract arrays for correlation calculation
-    total_scores = [d['total_score'] for d in matched_data]
-    total_scores_percent = [d['total_score_percent'] for d in matched_data]
-    returns = [d['return'] for d in matched_data]
-    
     # Calculate percentile ranks for both total scores and returns
     # Percentile rank: percentage of values that are below this value (0-100)
     # Using 'mean' method: average of 'strict' and 'weak' percentiles for ties
-    percentile_total_scores = [percentileofscore(total_scores, score, kind='mean') for score in total_scores]
-    percentile_returns = [percentileofscore(returns, ret, kind='mean') for ret in returns]
-    
-    # Add percentile rank values to each matched_data item for later display
-    for i, item in enumerate(matched_data):
-        item['percentile_total_score'] = percentile_total_scores[i]
-        item['percentile_return'] = percentile_returns[i]
+    percentile_total_scores = percentileofscore(total_scores, total_scores, kind='mean')
+    percentile_returns = percentileofscore(returns, returns, kind='mean')
     
     # Calculate correlation between percentile-ranked total scores and percentile-ranked returns
     # This is essentially a Spearman rank correlation using percentile ranks
-    correlation, p_value = pearsonr(percentile_total_scores, percentile_returns)
+    correlation, p_value = pearson_correlation(percentile_total_scores, percentile_returns, with_p_values)
     
     # Display results
     print("=" * 60)
@@ -286,7 +370,8 @@ def main():
     print("Note: Correlation is calculated using PERCENTILE-RANKED total scores vs PERCENTILE-RANKED returns")
     print("      (This is equivalent to Spearman rank correlation using percentile ranks)")
     print(f"Pearson Correlation Coefficient: {correlation:.4f}")
-    print(f"P-value: {p_value:.6f}")
+    if p_value is not None:
+        print(f"P-value: {p_value:.6f}")
     print()
     
     # Interpret correlation
@@ -305,45 +390,46 @@ def main():
     direction = "positive" if correlation > 0 else "negative"
     
     print(f"Interpretation: {strength.capitalize()} {direction} correlation")
-    if p_value < 0.05:
-        print(f"Statistically significant (p < 0.05)")
-    else:
-        print(f"Not statistically significant (p >= 0.05)")
+    if p_value is not None:
+        if p_value < 0.05:
+            print(f"Statistically significant (p < 0.05)")
+        else:
+            print(f"Not statistically significant (p >= 0.05)")
     print()
     
     # Display statistics
     print("=" * 60)
     print("STATISTICS")
     print("=" * 60)
-    print(f"Number of companies: {len(matched_data)}")
+    print(f"Number of companies: {len(tickers)}")
     print()
     print("Total Scores (% of max):")
-    print(f"  Mean: {np.mean(total_scores_percent):.2f}%")
+    print(f"  Mean: {total_scores_percent.mean():.2f}%")
     print(f"  Median: {np.median(total_scores_percent):.2f}%")
-    print(f"  Min: {min(total_scores_percent):.2f}%")
-    print(f"  Max: {max(total_scores_percent):.2f}%")
-    print(f"  Std Dev: {np.std(total_scores_percent):.2f}%")
+    print(f"  Min: {total_scores_percent.min():.2f}%")
+    print(f"  Max: {total_scores_percent.max():.2f}%")
+    print(f"  Std Dev: {total_scores_percent.std():.2f}%")
     print()
     print("Returns (%):")
-    print(f"  Mean: {np.mean(returns):+.2f}%")
+    print(f"  Mean: {returns.mean():+.2f}%")
     print(f"  Median: {np.median(returns):+.2f}%")
-    print(f"  Min: {min(returns):+.2f}%")
-    print(f"  Max: {max(returns):+.2f}%")
-    print(f"  Std Dev: {np.std(returns):.2f}%")
+    print(f"  Min: {returns.min():+.2f}%")
+    print(f"  Max: {returns.max():+.2f}%")
+    print(f"  Std Dev: {returns.std():.2f}%")
     print()
     print("Percentile-Ranked Total Scores (%):")
-    print(f"  Mean: {np.mean(percentile_total_scores):.2f}%")
+    print(f"  Mean: {percentile_total_scores.mean():.2f}%")
     print(f"  Median: {np.median(percentile_total_scores):.2f}%")
-    print(f"  Min: {min(percentile_total_scores):.2f}%")
-    print(f"  Max: {max(percentile_total_scores):.2f}%")
-    print(f"  Std Dev: {np.std(percentile_total_scores):.2f}%")
+    print(f"  Min: {percentile_total_scores.min():.2f}%")
+    print(f"  Max: {percentile_total_scores.max():.2f}%")
+    print(f"  Std Dev: {percentile_total_scores.std():.2f}%")
     print()
     print("Percentile-Ranked Returns (%):")
-    print(f"  Mean: {np.mean(percentile_returns):.2f}%")
+    print(f"  Mean: {percentile_returns.mean():.2f}%")
     print(f"  Median: {np.median(percentile_returns):.2f}%")
-    print(f"  Min: {min(percentile_returns):.2f}%")
-    print(f"  Max: {max(percentile_returns):.2f}%")
-    print(f"  Std Dev: {np.std(percentile_returns):.2f}%")
+    print(f"  Min: {percentile_returns.min():.2f}%")
+    print(f"  Max: {percentile_returns.max():.2f}%")
+    print(f"  Std Dev: {percentile_returns.std():.2f}%")
     print()
     
     # 10-Bucket Analysis: Split stocks by score percentiles
@@ -355,20 +441,10 @@ def main():
     print()
     
     # Create buckets: 0-10, 10-20, 20-30, ..., 90-100
-    buckets = [[] for _ in range(10)]
-    
-    for item in matched_data:
-        # Use percentile rank (0-100) to determine bucket
-        # This is the percentile rank of the score among all scores
-        score_percentile_rank = item['percentile_total_score']
-        # Determine which bucket (0-9) this stock belongs to
-        # Bucket 0: [0, 10), Bucket 1: [10, 20), ..., Bucket 9: [90, 100]
-        # For 100%, we want it in bucket 9 (90-100%)
-        if score_percentile_rank >= 100:
-            bucket_index = 9
-        else:
-            bucket_index = int(score_percentile_rank / 10)
-        buckets[bucket_index].append(item)
+    # Use each stock's percentile rank (0-100) among all scores to determine its bucket (0-9)
+    # Bucket 0: [0, 10), Bucket 1: [10, 20), ..., Bucket 9: [90, 100]
+    # For 100%, we want it in bucket 9 (90-100%)
+    bucket_indices = np.minimum((percentile_total_scores / 10).astype(int), 9)
     
     # Display results
     print(f"{'Bucket':<10} {'Score Range':<20} {'Count':<10} {'Median Return %':<20}")
@@ -376,9 +452,8 @@ def main():
     
     bucket_medians = []
     for i in range(10):
-        bucket = buckets[i]
-        if len(bucket) > 0:
-            bucket_returns = [item['return'] for item in bucket]
+        bucket_returns = returns[bucket_indices == i]
+        if len(bucket_returns) > 0:
             median_return = np.median(bucket_returns)
             bucket_medians.append(median_return)
             score_min = i * 10
@@ -387,7 +462,7 @@ def main():
                 score_range = f"{score_min}-{score_max}%"
             else:
                 score_range = f"{score_min}-{score_max}%"
-            print(f"{i+1:<10} {score_range:<20} {len(bucket):<10} {median_return:>+8.2f}%")
+            print(f"{i+1:<10} {score_range:<20} {len(bucket_returns):<10} {median_return:>+8.2f}%")
         else:
             bucket_medians.append(None)
             score_min = i * 10
@@ -405,8 +480,9 @@ def main():
     if len(valid_medians) >= 2:
         # Calculate correlation between bucket number and median return
         bucket_numbers = [i for i, m in enumerate(bucket_medians) if m is not None]
-        bucket_corr, bucket_p = pearsonr(bucket_numbers, valid_medians)
-        print(f"Correlation between score bucket and median return: {bucket_corr:+.4f} (p={bucket_p:.6f})")
+        bucket_corr, bucket_p = pearson_correlation(bucket_numbers, valid_medians, with_p_values)
+        bucket_p_str = f" (p={bucket_p:.6f})" if bucket_p is not None else ""
+        print(f"Correlation between score bucket and median return: {bucket_corr:+.4f}{bucket_p_str}")
         if bucket_corr > 0:
             print("Trend: Higher score buckets tend to have higher returns")
         elif bucket_corr < 0:
@@ -419,46 +495,49 @@ def main():
     print("=" * 60)
     print("TOP 10 BY TOTAL SCORE")
     print("=" * 60)
-    sorted_by_score = sorted(matched_data, key=lambda x: x['total_score'], reverse=True)
     print(f"{'Ticker':<10} {'Score %':<15} {'Return %':<15}")
     print("-" * 60)
-    for item in sorted_by_score[:10]:
-        print(f"{item['ticker']:<10} {item['total_score_percent']:>11.2f}%    {item['return']:>+8.2f}%")
+    for i in top_indices(total_scores, 10):
+        print(f"{tickers[i]:<10} {total_scores_percent[i]:>11.2f}%    {returns[i]:>+8.2f}%")
     print()
     
     print("=" * 60)
     print("TOP 10 BY RETURN")
     print("=" * 60)
-    sorted_by_return = sorted(matched_data, key=lambda x: x['return'], reverse=True)
     print(f"{'Ticker':<10} {'Score %':<15} {'Return %':<15}")
     print("-" * 60)
-    for item in sorted_by_return[:10]:
-        print(f"{item['ticker']:<10} {item['total_score_percent']:>11.2f}%    {item['return']:>+8.2f}%")
+    for i in top_indices(returns, 10):
+        print(f"{tickers[i]:<10} {total_scores_percent[i]:>11.2f}%    {returns[i]:>+8.2f}%")
     print()
     
     # Show scatter plot data points (top and bottom)
+    # Quadrants relative to the median score and median return, each computed once
+    median_score_percent = np.median(total_scores_percent)
+    median_return = np.median(returns)
+    score_plus_return = total_scores_percent + returns
+    
     print("=" * 60)
     print("EXAMPLES: High Score, High Return")
     print("=" * 60)
-    # Find companies with both high score and high return
-    high_score_high_return = [d for d in matched_data if d['total_score_percent'] > np.median(total_scores_percent) and d['return'] > np.median(returns)]
-    high_score_high_return.sort(key=lambda x: x['total_score_percent'] + x['return'], reverse=True)
+    # Find companies with both high score and high return, best combined first (stable, so ties keep file order)
+    high_indices = np.flatnonzero((total_scores_percent > median_score_percent) & (returns > median_return))
+    high_indices = high_indices[np.argsort(-score_plus_return[high_indices], kind='stable')]
     print(f"{'Ticker':<10} {'Score %':<15} {'Return %':<15}")
     print("-" * 60)
-    for item in high_score_high_return[:5]:
-        print(f"{item['ticker']:<10} {item['total_score_percent']:>11.2f}%    {item['return']:>+8.2f}%")
+    for i in high_indices[:5]:
+        print(f"{tickers[i]:<10} {total_scores_percent[i]:>11.2f}%    {returns[i]:>+8.2f}%")
     print()
     
     print("=" * 60)
     print("EXAMPLES: Low Score, Low Return")
     print("=" * 60)
-    # Find companies with both low score and low return
-    low_score_low_return = [d for d in matched_data if d['total_score_percent'] < np.median(total_scores_percent) and d['return'] < np.median(returns)]
-    low_score_low_return.sort(key=lambda x: x['total_score_percent'] + x['return'])
+    # Find companies with both low score and low return, worst combined first
+    low_indices = np.flatnonzero((total_scores_percent < median_score_percent) & (returns < median_return))
+    low_indices = low_indices[np.argsort(score_plus_return[low_indices], kind='stable')]
     print(f"{'Ticker':<10} {'Score %':<15} {'Return %':<15}")
     print("-" * 60)
-    for item in low_score_low_return[:5]:
-        print(f"{item['ticker']:<10} {item['total_score_percent']:>11.2f}%    {item['return']:>+8.2f}%")
+    for i in low_indices[:5]:
+        print(f"{tickers[i]:<10} {total_scores_percent[i]:>11.2f}%    {returns[i]:>+8.2f}%")
     print()
     
     # Calculate correlations for individual metrics
@@ -495,47 +574,30 @@ def main():
         'size_well_known_score': 'Size / Well Known',
     }
     
-    for score_key in SCORE_DEFINITIONS:
-        score_def = SCORE_DEFINITIONS[score_key]
+    # Metric scores for all companies, one column per metric
+    metric_matrix = build_metric_matrix(matched_scores_dicts)
+    
+    for column, score_key in enumerate(SCORE_KEYS):
         display_name = display_name_map.get(score_key, score_key.replace('_', ' ').title())
         
-        # Extract metric scores for all companies
-        metric_scores = []
-        valid_indices = []  # Track which companies have valid scores for this metric
-        
-        for i, item in enumerate(matched_data):
-            scores_dict = item['scores_dict']
-            score_value_str = scores_dict.get(score_key)
-            
-            # Handle moat_score backwards compatibility
-            if score_key == 'moat_score' and not score_value_str:
-                score_value_str = scores_dict.get('score')
-            
-            if score_value_str:
-                try:
-                    score_value = float(score_value_str)
-                    # For reverse scores, invert to get "goodness" value
-                    if score_def['is_reverse']:
-                        score_value = 10 - score_value
-                    metric_scores.append(score_value)
-                    valid_indices.append(i)
-                except (ValueError, TypeError):
-                    continue
+        # Companies with valid scores for this metric
+        valid = ~np.isnan(metric_matrix[:, column])
+        metric_scores = metric_matrix[valid, column]
         
         # Need at least 2 companies with valid scores for this metric
         if len(metric_scores) < 2:
             continue
         
         # Calculate percentile ranks for this metric
-        percentile_metric_scores = [percentileofscore(metric_scores, score, kind='mean') for score in metric_scores]
+        percentile_metric_scores = percentileofscore(metric_scores, metric_scores, kind='mean')
         
         # Get corresponding return percentiles for companies with valid metric scores
-        corresponding_return_percentiles = [percentile_returns[i] for i in valid_indices]
+        corresponding_return_percentiles = percentile_returns[valid]
         
         # Calculate correlation
         if len(percentile_metric_scores) >= 2 and len(corresponding_return_percentiles) >= 2:
             try:
-                corr, p_val = pearsonr(percentile_metric_scores, corresponding_return_percentiles)
+                corr, p_val = pearson_correlation(percentile_metric_scores, corresponding_return_percentiles, with_p_values)
                 metric_correlations.append({
                     'metric': score_key,
                     'display_name': display_name,
@@ -563,9 +625,13 @@ def main():
         if len(display_name) > 38:
             display_name = display_name[:35] + "..."
         
-        significant = "Yes" if p_val < 0.05 else "No"
+        if p_val is None:
+            significant = "N/A"
+            p_val_str = "N/A"
+        else:
+            significant = "Yes" if p_val < 0.05 else "No"
+            p_val_str = f"{p_val:.6f}"
         corr_str = f"{corr:+.4f}"
-        p_val_str = f"{p_val:.6f}"
         
         print(f"{display_name:<40} {corr_str:<15} {p_val_str:<15} {n:<10} {significant:<15}")
     
@@ -575,14 +641,15 @@ def main():
     print("=" * 60)
     print("ALL TICKERS RANKED BY TOTAL SCORE")
     print("=" * 60)
-    sorted_by_score = sorted(matched_data, key=lambda x: x['total_score'], reverse=True)
+    # Highest total first; the stable sort keeps ties in scores.json order
+    order = np.argsort(-total_scores, kind='stable')
     print(f"{'Rank':<6} {'Ticker':<10} {'Score %':<15} {'Return %':<15} {'Score Pctile':<15} {'Return Pctile':<15}")
     print("-" * 85)
-    for rank, item in enumerate(sorted_by_score, 1):
-        print(f"{rank:<6} {item['ticker']:<10} {item['total_score_percent']:>11.2f}%    {item['return']:>+8.2f}%    {item['percentile_total_score']:>12.2f}%    {item['percentile_return']:>12.2f}%")
+    for rank, i in enumerate(order, 1):
+        print(f"{rank:<6} {tickers[i]:<10} {total_scores_percent[i]:>11.2f}%    {returns[i]:>+8.2f}%    {percentile_total_scores[i]:>12.2f}%    {percentile_returns[i]:>12.2f}%")
     print()
 
 
 if __name__ == "__main__":
-    main()
+    main(with_p_values="--no-pvalue" not in sys.argv[1:])
 
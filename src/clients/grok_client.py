@@ -4,44 +4,236 @@ Grok LLM API Client
 A Python program that integrates with xAI's Grok language model API.
 """
 
+import contextlib
+import itertools
 import openai
 import os
+import queue
 import sys
-from typing import List, Dict, Optional
+import threading
+import time
+from typing import Iterator, List, Dict, Optional, Tuple, Union
 import json
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.clients.retry import RETRY_MAX_DELAY, call_with_retries, retry_after
+
+# httpx is the transport underneath the openai SDK; HTTP/2 additionally needs the h2 package
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# readline, where available, gives input() line editing and history in the interactive demo
+try:
+    import readline  # noqa: F401
+except ImportError:
+    pass
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_shared_http_client = None
+_shared_http_client_lock = threading.Lock()
+
+# Every client shares one connection pool, so it only needs warming once per process
+_prewarm_started = False
+_prewarm_lock = threading.Lock()
+
+
+def get_shared_http_client():
+    """
+    Get the process-wide HTTP client shared by all GrokClient instances.
+    
+    Sharing one pooled client means concurrent callers (e.g. the moat sorter's
+    parallel merges) reuse warm connections, and with HTTP/2 they multiplex
+    over a single TLS connection instead of opening one per request.
+    
+    Returns:
+        httpx.Client, or None if httpx is not installed
+    """
+    global _shared_http_client
+    if httpx is None:
+        return None
+    if _shared_http_client is None:
+        with _shared_http_client_lock:
+            if _shared_http_client is None:
+                _shared_http_client = httpx.Client(
+                    http2=HTTP2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_connections=20,
+                        max_keepalive_connections=20,
+                        keepalive_expiry=60.0
+                    )
+                )
+    return _shared_http_client
+
 
 class GrokClient:
     """
     A client for interacting with xAI's Grok language model API.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Seconds to rest a key after a 429 when the response has no Retry-After header
+    DEFAULT_RATE_LIMIT_COOLDOWN = 30.0
+    
+    def __init__(self, api_key: Union[str, List[str], None] = None, cache=None, prewarm: bool = False):
         """
         Initialize the Grok client.
         
         Args:
-            api_key: xAI API key. If not provided, will try to get from XAI_API_KEY env var.
+            api_key: xAI API key, a comma-separated string of keys, or a list of keys.
+                     If not provided, will try to get from XAI_API_KEY env var (which may
+                     also be comma-separated). Requests are spread round-robin across keys
+                     so concurrent callers get the combined rate limit of all of them.
+            cache: Optional ResponseCache (see response_cache.py). When set, deterministic
+                   (temperature=0) calls to chat_completion_with_tokens are answered from
+                   the cache when an identical request has been made before.
+            prewarm: Open a connection to the API on a background thread right away, so the
+                     first request doesn't pay for the TCP and TLS handshake. Meant for
+                     interactive sessions; only the first prewarm in a process does anything.
         """
-        self.api_key = api_key or os.getenv("XAI_API_KEY")
+        api_key = api_key or os.getenv("XAI_API_KEY")
+        if isinstance(api_key, str):
+            api_keys = [key.strip() for key in api_key.split(",") if key.strip()]
+        else:
+            api_keys = [key for key in (api_key or []) if key]
+        self.cache = cache
         
-        if not self.api_key:
+        if not api_keys:
             raise ValueError(
                 "API key is required. Set XAI_API_KEY environment variable or pass api_key parameter."
             )
+        self.api_key = api_keys[0]
         
-        # Initialize OpenAI client configured for xAI's API
-        self.client = openai.OpenAI(
-            api_key=self.api_key,
-            base_url="https://api.x.ai/v1"
-        )
+        # Initialize one OpenAI client per key configured for xAI's API, all on the shared connection pool
+        self.clients = [
+            openai.OpenAI(
+                api_key=key,
+                base_url="https://api.x.ai/v1",
+                http_client=get_shared_http_client(),
+                # Retries are handled by _create_completion so they can rotate keys
+                max_retries=0
+            )
+            for key in api_keys
+        ]
+        self.client = self.clients[0]
+        
+        # Round-robin key selection; keys that hit a rate limit are skipped until their cooldown ends
+        self._key_cycle = itertools.cycle(range(len(self.clients)))
+        self._cooldown_until = [0.0] * len(self.clients)
+        self._key_lock = threading.Lock()
         
         # Available Grok models
-        self.available_models = [
+        self.available_models = (
             "grok-4-latest",
             "grok-3-latest",
             "grok-2-latest"
-        ]
+        )
+        
+        if prewarm:
+            self._start_prewarm()
+    
+    def _start_prewarm(self) -> None:
+        """Start _prewarm_connection on a background thread, unless a client already has."""
+        global _prewarm_started
+        with _prewarm_lock:
+            if _prewarm_started:
+                return
+            _prewarm_started = True
+        threading.Thread(target=self._prewarm_connection, daemon=True).start()
+    
+    def _prewarm_connection(self) -> None:
+        """Make a cheap request so a kept-alive connection is ready for the first real call."""
+        try:
+            self.client.models.list()
+        except Exception:
+            # Best effort only; the real request will surface any connection or auth problem
+            pass
+    
+    def _next_client(self) -> tuple[int, "openai.OpenAI"]:
+        """
+        Pick the next API client in round-robin order, skipping rate-limited keys.
+        
+        Returns:
+            Tuple of (key_index, client). If every key is cooling off, the one
+            whose cooldown ends first is returned.
+        """
+        with self._key_lock:
+            now = time.monotonic()
+            for _ in range(len(self.clients)):
+                index = next(self._key_cycle)
+                if self._cooldown_until[index] <= now:
+                    return index, self.clients[index]
+            index = min(range(len(self.clients)), key=self._cooldown_until.__getitem__)
+            return index, self.clients[index]
+    
+    def _mark_rate_limited(self, index: int, error: "openai.APIError") -> None:
+        """Rest a key after a 429, for Retry-After seconds if the API provided it."""
+        cooldown = retry_after(error)
+        if cooldown is None:
+            cooldown = self.DEFAULT_RATE_LIMIT_COOLDOWN
+        with self._key_lock:
+            self._cooldown_until[index] = time.monotonic() + cooldown
+    
+    def _request_slot(self, messages: List[Dict[str, str]], max_tokens: int):
+        """
+        Context manager held around each API request.
+        
+        GrokClient does not limit requests itself; ConcurrentGrokClient overrides
+        this to enforce concurrency, request-rate and token-rate limits.
+        """
+        return contextlib.nullcontext()
+    
+    def _rate_limit_delay(self, error: "openai.APIError", delay: float) -> float:
+        """Wait after a 429 no longer than it takes for the soonest key to come off cooldown."""
+        with self._key_lock:
+            cooldown = min(self._cooldown_until) - time.monotonic()
+        return max(0.0, min(cooldown, RETRY_MAX_DELAY))
+    
+    def _create_completion(self, messages: List[Dict[str, str]], max_tokens: int, hold_slot: bool = False,
+                           **create_kwargs):
+        """
+        Call chat.completions.create, retrying transient failures (see retry.py).
+        
+        A 429 also rests its key, so with several keys the retry goes to another
+        one; with a single key the wait honours the Retry-After header.
+        
+        Args:
+            hold_slot: Keep the request slot after returning, for streamed responses
+                       whose tokens are still to be read. The caller must close the
+                       returned slot once it is done with the response.
+        
+        Returns:
+            The API response object, or (response, slot) if hold_slot is True, where
+            slot is a contextlib.ExitStack that releases the request slot when closed
+        
+        Raises:
+            openai.APIError: The last error, once retries are exhausted or the
+                error is not retryable
+        """
+        def attempt():
+            key_index, client = self._next_client()
+            try:
+                with contextlib.ExitStack() as slot:
+                    slot.enter_context(self._request_slot(messages, max_tokens))
+                    response = client.chat.completions.create(
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        **create_kwargs
+                    )
+                    if hold_slot:
+                        return response, slot.pop_all()
+                    return response
+            except openai.APIStatusError as e:
+                if e.status_code == 429:
+                    self._mark_rate_limited(key_index, e)
+                raise
+        
+        return call_with_retries(attempt, rate_limit_delay=self._rate_limit_delay)
     
     def chat_completion(
         self,
@@ -65,20 +257,21 @@ class GrokClient:
             Generated response text
         """
         try:
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
+                messages,
+                max_tokens,
                 model=model,
-                messages=messages,
                 temperature=temperature,
-                max_tokens=max_tokens,
                 **kwargs
             )
             
             return response.choices[0].message.content
             
         except openai.APIError as e:
-            if e.status_code == 429:
+            status_code = getattr(e, "status_code", None)
+            if status_code == 429:
                 raise Exception("Rate limit exceeded. Please try again later.")
-            elif e.status_code == 401:
+            elif status_code == 401:
                 raise Exception("Invalid API key. Please check your XAI_API_KEY.")
             else:
                 raise Exception(f"API error: {e}")
@@ -104,14 +297,29 @@ class GrokClient:
             **kwargs: Additional parameters for the API call
             
         Returns:
-            Tuple of (response_text, token_usage_dict)
+            Tuple of (response_text, token_usage_dict). Responses served from the cache
+            report zero tokens and set token_usage['cache_hit'] = True.
         """
+        # Only deterministic requests with no extra API parameters are cacheable
+        cache_key = None
+        if self.cache is not None and temperature == 0 and not kwargs:
+            cache_key = self.cache.make_key(model, messages, temperature, max_tokens)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                response_text, _ = cached
+                return response_text, {
+                    'prompt_tokens': 0,
+                    'completion_tokens': 0,
+                    'total_tokens': 0,
+                    'cache_hit': True,
+                }
+        
         try:
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
+                messages,
+                max_tokens,
                 model=model,
-                messages=messages,
                 temperature=temperature,
-                max_tokens=max_tokens,
                 **kwargs
             )
             
@@ -174,18 +382,78 @@ class GrokClient:
                 token_usage['completion_tokens'] = completion_tokens + thinking_tokens
                 token_usage['output_tokens'] = completion_tokens + thinking_tokens
             
+            # An empty reply (e.g. the completion cap was used up) is never worth replaying
+            if cache_key is not None and response_text:
+                self.cache.set(cache_key, response_text, token_usage)
+            
             return response_text, token_usage
             
         except openai.APIError as e:
-            if e.status_code == 429:
+            status_code = getattr(e, "status_code", None)
+            if status_code == 429:
                 raise Exception("Rate limit exceeded. Please try again later.")
-            elif e.status_code == 401:
+            elif status_code == 401:
                 raise Exception("Invalid API key. Please check your XAI_API_KEY.")
             else:
                 raise Exception(f"API error: {e}")
         except Exception as e:
             raise Exception(f"Unexpected error: {e}")
     
+    def chat_completion_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "grok-4-latest",
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Generate a chat completion using Grok, yielding text as it is generated.
+        
+        Text arrives from the first token instead of after the whole completion.
+        Closing the generator early (e.g. breaking out of the loop once the answer
+        is known) closes the HTTP stream so the rest of the generation is dropped.
+        The request slot (see _request_slot) is held until the stream is closed.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content' keys
+            model: Grok model to use
+            temperature: Controls randomness (0.0 to 1.0)
+            max_tokens: Maximum tokens to generate
+            **kwargs: Additional parameters for the API call
+            
+        Yields:
+            Chunks of generated response text
+        """
+        try:
+            response, slot = self._create_completion(
+                messages,
+                max_tokens,
+                hold_slot=True,
+                model=model,
+                temperature=temperature,
+                stream=True,
+                **kwargs
+            )
+        except openai.APIError as e:
+            status_code = getattr(e, "status_code", None)
+            if status_code == 429:
+                raise Exception("Rate limit exceeded. Please try again later.")
+            elif status_code == 401:
+                raise Exception("Invalid API key. Please check your XAI_API_KEY.")
+            else:
+                raise Exception(f"API error: {e}")
+        except Exception as e:
+            raise Exception(f"Unexpected error: {e}")
+        
+        with slot:
+            try:
+                for chunk in response:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                response.close()
+    
     def simple_query(self, query: str, model: str = "grok-4-latest") -> str:
         """
         Send a simple query to Grok and get a response.
@@ -240,14 +508,110 @@ class GrokClient:
         messages = conversation_history + [{"role": "user", "content": new_message}]
         return self.chat_completion(messages, model=model)
     
-    def get_available_models(self) -> List[str]:
+    def get_available_models(self) -> Tuple[str, ...]:
         """
-        Get list of available Grok models.
+        Get available Grok models.
         
         Returns:
-            List of available model names
+            Tuple of available model names (wrap in list() if a mutable copy is needed)
+        """
+        return self.available_models
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that refills continuously up to a per-minute capacity.
+    """
+    
+    def __init__(self, per_minute: float):
+        """
+        Args:
+            per_minute: Bucket capacity, refilled evenly over one minute
         """
-        return self.available_models.copy()
+        self.capacity = float(per_minute)
+        self.available = float(per_minute)
+        self.refill_per_second = per_minute / 60.0
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self, amount: float = 1.0) -> None:
+        """Block until `amount` units are available, then take them."""
+        # Requests larger than the whole bucket would never fit; let them drain it instead
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.available = min(self.capacity, self.available + (now - self.updated_at) * self.refill_per_second)
+                self.updated_at = now
+                if self.available >= amount:
+                    self.available -= amount
+                    return
+                wait = (amount - self.available) / self.refill_per_second
+            time.sleep(wait)
+
+
+class ConcurrentGrokClient(GrokClient):
+    """
+    A GrokClient that limits in-flight requests and keeps under per-minute request
+    and token budgets, waiting before a request instead of tripping a 429.
+    
+    Token usage is estimated before each request as ~4 characters per prompt
+    token plus max_tokens for the completion.
+    """
+    
+    def __init__(
+        self,
+        api_key: Union[str, List[str], None] = None,
+        cache=None,
+        max_concurrent_requests: int = 8,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None
+    ):
+        """
+        Initialize the rate-limited Grok client.
+        
+        Args:
+            api_key: See GrokClient
+            cache: See GrokClient
+            max_concurrent_requests: Maximum number of requests in flight at once
+            requests_per_minute: Request budget per minute (None for no limit)
+            tokens_per_minute: Estimated token budget per minute (None for no limit)
+        """
+        super().__init__(api_key=api_key, cache=cache)
+        self._semaphore = threading.BoundedSemaphore(max_concurrent_requests)
+        self._request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+    
+    @staticmethod
+    def estimate_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """Rough token estimate for a request: ~4 characters per prompt token plus max_tokens."""
+        prompt_chars = sum(len(message.get("content") or "") for message in messages)
+        return prompt_chars // 4 + max_tokens
+    
+    @contextlib.contextmanager
+    def _request_slot(self, messages: List[Dict[str, str]], max_tokens: int):
+        if self._request_bucket:
+            self._request_bucket.acquire()
+        if self._token_bucket:
+            self._token_bucket.acquire(self.estimate_tokens(messages, max_tokens))
+        with self._semaphore:
+            yield
+
+
+def _read_input_lines(lines: "queue.Queue[Optional[str]]") -> None:
+    """
+    Read stdin lines into a queue until EOF, which is signalled with None.
+    
+    Runs on a background thread so the next question can be typed while the
+    previous answer is still streaming.
+    """
+    while True:
+        try:
+            line = input()
+        except EOFError:
+            lines.put(None)
+            return
+        lines.put(line)
 
 
 def main():
@@ -258,8 +622,8 @@ def main():
     print("=" * 40)
     
     try:
-        # Initialize the client
-        grok = GrokClient()
+        # Initialize the client, warming its connection while the demo starts up
+        grok = GrokClient(prewarm=True)
         
         print(f"Available models: {', '.join(grok.get_available_models())}")
         print()
@@ -296,8 +660,18 @@ def main():
         print("-" * 25)
         print("Enter your questions (type 'quit' to exit):")
         
+        # Questions typed while an answer streams are queued and sent as soon as it finishes
+        lines = queue.Queue()
+        threading.Thread(target=_read_input_lines, args=(lines,), daemon=True).start()
+        
         while True:
-            user_input = input("\nYou: ").strip()
+            if lines.empty():
+                print("\nYou: ", end="", flush=True)
+            user_input = lines.get()
+            if user_input is None:
+                print("\nGoodbye!")
+                break
+            user_input = user_input.strip()
             
             if user_input.lower() in ['quit', 'exit', 'q']:
                 print("Goodbye!")
@@ -305,8 +679,11 @@ def main():
             
             if user_input:
                 try:
-                    response = grok.simple_query(user_input)
-                    print(f"Grok: {response}")
+                    # Stream the answer so it starts printing as soon as the first token arrives
+                    print("Grok: ", end="", flush=True)
+                    for text in grok.chat_completion_stream([{"role": "user", "content": user_input}]):
+                        print(text, end="", flush=True)
+                    print()
                 except Exception as e:
                     print(f"Error: {e}")
     
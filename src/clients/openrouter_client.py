@@ -10,6 +10,9 @@ import sys
 from typing import List, Dict, Optional
 import json
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.clients.retry import call_with_retries
+
 
 class OpenRouterClient:
     """
@@ -31,9 +34,11 @@ class OpenRouterClient:
             )
         
         # Initialize OpenAI client configured for OpenRouter's API
+        # Retries are handled by _create_completion rather than the SDK
         self.client = openai.OpenAI(
             api_key=self.api_key,
             base_url="https://openrouter.ai/api/v1",
+            max_retries=0,
             default_headers={
                 "HTTP-Referer": "https://github.com/yourusername/yourrepo",  # Optional: for OpenRouter analytics
                 "X-Title": "AI Stock Scorer"  # Optional: for OpenRouter analytics
@@ -68,6 +73,21 @@ class OpenRouterClient:
         """
         return self.model_mapping.get(model, model)
     
+    def _create_completion(self, **create_kwargs):
+        """
+        Call chat.completions.create, retrying transient failures (see retry.py).
+        
+        A 429 waits at least as long as its Retry-After header asks.
+        
+        Returns:
+            The API response object
+        
+        Raises:
+            openai.APIError: The last error, once retries are exhausted or the
+                error is not retryable
+        """
+        return call_with_retries(lambda: self.client.chat.completions.create(**create_kwargs))
+    
     def chat_completion(
         self,
         messages: List[Dict[str, str]],
@@ -93,7 +113,7 @@ class OpenRouterClient:
             # Convert model name to OpenRouter format
             openrouter_model = self._get_openrouter_model(model)
             
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=openrouter_model,
                 messages=messages,
                 temperature=temperature,
@@ -104,9 +124,10 @@ class OpenRouterClient:
             return response.choices[0].message.content
             
         except openai.APIError as e:
-            if e.status_code == 429:
+            status_code = getattr(e, "status_code", None)
+            if status_code == 429:
                 raise Exception("Rate limit exceeded. Please try again later.")
-            elif e.status_code == 401:
+            elif status_code == 401:
                 raise Exception("Invalid API key. Please check your OPENROUTER_KEY.")
             else:
                 raise Exception(f"API error: {e}")
@@ -138,7 +159,7 @@ class OpenRouterClient:
             # Convert model name to OpenRouter format
             openrouter_model = self._get_openrouter_model(model)
             
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=openrouter_model,
                 messages=messages,
                 temperature=temperature,
@@ -208,9 +229,10 @@ class OpenRouterClient:
             return response_text, token_usage
             
         except openai.APIError as e:
-            if e.status_code == 429:
+            status_code = getattr(e, "status_code", None)
+            if status_code == 429:
                 raise Exception("Rate limit exceeded. Please try again later.")
-            elif e.status_code == 401:
+            elif status_code == 401:
                 raise Exception("Invalid API key. Please check your OPENROUTER_KEY.")
             else:
                 raise Exception(f"API error: {e}")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache
+An exact-match, SQLite-backed cache for chat completion responses, keyed on the
+model, messages, temperature and max_tokens of the request.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import List, Dict, Optional
+
+
+class ResponseCache:
+    """
+    A persistent exact-match cache of (response_text, token_usage) pairs.
+
+    Safe to share between threads: a single SQLite connection is used and every
+    access is serialized with a lock.
+    """
+
+    def __init__(self, path: str = "data/llm_cache.db"):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: Path to the SQLite file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response_text TEXT NOT NULL, token_usage TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """
+        Build the cache key for a request.
+
+        Returns:
+            SHA-256 hex digest of the canonical JSON form of the request
+        """
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[tuple[str, dict]]:
+        """
+        Look up a cached response.
+
+        Returns:
+            Tuple of (response_text, token_usage_dict), or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response_text, token_usage FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def set(self, key: str, response_text: str, token_usage: dict) -> None:
+        """Store a response under the given key, replacing any previous entry."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response_text, token_usage) VALUES (?, ?, ?)",
+                (key, response_text, json.dumps(token_usage))
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """Remove the entry stored under the given key, if any."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
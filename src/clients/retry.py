@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Retry policy shared by the API clients
+Transient failures (rate limits, 5xx, timeouts and connection errors) are retried
+with exponential backoff and full jitter.
+"""
+
+import random
+import time
+from typing import Callable, Optional
+
+import openai
+
+MAX_ATTEMPTS = 6
+RETRY_INITIAL_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+
+def retry_after(error: "openai.APIError") -> Optional[float]:
+    """Seconds from the error response's Retry-After header, or None if absent."""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _honour_retry_after(error: "openai.APIError", delay: float) -> float:
+    """Default 429 wait: the backoff delay, or longer if the Retry-After header asks for it."""
+    seconds = retry_after(error)
+    if seconds is None:
+        return delay
+    return max(delay, min(seconds, RETRY_MAX_DELAY))
+
+
+def call_with_retries(
+    request: Callable[[], object],
+    rate_limit_delay: Callable[["openai.APIError", float], float] = _honour_retry_after
+):
+    """
+    Call request(), retrying transient failures.
+
+    Rate limits (429), server errors (5xx), timeouts and connection errors are
+    retried up to MAX_ATTEMPTS times with exponential backoff and full jitter.
+    Other errors are raised straight away.
+
+    Args:
+        request: Makes one attempt and returns its result
+        rate_limit_delay: Function (error, backoff_delay) -> seconds to wait after a 429.
+                          Defaults to honouring the Retry-After header.
+
+    Returns:
+        The result of the first successful request() call
+
+    Raises:
+        openai.APIError: The last error, once retries are exhausted or the
+            error is not retryable
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            return request()
+        except (openai.APIConnectionError, openai.APIStatusError) as e:
+            status_code = getattr(e, "status_code", None)
+            if status_code is not None and status_code != 429 and status_code < 500:
+                raise
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+
+            delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_INITIAL_DELAY * 2 ** attempt))
+            if status_code == 429:
+                delay = rate_limit_delay(e, delay)
+            time.sleep(delay)
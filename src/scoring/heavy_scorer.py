@@ -14,7 +14,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from src.scoring.scorer import (
     SCORE_DEFINITIONS, SCORE_WEIGHTS, HEAVY_SCORES_FILE, SCORES_FILE,
     TICKER_FILE, MODEL_PRICING,
-    load_ticker_lookup, load_scores, calculate_total_score,
+    load_ticker_lookup, load_scores, normalize_legacy_score_keys, get_missing_score_keys, calculate_total_score,
     calculate_percentile_rank, format_total_score, query_all_scores_async,
     calculate_token_cost
 )
@@ -22,14 +22,37 @@ from src.clients.grok_client import GrokClient
 from config import XAI_API_KEY
 import json
 import os
+# orjson is optional; it reads and writes large score files noticeably faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Grok client shared by every heavy scoring call, created on first use
+_grok_client = None
+
+
+def get_grok_client():
+    """Get the shared GrokClient, creating it on first use.
+    
+    Scoring several tickers in one session then reuses the same client instead of
+    building (and prewarming) a new one for each ticker.
+    """
+    global _grok_client
+    if _grok_client is None:
+        _grok_client = GrokClient(api_key=XAI_API_KEY, prewarm=True)
+    return _grok_client
 
 
 def load_heavy_scores():
     """Load existing heavy scores from JSON file."""
     if os.path.exists(HEAVY_SCORES_FILE):
         try:
-            with open(HEAVY_SCORES_FILE, 'r') as f:
-                return json.load(f)
+            with open(HEAVY_SCORES_FILE, 'rb') as f:
+                raw = f.read()
+            if orjson is not None:
+                return normalize_legacy_score_keys(orjson.loads(raw))
+            return normalize_legacy_score_keys(json.loads(raw))
         except (json.JSONDecodeError, FileNotFoundError):
             return {"companies": {}}
     return {"companies": {}}
@@ -37,8 +60,12 @@ def load_heavy_scores():
 
 def save_heavy_scores(scores_data):
     """Save heavy scores to JSON file."""
-    with open(HEAVY_SCORES_FILE, 'w') as f:
-        json.dump(scores_data, f, indent=2)
+    if orjson is not None:
+        with open(HEAVY_SCORES_FILE, 'wb') as f:
+            f.write(orjson.dumps(scores_data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(HEAVY_SCORES_FILE, 'w') as f:
+            json.dump(scores_data, f, indent=2)
 
 
 def get_company_moat_score_heavy(input_str):
@@ -92,13 +119,11 @@ def get_company_moat_score_heavy(input_str):
         if existing_data:
             current_scores = {}
             for score_key in SCORE_DEFINITIONS:
-                if score_key == 'moat_score':
-                    current_scores[score_key] = existing_data.get(score_key, existing_data.get('score'))
-                else:
-                    current_scores[score_key] = existing_data.get(score_key)
+                current_scores[score_key] = existing_data.get(score_key)
             
-            # Check if all scores exist (all values are truthy, meaning not None, not empty string, etc.)
-            if all(current_scores.values()):
+            # Scores still to query; none missing means the stored scores can be shown as-is
+            missing_keys = get_missing_score_keys(current_scores)
+            if not missing_keys:
                 if ticker:
                     print(f"\n{ticker.upper()} ({company_name}) already scored (heavy):")
                 else:
@@ -120,10 +145,7 @@ def get_company_moat_score_heavy(input_str):
                 print(f"{'Total':<35} {total_str:>8}")
                 return
             
-            grok = GrokClient(api_key=XAI_API_KEY)
-            
-            # Get list of missing score keys
-            missing_keys = [key for key in SCORE_DEFINITIONS if not current_scores[key]]
+            grok = get_grok_client()
             
             if missing_keys:
                 print("Querying missing metrics in parallel (heavy model)...")
@@ -157,7 +179,7 @@ def get_company_moat_score_heavy(input_str):
         else:
             print(f"\nAnalyzing {company_name} with heavy model...")
         print("Querying all metrics in parallel (heavy model)...")
-        grok = GrokClient(api_key=XAI_API_KEY)
+        grok = get_grok_client()
         
         # Query all scores in parallel
         all_scores, total_tokens, token_usage = query_all_scores_async(grok, company_name, list(SCORE_DEFINITIONS.keys()),
@@ -348,16 +370,12 @@ def handle_correl_command(tickers_input):
             for score_key in SCORE_DEFINITIONS:
                 # Get light score
                 light_score_str = light_data.get(score_key)
-                if score_key == 'moat_score' and not light_score_str:
-                    light_score_str = light_data.get('score')  # Backwards compatibility
                 
                 # Get heavy score
                 heavy_score_str = heavy_data.get(score_key)
-                if score_key == 'moat_score' and not heavy_score_str:
-                    heavy_score_str = heavy_data.get('score')  # Backwards compatibility
                 
                 # Only include metrics that have both light and heavy scores
-                if light_score_str and heavy_score_str:
+                if light_score_str not in (None, '') and heavy_score_str not in (None, ''):
                     try:
                         light_score = float(light_score_str)
                         heavy_score = float(heavy_score_str)
@@ -385,12 +403,8 @@ def handle_correl_command(tickers_input):
             used_score_keys = []
             for score_key in SCORE_DEFINITIONS:
                 light_score_str = light_data.get(score_key)
-                if score_key == 'moat_score' and not light_score_str:
-                    light_score_str = light_data.get('score')  # Backwards compatibility
                 heavy_score_str = heavy_data.get(score_key)
-                if score_key == 'moat_score' and not heavy_score_str:
-                    heavy_score_str = heavy_data.get('score')  # Backwards compatibility
-                if light_score_str and heavy_score_str:
+                if light_score_str not in (None, '') and heavy_score_str not in (None, ''):
                     used_score_keys.append(score_key)
             
             # Calculate totals using only the metrics that exist in both datasets
@@ -402,11 +416,7 @@ def handle_correl_command(tickers_input):
                 weight = SCORE_WEIGHTS.get(score_key, 1.0)
                 try:
                     light_score_str = light_data.get(score_key)
-                    if score_key == 'moat_score' and not light_score_str:
-                        light_score_str = light_data.get('score')
                     heavy_score_str = heavy_data.get(score_key)
-                    if score_key == 'moat_score' and not heavy_score_str:
-                        heavy_score_str = heavy_data.get('score')
                     
                     light_value = float(light_score_str)
                     heavy_value = float(heavy_score_str)
@@ -502,13 +512,9 @@ def handle_correl_command(tickers_input):
                 score_key = score_keys_used[i]
                 # Re-read to ensure we're displaying the correct score
                 light_score_str = light_data.get(score_key)
-                if score_key == 'moat_score' and not light_score_str:
-                    light_score_str = light_data.get('score')
                 heavy_score_str = heavy_data.get(score_key)
-                if score_key == 'moat_score' and not heavy_score_str:
-                    heavy_score_str = heavy_data.get('score')
                 
-                if light_score_str and heavy_score_str:
+                if light_score_str not in (None, '') and heavy_score_str not in (None, ''):
                     try:
                         light_val = float(light_score_str)
                         heavy_val = float(heavy_score_str)
@@ -639,13 +645,16 @@ def view_heavy_scores():
     sorted_companies = sorted(scores_data["companies"].items(), key=get_total_score, reverse=True)
     
     # Calculate all totals for percentile calculation
+    # (the ticker column width is tracked in the same pass)
     all_totals = []
     company_totals = {}
+    max_name_len = 0
     for company, data in sorted_companies:
         total = get_total_score((company, data))
         if total > 0:  # Only include companies with valid scores
             company_totals[company] = total
             all_totals.append(total)
+            max_name_len = max(max_name_len, len(company))
     
     if not company_totals:
         print("No valid heavy scores found.")
@@ -656,17 +665,18 @@ def view_heavy_scores():
     print(f"Number of stocks scored: {len(company_totals)}")
     print()
     
-    max_name_len = max([len(company.upper()) for company in company_totals.keys()]) if company_totals else 0
+    name_width = min(max_name_len, 30)
+    max_score = sum(SCORE_WEIGHTS.get(key, 1.0) for key in SCORE_DEFINITIONS) * 10
     
     # Print column headers
-    print(f"{'Rank':<6} {'Ticker':<{min(max_name_len, 30)}} {'Total Score':>15} {'Percentile':>12}")
-    print("-" * (6 + min(max_name_len, 30) + 15 + 12 + 3))
+    print(f"{'Rank':<6} {'Ticker':<{name_width}} {'Total Score':>15} {'Percentile':>12}")
+    print("-" * (6 + name_width + 15 + 12 + 3))
     
-    # Display companies with rankings and percentiles
+    # Display companies with rankings and percentiles, collecting the rows so the table is written with one print
+    rows = []
     for rank, (company, data) in enumerate(sorted_companies, 1):
         if company in company_totals:
             total = company_totals[company]
-            max_score = sum(SCORE_WEIGHTS.get(key, 1.0) for key in SCORE_DEFINITIONS) * 10
             percentage = int((total / max_score) * 100)
             percentage_str = f"{percentage}%"
             
@@ -680,7 +690,8 @@ def view_heavy_scores():
             display_key = company.upper()
             if len(display_key) > 30:
                 display_key = display_key[:30]
-            print(f"{rank:<6} {display_key:<{min(max_name_len, 30)}} {percentage_str:>15} {percentile_str:>12}")
+            rows.append(f"{rank:<6} {display_key:<{name_width}} {percentage_str:>15} {percentile_str:>12}")
+    print("\n".join(rows))
 
 
 def main():
@@ -698,21 +709,23 @@ def main():
     while True:
         try:
             user_input = input("Enter ticker(s) or command ('view'/'correl'/'clear'/'quit'): ").strip()
+            # Commands are matched case-insensitively; lowercase the input once per command
+            command = user_input.lower()
             
-            if user_input.lower() in ['quit', 'exit', 'q']:
+            if command in ['quit', 'exit', 'q']:
                 print("Goodbye!")
                 break
-            elif user_input.lower() == 'clear':
+            elif command == 'clear':
                 # Clear terminal - cross-platform
                 os.system('cls' if os.name == 'nt' else 'clear')
                 print()
-            elif user_input.lower() == 'view':
+            elif command == 'view':
                 view_heavy_scores()
                 print()
-            elif user_input.lower() == 'correl':
+            elif command == 'correl':
                 print("Please provide ticker symbols. Example: correl AAPL MSFT GOOGL")
                 print()
-            elif user_input.lower().startswith('correl '):
+            elif command.startswith('correl '):
                 tickers = user_input[7:].strip()  # Remove 'correl ' prefix
                 handle_correl_command(tickers)
                 print()
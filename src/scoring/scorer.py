@@ -48,15 +48,19 @@ SCORE_WEIGHTS = {
 import sys
 import os
 import json
+import functools
+# orjson is optional; it reads and writes large score files noticeably faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
 # Add parent directory to path to import config and clients
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from src.clients.grok_client import GrokClient
-from src.clients.openrouter_client import OpenRouterClient
-from config import XAI_API_KEY, OPENROUTER_KEY
+from src.clients.response_cache import ResponseCache
 import time
 import tempfile
 import shutil
-from datetime import datetime
+import threading
 import asyncio
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -67,12 +71,93 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
 SCORES_FILE = os.path.join(PROJECT_ROOT, "data", "scores.json")
 HEAVY_SCORES_FILE = os.path.join(PROJECT_ROOT, "data", "scores_heavy.json")
 
+# Batch commands that score many companies save progress after this many companies, not after each
+SCORES_SAVE_EVERY = 20
+
 # Stock ticker lookup file
 TICKER_FILE = os.path.join(PROJECT_ROOT, "data", "stock_tickers_clean.json")
 
 # Peers file
 PEERS_FILE = os.path.join(PROJECT_ROOT, "data", "peers.json")
 
+# Metric query responses, keyed on model and prompt, so repeat queries are free
+SCORE_RESPONSE_CACHE_FILE = os.path.join(PROJECT_ROOT, "data", "score_response_cache.db")
+
+# OpenRouter client shared by every scoring call, created on first use
+_openrouter_client = None
+_openrouter_client_lock = threading.Lock()
+
+
+def get_openrouter_client():
+    """Get the shared OpenRouterClient, creating it on first use.
+    
+    Reusing one client (including from worker threads) keeps its HTTP connection
+    pool warm, so queries after the first skip the TCP and TLS handshake.
+    """
+    global _openrouter_client
+    if _openrouter_client is None:
+        with _openrouter_client_lock:
+            if _openrouter_client is None:
+                # Imported here so commands that only read scores.json (view, rank, migrate)
+                # don't pay for loading the openai SDK or need API keys configured
+                from src.clients.openrouter_client import OpenRouterClient
+                from config import OPENROUTER_KEY
+                _openrouter_client = OpenRouterClient(api_key=OPENROUTER_KEY)
+    return _openrouter_client
+
+
+_score_response_cache = None
+_score_response_cache_lock = threading.Lock()
+
+
+def get_score_response_cache():
+    """Get the shared ResponseCache for metric queries, opening it on first use."""
+    global _score_response_cache
+    if _score_response_cache is None:
+        with _score_response_cache_lock:
+            if _score_response_cache is None:
+                _score_response_cache = ResponseCache(SCORE_RESPONSE_CACHE_FILE)
+    return _score_response_cache
+
+
+def query_with_cache(grok, prompt, model, use_cache=True, system_prompt=None, temperature=0.7, is_valid=None):
+    """Send a prompt, reusing a cached response when possible.
+    
+    Args:
+        system_prompt: Optional system message sent ahead of the prompt
+        temperature: Sampling temperature; part of the cache key
+        is_valid: Optional callable taking the response text. Only responses it accepts
+                  are cached, and a cached response it rejects is evicted and re-queried.
+    
+    Returns:
+        Tuple of (response_text, token_usage_dict). Cached responses report zero
+        tokens and set token_usage['cache_hit'] = True.
+    """
+    messages = [{"role": "user", "content": prompt}]
+    if system_prompt is not None:
+        messages.insert(0, {"role": "system", "content": system_prompt})
+    
+    def send():
+        return grok.chat_completion_with_tokens(messages, model=model, temperature=temperature)
+    
+    if not use_cache:
+        return send()
+    
+    cache = get_score_response_cache()
+    key = ResponseCache.make_key(model, messages, temperature, None)
+    cached = cache.get(key)
+    if cached is not None:
+        if is_valid is None or is_valid(cached[0]):
+            return cached[0], {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0, 'cache_hit': True}
+        # Cached before it was validated; drop it so the query is retried
+        cache.delete(key)
+    
+    response, token_usage = send()
+    if is_valid is None or is_valid(response):
+        cache.set(key, response, token_usage)
+    return response, token_usage
+
+
 def get_model_for_ticker(ticker):
     """Get the model name to use for a given ticker.
     
@@ -159,6 +244,10 @@ TICKER_DEFINITIONS_FILE = os.path.join(PROJECT_ROOT, "data", "ticker_definitions
 # Cache for ticker lookups
 _ticker_cache = None
 
+# Reverse (lowercase company name -> ticker) index over _ticker_cache, see _get_name_index()
+_name_index = None
+_name_index_source = None
+
 def load_custom_ticker_definitions():
     """Load custom ticker definitions from JSON file.
     
@@ -250,6 +339,24 @@ def resolve_to_company_name(input_str):
     # Otherwise treat as company name
     return (input_str.strip(), None)
 
+def _get_name_index(ticker_lookup):
+    """Get the lowercase company name -> ticker index for a ticker lookup dict.
+    
+    The index is rebuilt only when load_ticker_lookup() returns a new dict (i.e.
+    after _ticker_cache is reset). For duplicate names the first ticker wins,
+    matching the order of the original linear scan.
+    """
+    global _name_index, _name_index_source
+    
+    if _name_index_source is not ticker_lookup:
+        index = {}
+        for ticker, name in ticker_lookup.items():
+            index.setdefault(name.lower(), ticker)
+        _name_index = index
+        _name_index_source = ticker_lookup
+    
+    return _name_index
+
 def get_ticker_from_company_name(company_name):
     """Reverse lookup: get ticker from company name using ticker JSON lookup."""
     ticker_lookup = load_ticker_lookup()
@@ -257,9 +364,9 @@ def get_ticker_from_company_name(company_name):
     company_lower = company_name.lower()
     
     # Try exact match (case insensitive)
-    for ticker, name in ticker_lookup.items():
-        if name.lower() == company_lower:
-            return ticker
+    ticker = _get_name_index(ticker_lookup).get(company_lower)
+    if ticker is not None:
+        return ticker
     
     # Try partial match
     for ticker, name in ticker_lookup.items():
@@ -820,16 +927,113 @@ Respond with ONLY the numerical score (0-10), no explanation needed.""",
     }
 }
 
+# Closing instruction of every SCORE_DEFINITIONS prompt; dropped when prompts are combined
+SCORE_PROMPT_TRAILER = "Respond with ONLY the numerical score (0-10), no explanation needed."
+
+# Per-metric rubric templates for combined prompts, stripped of the trailer once at import
+SCORE_RUBRIC_TEMPLATES = {
+    score_key: score_def['prompt'].replace(SCORE_PROMPT_TRAILER, '').strip()
+    for score_key, score_def in SCORE_DEFINITIONS.items()
+}
+
+# Combined prompt section for each metric. Rubrics always refer to "the company", so the
+# sections are filled in once here rather than every time a prompt is built
+SCORE_RUBRIC_SECTIONS = {
+    score_key: f"### {score_key} ({SCORE_DEFINITIONS[score_key]['display_name']})\n"
+               + template.format(company_name="the company")
+    for score_key, template in SCORE_RUBRIC_TEMPLATES.items()
+}
+
+
+def format_score_prompt(score_key, company_name):
+    """Fill in a metric's SCORE_DEFINITIONS prompt for one company."""
+    return SCORE_DEFINITIONS[score_key]['prompt'].format(company_name=company_name)
+
+
+def _build_score_alias_map():
+    """Map each lowercase name a metric can be looked up by (display name, key, key parts) to its key.
+    Where several metrics share a name (e.g. "score"), the first metric defined keeps it."""
+    alias_map = {}
+    for score_key, score_def in SCORE_DEFINITIONS.items():
+        for alias in [score_def['display_name'], score_key] + score_key.split('_'):
+            alias_map.setdefault(alias.lower(), score_key)
+    return alias_map
+
+
+# Built once at import rather than on every metric lookup
+SCORE_ALIAS_MAP = _build_score_alias_map()
+
+
+def find_score_key(name):
+    """Find the SCORE_DEFINITIONS key a user-typed metric name refers to.
+    
+    Tries an exact alias first, then falls back to the first alias that contains,
+    or is contained in, the name.
+    
+    Returns:
+        str: The score key, or None if nothing matches
+    """
+    name_lower = name.lower()
+    score_key = SCORE_ALIAS_MAP.get(name_lower)
+    if score_key is not None:
+        return score_key
+    for alias, score_key in SCORE_ALIAS_MAP.items():
+        if name_lower in alias or alias in name_lower:
+            return score_key
+    return None
+
+
+# Last scores parsed or saved, as (file signature, data), reused while the file is unchanged
+_scores_cache = None
+
+
+def normalize_legacy_score_keys(scores_data):
+    """Move moat scores stored under the legacy 'score' key to 'moat_score', in place.
+    
+    Applied when scores are loaded, so readers only ever need to look up 'moat_score'.
+    
+    Returns:
+        The same scores_data dict
+    """
+    for data in scores_data["companies"].values():
+        if 'score' in data and data.get('moat_score') in (None, ''):
+            data['moat_score'] = data.pop('score')
+    return scores_data
+
+
+def _scores_file_signature():
+    """Identify the current contents of SCORES_FILE by path, mtime and size."""
+    stat = os.stat(SCORES_FILE)
+    return SCORES_FILE, stat.st_mtime_ns, stat.st_size
+
 
 def load_scores():
-    """Load existing scores from JSON file."""
-    if os.path.exists(SCORES_FILE):
-        try:
-            with open(SCORES_FILE, 'r') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return {"companies": {}}
-    return {"companies": {}}
+    """Load existing scores from JSON file.
+    
+    The parsed data is kept and returned again while the file is unchanged, so
+    repeated calls in a session don't re-parse it. Callers that modify the
+    returned dict are expected to save it with save_scores.
+    """
+    global _scores_cache
+    try:
+        signature = _scores_file_signature()
+    except FileNotFoundError:
+        return {"companies": {}}
+    if _scores_cache is not None and _scores_cache[0] == signature:
+        return _scores_cache[1]
+    
+    try:
+        with open(SCORES_FILE, 'rb') as f:
+            raw = f.read()
+        if orjson is not None:
+            scores_data = orjson.loads(raw)
+        else:
+            scores_data = json.loads(raw)
+    except (json.JSONDecodeError, FileNotFoundError):
+        return {"companies": {}}
+    normalize_legacy_score_keys(scores_data)
+    _scores_cache = (signature, scores_data)
+    return scores_data
 
 
 def save_scores(scores_data):
@@ -839,14 +1043,20 @@ def save_scores(scores_data):
     if the write succeeds. This prevents corruption if the program crashes
     during the write operation.
     """
+    global _scores_cache
+    
     # Create a temporary file in the same directory as the target file
     temp_dir = os.path.dirname(os.path.abspath(SCORES_FILE)) or '.'
     temp_fd, temp_path = tempfile.mkstemp(dir=temp_dir, suffix='.json', prefix='.scores_temp_')
     
     try:
         # Write to temporary file
-        with os.fdopen(temp_fd, 'w') as f:
-            json.dump(scores_data, f, indent=2)
+        if orjson is not None:
+            with os.fdopen(temp_fd, 'wb') as f:
+                f.write(orjson.dumps(scores_data, option=orjson.OPT_INDENT_2))
+        else:
+            with os.fdopen(temp_fd, 'w') as f:
+                json.dump(scores_data, f, indent=2)
         
         # Atomically replace the original file (on Windows, this may require removing the original first)
         if os.name == 'nt':  # Windows
@@ -857,6 +1067,9 @@ def save_scores(scores_data):
         else:  # Unix-like systems
             # On Unix, replace() is atomic
             os.replace(temp_path, SCORES_FILE)
+        
+        # The saved dict is now the file's contents, so the next load_scores can reuse it
+        _scores_cache = (_scores_file_signature(), scores_data)
     except Exception as e:
         # If anything goes wrong, try to clean up temp file and raise
         try:
@@ -868,11 +1081,45 @@ def save_scores(scores_data):
 
 
 
+def _parse_score(response):
+    """Parse a score reply (e.g. " 7\n" or "**7**") into an int from 0 to 10.
+    
+    Whitespace and markdown emphasis around the number are ignored.
+    
+    Returns:
+        int score, or None if the reply isn't a whole number in range
+    """
+    try:
+        value = float(str(response).strip().strip('*_`').strip())
+    except ValueError:
+        return None
+    if not value.is_integer() or not 0 <= value <= 10:
+        return None
+    return int(value)
+
+
+def get_missing_score_keys(scores_dict):
+    """Return the SCORE_DEFINITIONS keys with no stored score in scores_dict.
+    
+    A score of 0 is a real score, so only None (or an empty legacy string) counts as missing.
+    """
+    return [key for key in SCORE_DEFINITIONS if scores_dict.get(key) in (None, '')]
+
+
+def get_current_scores(existing_data):
+    """Return a stored entry's scores keyed by SCORE_DEFINITIONS (None if absent), plus its model if set."""
+    current_scores = {score_key: existing_data.get(score_key) for score_key in SCORE_DEFINITIONS}
+    # Preserve existing model if present
+    if 'model' in existing_data:
+        current_scores['model'] = existing_data['model']
+    return current_scores
+
+
 def calculate_total_score(scores_dict):
     """Calculate total score from a dictionary of scores.
     
     Args:
-        scores_dict: Dictionary with score keys and their string values
+        scores_dict: Dictionary with score keys and their score values (ints, or numeric strings in older data)
         
     Returns:
         float: The total weighted score (handling reverse scores appropriately)
@@ -893,6 +1140,32 @@ def calculate_total_score(scores_dict):
     return total
 
 
+def build_score_matrix(companies):
+    """Lay out stored scores as one array row per company and one column per metric.
+    
+    Args:
+        companies: The "companies" dict from load_scores()
+        
+    Returns:
+        tuple: (company keys in file order, float array of shape (companies, len(SCORE_DEFINITIONS)))
+               with columns in SCORE_DEFINITIONS order and NaN for missing or invalid scores
+    """
+    # Imported here rather than at module level so commands that don't need it start faster
+    import numpy as np
+    
+    def to_float(value):
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return np.nan
+    
+    values = np.array(
+        [[to_float(data.get(key)) for key in SCORE_DEFINITIONS] for data in companies.values()],
+        dtype=float
+    ).reshape(len(companies), len(SCORE_DEFINITIONS))
+    return list(companies), values
+
+
 def calculate_percentile_rank(score, all_scores):
     """Calculate percentile rank of a score among all scores.
     
@@ -914,13 +1187,17 @@ def calculate_percentile_rank(score, all_scores):
     return percentile
 
 
-def get_all_total_scores():
+def get_all_total_scores(scores_data=None):
     """Get all total scores from all companies.
     
+    Args:
+        scores_data: Already-loaded scores to use instead of reading SCORES_FILE
+    
     Returns:
         list: List of all total scores (floats)
     """
-    scores_data = load_scores()
+    if scores_data is None:
+        scores_data = load_scores()
     all_totals = []
     
     for company, data in scores_data["companies"].items():
@@ -998,7 +1275,7 @@ def calculate_correlation(ticker1, ticker2):
         val2 = scores2.get(score_key)
         
         # Only include metrics where both companies have scores
-        if val1 and val2:
+        if val1 not in (None, '') and val2 not in (None, ''):
             try:
                 num1 = float(val1)
                 num2 = float(val2)
@@ -1096,6 +1373,15 @@ def show_correlation(ticker1, ticker2):
     print("      strong in opposite areas.")
 
 
+@functools.lru_cache(maxsize=256)
+def _format_score(value):
+    """Format a numeric metric score for display: "7" for whole numbers, "7.5" otherwise.
+    
+    Scores come from a small 0-10 domain, so the formatted strings are cached.
+    """
+    return str(int(value)) if value == int(value) else f"{value:.1f}"
+
+
 def format_total_score(total, percentile=None):
     """Format a total score as a percentage integer string with optional percentile.
     
@@ -1133,8 +1419,7 @@ def query_score(grok, company_name, score_key, show_timing=True, ticker=None):
         show_timing: If True, print timing and token information
         ticker: Optional ticker symbol to determine model
     """
-    score_def = SCORE_DEFINITIONS[score_key]
-    prompt = score_def['prompt'].format(company_name=company_name)
+    prompt = format_score_prompt(score_key, company_name)
     model = get_model_for_ticker(ticker) if ticker else "grok-4-1-fast-reasoning"
     start_time = time.time()
     response, token_usage = grok.simple_query_with_tokens(prompt, model=model)
@@ -1142,22 +1427,55 @@ def query_score(grok, company_name, score_key, show_timing=True, ticker=None):
     total_tokens = token_usage.get('total_tokens', 0)
     if show_timing:
         print(f"  Time: {elapsed_time:.2f}s | Tokens: {total_tokens}")
-    return response.strip()
+    return _parse_score(response)
 
 
 def query_score_heavy(grok, company_name, score_key):
     """Query a single score from Grok using grok-4-1-fast-reasoning model."""
-    score_def = SCORE_DEFINITIONS[score_key]
-    prompt = score_def['prompt'].format(company_name=company_name)
+    prompt = format_score_prompt(score_key, company_name)
     start_time = time.time()
     response, token_usage = grok.simple_query_with_tokens(prompt, model="grok-4-1-fast-reasoning")
     elapsed_time = time.time() - start_time
     total_tokens = token_usage.get('total_tokens', 0)
     print(f"  Time: {elapsed_time:.2f}s | Tokens: {total_tokens}")
-    return response.strip()
+    return _parse_score(response)
 
 
-def query_all_scores_async(grok, company_name, score_keys, batch_mode=False, silent=False, model=None, ticker=None):
+def combine_token_usages(all_token_usages):
+    """Sum a list of token_usage dicts into one for cost calculation.
+    
+    Returns:
+        Combined token_usage dict, or None if the list is empty
+    """
+    if not all_token_usages:
+        return None
+    
+    # Get input tokens (use explicit check to handle 0 values)
+    input_sum = sum(usage.get('input_tokens') if 'input_tokens' in usage else usage.get('prompt_tokens', 0) for usage in all_token_usages)
+    # Get output tokens - completion_tokens should already include thinking tokens from grok_client
+    output_sum = sum(usage.get('output_tokens') if 'output_tokens' in usage else usage.get('completion_tokens', 0) for usage in all_token_usages)
+    # Get cached tokens
+    cached_sum = sum(
+        usage.get('cached_tokens') if 'cached_tokens' in usage else
+        usage.get('cached_input_tokens') if 'cached_input_tokens' in usage else
+        usage.get('prompt_cache_hit_tokens', 0)
+        for usage in all_token_usages
+    )
+    # Get thinking tokens separately for display
+    thinking_sum = sum(usage.get('thinking_tokens', 0) for usage in all_token_usages)
+    
+    return {
+        'input_tokens': input_sum,
+        'output_tokens': output_sum,
+        'cached_tokens': cached_sum,
+        'thinking_tokens': thinking_sum,
+        # Also preserve prompt_tokens and completion_tokens for compatibility
+        'prompt_tokens': input_sum,
+        'completion_tokens': output_sum,
+    }
+
+
+def query_all_scores_async(grok, company_name, score_keys, batch_mode=False, silent=False, model=None, ticker=None, use_cache=True):
     """Query all scores in parallel using ThreadPoolExecutor.
     
     Args:
@@ -1168,6 +1486,7 @@ def query_all_scores_async(grok, company_name, score_keys, batch_mode=False, sil
         silent: If True, don't print progress messages
         model: Model to use for queries (if None, will be determined from ticker)
         ticker: Optional ticker symbol to determine model
+        use_cache: If False, always query the API instead of reusing cached responses
         
     Returns:
         tuple: (dict mapping score_key to score value, total_tokens, combined_token_usage, model_name)
@@ -1177,28 +1496,23 @@ def query_all_scores_async(grok, company_name, score_keys, batch_mode=False, sil
         model = get_model_for_ticker(ticker) if ticker else "grok-4-1-fast-reasoning"
     
     def query_single_score(score_key):
-        """Helper function to query a single score."""
-        score_def = SCORE_DEFINITIONS[score_key]
-        prompt = score_def['prompt'].format(company_name=company_name)
+        """Helper function to query a single score.
+        Progress is printed by the collecting loop, not by the worker threads."""
+        prompt = format_score_prompt(score_key, company_name)
         start_time = time.time()
         try:
-            response, token_usage = grok.simple_query_with_tokens(prompt, model=model)
+            response, token_usage = query_with_cache(
+                grok, prompt, model, use_cache, is_valid=lambda text: _parse_score(text) is not None
+            )
             elapsed_time = time.time() - start_time
             total_tokens = token_usage.get('total_tokens', 0)
-            result = response.strip()
+            result = _parse_score(response)
+            if result is None:
+                return score_key, None, f"invalid score response {response.strip()[:40]!r}", total_tokens, token_usage, elapsed_time
             
-            if not silent:
-                if batch_mode:
-                    print(f"  {score_def['display_name']}: {result}/10")
-                else:
-                    print(f"Querying {score_def['display_name']}...")
-                    print(f"  Time: {elapsed_time:.2f}s | Tokens: {total_tokens}")
-                    print(f"{score_def['display_name']} Score: {result}/10")
-                    print()
-            
-            return score_key, result, None, total_tokens, token_usage
+            return score_key, result, None, total_tokens, token_usage, elapsed_time
         except Exception as e:
-            return score_key, None, str(e), 0, None
+            return score_key, None, str(e), 0, None, time.time() - start_time
     
     # Execute all queries in parallel
     all_scores = {}
@@ -1208,50 +1522,138 @@ def query_all_scores_async(grok, company_name, score_keys, batch_mode=False, sil
         # Submit all tasks
         future_to_key = {executor.submit(query_single_score, key): key for key in score_keys}
         
-        # Collect results as they complete
+        # Collect results as they complete, printing from this thread so output isn't interleaved
         for future in as_completed(future_to_key):
-            score_key, result, error, tokens, token_usage = future.result()
+            score_key, result, error, tokens, token_usage, elapsed_time = future.result()
+            display_name = SCORE_DEFINITIONS[score_key]['display_name']
             total_tokens += tokens
             if token_usage:
                 all_token_usages.append(token_usage)
             if error:
                 if not silent:
-                    print(f"Error querying {SCORE_DEFINITIONS[score_key]['display_name']}: {error}")
+                    print(f"Error querying {display_name}: {error}")
                 all_scores[score_key] = None
             else:
                 all_scores[score_key] = result
+                if not silent:
+                    if batch_mode:
+                        print(f"  {display_name}: {result}/10")
+                    else:
+                        print(f"Querying {display_name}...")
+                        print(f"  Time: {elapsed_time:.2f}s | Tokens: {tokens}")
+                        print(f"{display_name} Score: {result}/10")
+                        print()
     
     # Combine all token usages for accurate cost calculation
-    combined_token_usage = None
-    if all_token_usages:
-        # Get input tokens (use explicit check to handle 0 values)
-        input_sum = sum(usage.get('input_tokens') if 'input_tokens' in usage else usage.get('prompt_tokens', 0) for usage in all_token_usages)
-        # Get output tokens - completion_tokens should already include thinking tokens from grok_client
-        output_sum = sum(usage.get('output_tokens') if 'output_tokens' in usage else usage.get('completion_tokens', 0) for usage in all_token_usages)
-        # Get cached tokens
-        cached_sum = sum(
-            usage.get('cached_tokens') if 'cached_tokens' in usage else
-            usage.get('cached_input_tokens') if 'cached_input_tokens' in usage else
-            usage.get('prompt_cache_hit_tokens', 0)
-            for usage in all_token_usages
-        )
-        # Get thinking tokens separately for display
-        thinking_sum = sum(usage.get('thinking_tokens', 0) for usage in all_token_usages)
-        
-        combined_token_usage = {
-            'input_tokens': input_sum,
-            'output_tokens': output_sum,
-            'cached_tokens': cached_sum,
-            'thinking_tokens': thinking_sum,
-            # Also preserve prompt_tokens and completion_tokens for compatibility
-            'prompt_tokens': input_sum,
-            'completion_tokens': output_sum,
-        }
+    combined_token_usage = combine_token_usages(all_token_usages)
     
     return all_scores, total_tokens, combined_token_usage, model
 
 
-def score_single_ticker(input_str, silent=False, batch_mode=False, force_rescore=False):
+def build_combined_prompt(company_name, score_keys):
+    """Build one request asking for every metric in score_keys as a JSON object.
+    
+    Each metric's rubric from SCORE_DEFINITIONS goes in the system prompt under its
+    key, without the per-metric "respond with only the score" instruction. The rubrics
+    refer to "the company" rather than a name, so the system prompt is the same for
+    every company scored on the same metrics and can be served from the API's
+    prompt cache; only the short user prompt names the company.
+    
+    Returns:
+        tuple: (system_prompt, user_prompt)
+    """
+    system_prompt = (
+        "Score the company named in the user's message on each of the following metrics.\n\n"
+        + "\n\n".join(SCORE_RUBRIC_SECTIONS[score_key] for score_key in score_keys)
+        + f"\n\nRespond with ONLY a JSON object with the keys {', '.join(score_keys)}, "
+        "each an integer score from 0 to 10, no explanation needed."
+    )
+    return system_prompt, f"Company: {company_name}"
+
+
+def parse_combined_response(response, score_keys):
+    """Extract metric scores from a JSON reply to build_combined_prompt.
+    
+    Returns:
+        dict mapping score_key to int score for every key with a valid 0-10 score
+    """
+    json_start = response.find('{')
+    if json_start < 0:
+        return {}
+    try:
+        parsed, _ = json.JSONDecoder().raw_decode(response, json_start)
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+    
+    scores = {}
+    for score_key in score_keys:
+        value = parsed.get(score_key)
+        if value is None or isinstance(value, bool):
+            continue
+        score = _parse_score(value)
+        if score is not None:
+            scores[score_key] = score
+    return scores
+
+
+def query_all_scores_batched(grok, company_name, score_keys, batch_mode=False, silent=False, model=None, ticker=None, use_cache=True):
+    """Query all scores with a single request that returns a JSON object.
+    
+    Any metric missing or invalid in the reply is re-queried on its own through
+    query_all_scores_async, so the result covers the same keys.
+    
+    Args:
+        Same as query_all_scores_async
+        
+    Returns:
+        tuple: (dict mapping score_key to score value, total_tokens, combined_token_usage, model_name)
+    """
+    if model is None:
+        model = get_model_for_ticker(ticker) if ticker else "grok-4-1-fast-reasoning"
+    
+    all_scores = {}
+    total_tokens = 0
+    all_token_usages = []
+    start_time = time.time()
+    try:
+        system_prompt, user_prompt = build_combined_prompt(company_name, score_keys)
+        # Only a reply that scores every metric is worth caching
+        response, token_usage = query_with_cache(
+            grok, user_prompt, model, use_cache, system_prompt=system_prompt,
+            is_valid=lambda text: len(parse_combined_response(text, score_keys)) == len(score_keys)
+        )
+        total_tokens += token_usage.get('total_tokens', 0)
+        all_token_usages.append(token_usage)
+        all_scores = parse_combined_response(response, score_keys)
+    except Exception as e:
+        if not silent:
+            print(f"Error querying combined scores: {e}")
+    
+    if not silent:
+        if not batch_mode:
+            print(f"  Time: {time.time() - start_time:.2f}s | Tokens: {total_tokens}")
+        for score_key in score_keys:
+            if score_key in all_scores:
+                print(f"  {SCORE_DEFINITIONS[score_key]['display_name']}: {all_scores[score_key]}/10")
+    
+    retry_keys = [key for key in score_keys if key not in all_scores]
+    if retry_keys:
+        if not silent:
+            print(f"Querying {len(retry_keys)} metric(s) individually...")
+        retry_scores, retry_tokens, retry_usage, _ = query_all_scores_async(
+            grok, company_name, retry_keys, batch_mode=batch_mode, silent=silent, model=model, use_cache=use_cache
+        )
+        all_scores.update(retry_scores)
+        total_tokens += retry_tokens
+        if retry_usage:
+            all_token_usages.append(retry_usage)
+    
+    return all_scores, total_tokens, combine_token_usages(all_token_usages), model
+
+
+def score_single_ticker(input_str, silent=False, batch_mode=False, force_rescore=False, scores_data=None):
     """Score a single ticker and return the result.
     
     Args:
@@ -1259,6 +1661,8 @@ def score_single_ticker(input_str, silent=False, batch_mode=False, force_rescore
         silent: If True, don't print progress messages (only errors)
         batch_mode: If True, show compact metric names during scoring (for batch processing)
         force_rescore: If True, rescore the ticker even if scores already exist
+        scores_data: Already-loaded scores to read and update in place. When given, the
+            caller saves them, so a batch of tickers is written once rather than per ticker.
         
     Returns:
         dict with keys: 'ticker', 'company_name', 'scores', 'total', 'success', 'error'
@@ -1281,7 +1685,9 @@ def score_single_ticker(input_str, silent=False, batch_mode=False, force_rescore
                 print("Please enter a valid NYSE or NASDAQ ticker symbol.")
             return None
         
-        scores_data = load_scores()
+        owns_scores_data = scores_data is None
+        if owns_scores_data:
+            scores_data = load_scores()
         
         # Try to find existing scores (skip if force_rescore is True)
         existing_data = None
@@ -1301,17 +1707,11 @@ def score_single_ticker(input_str, silent=False, batch_mode=False, force_rescore
                 storage_key = company_name.lower()
         
         if existing_data:
-            current_scores = {}
-            for score_key in SCORE_DEFINITIONS:
-                if score_key == 'moat_score':
-                    current_scores[score_key] = existing_data.get(score_key, existing_data.get('score'))
-                else:
-                    current_scores[score_key] = existing_data.get(score_key)
-            # Preserve existing model if present
-            if 'model' in existing_data:
-                current_scores['model'] = existing_data['model']
+            current_scores = get_current_scores(existing_data)
+            # Computed once; empty means the entry is complete
+            missing_keys = get_missing_score_keys(current_scores)
             
-            if all(current_scores.values()):
+            if not missing_keys:
                 # All scores exist
                 total = calculate_total_score(current_scores)
                 return {
@@ -1330,11 +1730,8 @@ def score_single_ticker(input_str, silent=False, batch_mode=False, force_rescore
             if not silent:
                 print(f"\nFilling missing scores for {ticker.upper()} ({company_name})...")
                 if not batch_mode:
-                    print("Querying missing metrics in parallel...")
-            grok = OpenRouterClient(api_key=OPENROUTER_KEY)
-            
-            # Get list of missing score keys
-            missing_keys = [key for key in SCORE_DEFINITIONS if not current_scores[key]]
+                    print("Querying missing metrics in one request...")
+            grok = get_openrouter_client()
             
             # Preserve existing model or determine from ticker
             existing_model = current_scores.get('model')
@@ -1342,8 +1739,8 @@ def score_single_ticker(input_str, silent=False, batch_mode=False, force_rescore
                 existing_model = get_model_for_ticker(ticker) if ticker else "grok-4-1-fast-reasoning"
             
             if missing_keys:
-                # Query missing scores in parallel
-                missing_scores, tokens_used, token_usage, model_used = query_all_scores_async(grok, company_name, missing_keys,
+                # Query missing scores in one combined request
+                missing_scores, tokens_used, token_usage, model_used = query_all_scores_batched(grok, company_name, missing_keys,
                                                         batch_mode=batch_mode, silent=silent, ticker=ticker)
                 # Update current_scores with the new scores
                 current_scores.update(missing_scores)
@@ -1361,7 +1758,8 @@ def score_single_ticker(input_str, silent=False, batch_mode=False, force_rescore
             if ticker and ticker.lower() in scores_data["companies"] and ticker != ticker.lower():
                 del scores_data["companies"][ticker.lower()]
             scores_data["companies"][storage_key] = current_scores
-            save_scores(scores_data)
+            if owns_scores_data:
+                save_scores(scores_data)
             if not silent:
                 model_name = current_scores.get('model', 'Unknown')
                 print(f"\nScores updated in {SCORES_FILE} (Model: {model_name})")
@@ -1386,12 +1784,13 @@ def score_single_ticker(input_str, silent=False, batch_mode=False, force_rescore
         if not silent:
             print(f"\nAnalyzing {ticker.upper()} ({company_name})...")
             if not batch_mode:
-                print("Querying all metrics in parallel...")
-        grok = OpenRouterClient(api_key=OPENROUTER_KEY)
+                print("Querying all metrics in one request...")
+        grok = get_openrouter_client()
         
-        # Query all scores in parallel
-        all_scores, total_tokens, token_usage, model_used = query_all_scores_async(grok, company_name, list(SCORE_DEFINITIONS.keys()), 
-                                            batch_mode=batch_mode, silent=silent, ticker=ticker)
+        # Query all scores in one request (a forced rescore asks again rather than replaying cached answers)
+        all_scores, total_tokens, token_usage, model_used = query_all_scores_batched(grok, company_name, list(SCORE_DEFINITIONS.keys()), 
+                                            batch_mode=batch_mode, silent=silent, ticker=ticker,
+                                            use_cache=not force_rescore)
         
         # Explicitly set model name based on ticker (ensures correct model is saved when rescoring)
         model_to_save = get_model_for_ticker(ticker) if ticker else "grok-4-1-fast-reasoning"
@@ -1403,7 +1802,8 @@ def score_single_ticker(input_str, silent=False, batch_mode=False, force_rescore
         if ticker and ticker.lower() in scores_data["companies"] and ticker != ticker.lower():
             del scores_data["companies"][ticker.lower()]
         scores_data["companies"][storage_key] = all_scores
-        save_scores(scores_data)
+        if owns_scores_data:
+            save_scores(scores_data)
         if not silent:
             if not batch_mode:
                 print(f"Total tokens used: {total_tokens}")
@@ -1499,40 +1899,46 @@ def score_multiple_tickers(input_str):
     
     results = []
     ticker_lookup = load_ticker_lookup()
-    # Get all totals for percentile calculation (will be updated as we score)
-    all_totals = get_all_total_scores()
-    
-    for i, ticker in enumerate(tickers, 1):
-        ticker_upper = ticker.strip().upper()
-        company_name = ticker_lookup.get(ticker_upper, ticker_upper)
-        print(f"\n[{i}/{len(tickers)}] Processing {ticker_upper} ({company_name})...")
-        result = score_single_ticker(ticker, silent=True, batch_mode=True)
-        if result:
-            if result['success']:
-                # Calculate and display total score and percentile
-                total = result.get('total')
-                if total is not None:
-                    # Refresh all totals to include newly scored ticker
-                    all_totals = get_all_total_scores()
-                    percentile = calculate_percentile_rank(total, all_totals) if all_totals and len(all_totals) > 1 else None
-                    total_str = format_total_score(total, percentile)
+    # Scores are loaded once and saved every SCORES_SAVE_EVERY tickers rather than per ticker
+    scores_data = load_scores()
+    
+    # Save on the way out too, so a Ctrl-C keeps progress since the last checkpoint
+    try:
+        for i, ticker in enumerate(tickers, 1):
+            ticker_upper = ticker.strip().upper()
+            company_name = ticker_lookup.get(ticker_upper, ticker_upper)
+            print(f"\n[{i}/{len(tickers)}] Processing {ticker_upper} ({company_name})...")
+            result = score_single_ticker(ticker, silent=True, batch_mode=True, scores_data=scores_data)
+            if i % SCORES_SAVE_EVERY == 0:
+                save_scores(scores_data)
+            if result:
+                if result['success']:
+                    # Calculate and display total score and percentile
+                    total = result.get('total')
+                    if total is not None:
+                        # Totals include the newly scored ticker
+                        all_totals = get_all_total_scores(scores_data)
+                        percentile = calculate_percentile_rank(total, all_totals) if all_totals and len(all_totals) > 1 else None
+                        total_str = format_total_score(total, percentile)
                     
-                    model_name = result.get('scores', {}).get('model', 'Unknown') if result.get('scores') else 'Unknown'
-                    if result.get('already_scored'):
-                        print(f"  ✓ {ticker.upper()} already scored - {total_str} (Model: {model_name})")
+                        model_name = result.get('scores', {}).get('model', 'Unknown') if result.get('scores') else 'Unknown'
+                        if result.get('already_scored'):
+                            print(f"  ✓ {ticker.upper()} already scored - {total_str} (Model: {model_name})")
+                        else:
+                            print(f"  ✓ {ticker.upper()} scored successfully - {total_str} (Model: {model_name})")
                     else:
-                        print(f"  ✓ {ticker.upper()} scored successfully - {total_str} (Model: {model_name})")
+                        model_name = result.get('scores', {}).get('model', 'Unknown') if result.get('scores') else 'Unknown'
+                        if result.get('already_scored'):
+                            print(f"  ✓ {ticker.upper()} already scored (Model: {model_name})")
+                        else:
+                            print(f"  ✓ {ticker.upper()} scored successfully (Model: {model_name})")
                 else:
-                    model_name = result.get('scores', {}).get('model', 'Unknown') if result.get('scores') else 'Unknown'
-                    if result.get('already_scored'):
-                        print(f"  ✓ {ticker.upper()} already scored (Model: {model_name})")
-                    else:
-                        print(f"  ✓ {ticker.upper()} scored successfully (Model: {model_name})")
+                    print(f"  ✗ Error scoring {ticker.upper()}: {result.get('error', 'Unknown error')}")
+                results.append(result)
             else:
-                print(f"  ✗ Error scoring {ticker.upper()}: {result.get('error', 'Unknown error')}")
-            results.append(result)
-        else:
-            print(f"  ✗ '{ticker}' is not a valid ticker. Skipping.")
+                print(f"  ✗ '{ticker}' is not a valid ticker. Skipping.")
+    finally:
+        save_scores(scores_data)
     
     if not results:
         print("\nNo valid tickers were processed.")
@@ -1544,7 +1950,7 @@ def score_multiple_tickers(input_str):
     print("=" * 80)
     
     # Get all totals for percentile calculation
-    all_totals = get_all_total_scores()
+    all_totals = get_all_total_scores(scores_data)
     
     # Sort results by total score (descending)
     results.sort(key=lambda x: x['total'] if x['total'] is not None else -1, reverse=True)
@@ -1642,17 +2048,11 @@ def get_company_moat_score(input_str):
             storage_key = company_name.lower()
         
         if existing_data:
-            current_scores = {}
-            for score_key in SCORE_DEFINITIONS:
-                if score_key == 'moat_score':
-                    current_scores[score_key] = existing_data.get(score_key, existing_data.get('score'))
-                else:
-                    current_scores[score_key] = existing_data.get(score_key)
-            # Preserve existing model if present
-            if 'model' in existing_data:
-                current_scores['model'] = existing_data['model']
+            current_scores = get_current_scores(existing_data)
+            # Computed once; empty means the entry is complete
+            missing_keys = get_missing_score_keys(current_scores)
             
-            if all(current_scores.values()):
+            if not missing_keys:
                 if ticker:
                     model_name = current_scores.get('model', 'Unknown')
                     print(f"\n{ticker.upper()} ({company_name}) already scored (Model: {model_name}):")
@@ -1693,15 +2093,11 @@ def get_company_moat_score(input_str):
                 print(f"{'Total':<35} {total_str:>8}")
                 return
             
-            grok = OpenRouterClient(api_key=OPENROUTER_KEY)
-            
-            # Get list of missing score keys
-            missing_keys = [key for key in SCORE_DEFINITIONS if not current_scores[key]]
+            grok = get_openrouter_client()
             
             if missing_keys:
-                print("Querying missing metrics in parallel...")
-                # Query missing scores in parallel
-                missing_scores, tokens_used, token_usage, model_used = query_all_scores_async(grok, company_name, missing_keys,
+                print("Querying missing metrics in one request...")
+                missing_scores, tokens_used, token_usage, model_used = query_all_scores_batched(grok, company_name, missing_keys,
                                                         batch_mode=False, silent=False, ticker=ticker)
                 # Update current_scores with the new scores
                 current_scores.update(missing_scores)
@@ -1731,11 +2127,10 @@ def get_company_moat_score(input_str):
             print(f"\nAnalyzing {ticker.upper()} ({company_name})...")
         else:
             print(f"\nAnalyzing {company_name}...")
-        print("Querying all metrics in parallel...")
-        grok = OpenRouterClient(api_key=OPENROUTER_KEY)
+        print("Querying all metrics in one request...")
+        grok = get_openrouter_client()
         
-        # Query all scores in parallel
-        all_scores, total_tokens, token_usage, model_used = query_all_scores_async(grok, company_name, list(SCORE_DEFINITIONS.keys()),
+        all_scores, total_tokens, token_usage, model_used = query_all_scores_batched(grok, company_name, list(SCORE_DEFINITIONS.keys()),
                                             batch_mode=False, silent=False, ticker=ticker)
         
         # Add model name to scores
@@ -1805,25 +2200,32 @@ def handle_redo_command(tickers_input):
         print(f"\nProcessing {len(tickers)} ticker(s) for rescoring...")
         print("=" * 80)
         
-        for i, ticker in enumerate(tickers, 1):
-            ticker_upper = ticker.strip().upper()
-            ticker_lookup = load_ticker_lookup()
-            company_name = ticker_lookup.get(ticker_upper, ticker_upper)
-            print(f"\n[{i}/{len(tickers)}] Rescoring {ticker_upper} ({company_name})...")
-            result = score_single_ticker(ticker, silent=True, batch_mode=True, force_rescore=True)
-            if result:
-                if result['success']:
-                    total = result.get('total')
-                    model_name = result.get('scores', {}).get('model', 'Unknown') if result.get('scores') else 'Unknown'
-                    if total is not None:
-                        all_totals = get_all_total_scores()
-                        percentile = calculate_percentile_rank(total, all_totals) if all_totals and len(all_totals) > 1 else None
-                        total_str = format_total_score(total, percentile)
-                        print(f"  ✓ {ticker_upper} rescored successfully - {total_str} (Model: {model_name})")
+        scores_data = load_scores()
+        # Save on the way out too, so a Ctrl-C keeps progress since the last checkpoint
+        try:
+            for i, ticker in enumerate(tickers, 1):
+                ticker_upper = ticker.strip().upper()
+                ticker_lookup = load_ticker_lookup()
+                company_name = ticker_lookup.get(ticker_upper, ticker_upper)
+                print(f"\n[{i}/{len(tickers)}] Rescoring {ticker_upper} ({company_name})...")
+                result = score_single_ticker(ticker, silent=True, batch_mode=True, force_rescore=True, scores_data=scores_data)
+                if i % SCORES_SAVE_EVERY == 0:
+                    save_scores(scores_data)
+                if result:
+                    if result['success']:
+                        total = result.get('total')
+                        model_name = result.get('scores', {}).get('model', 'Unknown') if result.get('scores') else 'Unknown'
+                        if total is not None:
+                            all_totals = get_all_total_scores(scores_data)
+                            percentile = calculate_percentile_rank(total, all_totals) if all_totals and len(all_totals) > 1 else None
+                            total_str = format_total_score(total, percentile)
+                            print(f"  ✓ {ticker_upper} rescored successfully - {total_str} (Model: {model_name})")
+                        else:
+                            print(f"  ✓ {ticker_upper} rescored successfully (Model: {model_name})")
                     else:
-                        print(f"  ✓ {ticker_upper} rescored successfully (Model: {model_name})")
-                else:
-                    print(f"  ✗ Error rescoring {ticker_upper}: {result.get('error', 'Unknown error')}")
+                        print(f"  ✗ Error rescoring {ticker_upper}: {result.get('error', 'Unknown error')}")
+        finally:
+            save_scores(scores_data)
 
 
 def handle_upgrade_command():
@@ -1882,64 +2284,70 @@ def handle_upgrade_command():
     total_upgrade_tokens = 0
     total_upgrade_cost = 0.0
     
-    for i, (ticker, company_name, old_model) in enumerate(tickers_to_upgrade, 1):
-        print(f"\n[{i}/{len(tickers_to_upgrade)}] Upgrading {ticker} ({company_name})...")
-        print(f"  Old model: {old_model} -> New model: {current_model}")
+    # Save on the way out too, so a Ctrl-C keeps progress since the last checkpoint
+    try:
+        for i, (ticker, company_name, old_model) in enumerate(tickers_to_upgrade, 1):
+            print(f"\n[{i}/{len(tickers_to_upgrade)}] Upgrading {ticker} ({company_name})...")
+            print(f"  Old model: {old_model} -> New model: {current_model}")
         
-        # Track timing
-        start_time = time.time()
-        result = score_single_ticker(ticker, silent=True, batch_mode=True, force_rescore=True)
-        elapsed_time = time.time() - start_time
+            # Track timing
+            start_time = time.time()
+            result = score_single_ticker(ticker, silent=True, batch_mode=True, force_rescore=True, scores_data=scores_data)
+            elapsed_time = time.time() - start_time
+            if i % SCORES_SAVE_EVERY == 0:
+                save_scores(scores_data)
         
-        if result:
-            if result['success']:
-                total = result.get('total')
-                model_name = result.get('scores', {}).get('model', 'Unknown') if result.get('scores') else 'Unknown'
-                total_tokens = result.get('total_tokens', 0)
-                token_usage = result.get('token_usage')
-                model_used = result.get('model_used', current_model)
+            if result:
+                if result['success']:
+                    total = result.get('total')
+                    model_name = result.get('scores', {}).get('model', 'Unknown') if result.get('scores') else 'Unknown'
+                    total_tokens = result.get('total_tokens', 0)
+                    token_usage = result.get('token_usage')
+                    model_used = result.get('model_used', current_model)
                 
-                # Calculate cost
-                cost = 0.0
-                if total_tokens > 0 and model_used:
-                    cost = calculate_token_cost(total_tokens, model=model_used, token_usage=token_usage)
-                    total_upgrade_tokens += total_tokens
-                    total_upgrade_cost += cost
+                    # Calculate cost
+                    cost = 0.0
+                    if total_tokens > 0 and model_used:
+                        cost = calculate_token_cost(total_tokens, model=model_used, token_usage=token_usage)
+                        total_upgrade_tokens += total_tokens
+                        total_upgrade_cost += cost
                 
-                # Format token breakdown
-                token_info = f"{total_tokens:,} tokens"
-                if token_usage:
-                    input_tokens = token_usage.get('input_tokens') if 'input_tokens' in token_usage else token_usage.get('prompt_tokens', 0)
-                    output_tokens = token_usage.get('output_tokens') if 'output_tokens' in token_usage else token_usage.get('completion_tokens', 0)
-                    cached_tokens = (token_usage.get('cached_tokens') if 'cached_tokens' in token_usage else
-                                   token_usage.get('cached_input_tokens') if 'cached_input_tokens' in token_usage else
-                                   token_usage.get('prompt_cache_hit_tokens', 0))
-                    if cached_tokens > 0:
-                        token_info = f"{input_tokens:,} input, {output_tokens:,} output, {cached_tokens:,} cached"
-                    else:
-                        token_info = f"{input_tokens:,} input, {output_tokens:,} output"
+                    # Format token breakdown
+                    token_info = f"{total_tokens:,} tokens"
+                    if token_usage:
+                        input_tokens = token_usage.get('input_tokens') if 'input_tokens' in token_usage else token_usage.get('prompt_tokens', 0)
+                        output_tokens = token_usage.get('output_tokens') if 'output_tokens' in token_usage else token_usage.get('completion_tokens', 0)
+                        cached_tokens = (token_usage.get('cached_tokens') if 'cached_tokens' in token_usage else
+                                       token_usage.get('cached_input_tokens') if 'cached_input_tokens' in token_usage else
+                                       token_usage.get('prompt_cache_hit_tokens', 0))
+                        if cached_tokens > 0:
+                            token_info = f"{input_tokens:,} input, {output_tokens:,} output, {cached_tokens:,} cached"
+                        else:
+                            token_info = f"{input_tokens:,} input, {output_tokens:,} output"
                 
-                # Format cost
-                cost_str = f"{cost * 100:.4f} cents" if cost > 0 else "N/A"
+                    # Format cost
+                    cost_str = f"{cost * 100:.4f} cents" if cost > 0 else "N/A"
                 
-                # Format time
-                time_str = f"{elapsed_time:.2f}s"
+                    # Format time
+                    time_str = f"{elapsed_time:.2f}s"
                 
-                if total is not None:
-                    all_totals = get_all_total_scores()
-                    percentile = calculate_percentile_rank(total, all_totals) if all_totals and len(all_totals) > 1 else None
-                    total_str = format_total_score(total, percentile)
-                    print(f"  ✓ {ticker} upgraded successfully - {total_str} (Model: {model_name})")
+                    if total is not None:
+                        all_totals = get_all_total_scores(scores_data)
+                        percentile = calculate_percentile_rank(total, all_totals) if all_totals and len(all_totals) > 1 else None
+                        total_str = format_total_score(total, percentile)
+                        print(f"  ✓ {ticker} upgraded successfully - {total_str} (Model: {model_name})")
+                    else:
+                        print(f"  ✓ {ticker} upgraded successfully (Model: {model_name})")
+                    print(f"    Time: {time_str} | Tokens: {token_info} | Cost: {cost_str}")
+                    successful += 1
                 else:
-                    print(f"  ✓ {ticker} upgraded successfully (Model: {model_name})")
-                print(f"    Time: {time_str} | Tokens: {token_info} | Cost: {cost_str}")
-                successful += 1
+                    print(f"  ✗ Error upgrading {ticker}: {result.get('error', 'Unknown error')}")
+                    failed += 1
             else:
-                print(f"  ✗ Error upgrading {ticker}: {result.get('error', 'Unknown error')}")
+                print(f"  ✗ Error upgrading {ticker}: Invalid ticker or lookup failed")
                 failed += 1
-        else:
-            print(f"  ✗ Error upgrading {ticker}: Invalid ticker or lookup failed")
-            failed += 1
+    finally:
+        save_scores(scores_data)
     
     print("\n" + "=" * 80)
     print(f"Upgrade complete!")
@@ -1955,53 +2363,77 @@ def migrate_scores_to_uppercase():
     """Migrate existing scores to uppercase ticker keys and remove duplicates.
     Tickers (1-5 chars, alphabetic) are converted to uppercase.
     Company names remain lowercase."""
+    from datetime import datetime
+    
     scores_data = load_scores()
-    uppercase_companies = {}
-    ticker_lookup = load_ticker_lookup()
+    # key -> (data, parsed timestamp or None); each entry's timestamp is parsed once
+    newest_entries = {}
     
     for company, data in scores_data["companies"].items():
-        # Check if it's a ticker (short, alphabetic)
+        # Tickers (short, alphabetic) are uppercased; company names keep their key as-is
         if len(company) <= 5 and company.replace(' ', '').isalpha():
-            # It's a ticker - convert to uppercase
-            company_upper = company.upper()
-            if company_upper not in uppercase_companies:
-                uppercase_companies[company_upper] = data
-            else:
-                # Duplicate found - keep the newer one
-                existing_date = uppercase_companies[company_upper].get('date', '1900-01-01')
-                new_date = data.get('date', '1900-01-01')
-                
-                if 'timestamp' in uppercase_companies[company_upper] and 'timestamp' in data:
-                    existing_time = datetime.fromisoformat(uppercase_companies[company_upper].get('timestamp', '1900-01-01T00:00:00'))
-                    new_time = datetime.fromisoformat(data.get('timestamp', '1900-01-01T00:00:00'))
-                    if new_time > existing_time:
-                        uppercase_companies[company_upper] = data
-                elif new_date > existing_date:
-                    uppercase_companies[company_upper] = data
+            key = company.upper()
         else:
-            # It's a company name - keep as lowercase
-            if company not in uppercase_companies:
-                uppercase_companies[company] = data
-            else:
-                # Duplicate found - keep the newer one
-                existing_date = uppercase_companies[company].get('date', '1900-01-01')
-                new_date = data.get('date', '1900-01-01')
-                
-                if 'timestamp' in uppercase_companies[company] and 'timestamp' in data:
-                    existing_time = datetime.fromisoformat(uppercase_companies[company].get('timestamp', '1900-01-01T00:00:00'))
-                    new_time = datetime.fromisoformat(data.get('timestamp', '1900-01-01T00:00:00'))
-                    if new_time > existing_time:
-                        uppercase_companies[company] = data
-                elif new_date > existing_date:
-                    uppercase_companies[company] = data
+            key = company
+        
+        try:
+            timestamp = datetime.fromisoformat(data['timestamp']) if 'timestamp' in data else None
+        except (TypeError, ValueError):
+            timestamp = None
+        
+        existing = newest_entries.get(key)
+        if existing is None:
+            newest_entries[key] = (data, timestamp)
+            continue
+        
+        # Duplicate found - keep the newer one, by timestamp if both have one, else by date
+        existing_data, existing_timestamp = existing
+        if existing_timestamp is not None and timestamp is not None:
+            is_newer = timestamp > existing_timestamp
+        else:
+            is_newer = data.get('date', '1900-01-01') > existing_data.get('date', '1900-01-01')
+        if is_newer:
+            newest_entries[key] = (data, timestamp)
     
+    uppercase_companies = {key: data for key, (data, _) in newest_entries.items()}
     scores_data["companies"] = uppercase_companies
     save_scores(scores_data)
     return len(scores_data["companies"])
 
 
-async def fill_single_company_async(grok, company_name, company_scores, ticker_lookup, company_index, total_companies):
-    """Async function to fill missing scores for a single company."""
+def migrate_stringified_scores():
+    """Convert scores stored as strings by older versions to ints.
+    Markdown emphasis and whitespace (e.g. "**7**") are stripped first. Strings that
+    still aren't a valid 0-10 score are left unchanged and returned so they can be
+    fixed by hand.
+    
+    Returns:
+        tuple: (number of score values converted, list of (ticker, score_key, value)
+               for the strings that were left unchanged)
+    """
+    scores_data = load_scores()
+    converted = 0
+    unparseable = []
+    
+    for ticker, data in scores_data["companies"].items():
+        for score_key in SCORE_DEFINITIONS:
+            value = data.get(score_key)
+            if isinstance(value, str):
+                score = _parse_score(value)
+                if score is None:
+                    unparseable.append((ticker, score_key, value))
+                    continue
+                data[score_key] = score
+                converted += 1
+    
+    if converted:
+        save_scores(scores_data)
+    return converted, unparseable
+
+
+async def fill_single_company_async(grok, company_name, company_scores, missing_keys, ticker_lookup, company_index, total_companies):
+    """Async function to fill missing scores for a single company.
+    missing_keys is the list of score keys to query, as planned by fill_missing_barriers_scores."""
     try:
         # Determine if company_name is a ticker and get actual company name
         ticker = None
@@ -2029,16 +2461,13 @@ async def fill_single_company_async(grok, company_name, company_scores, ticker_l
         
         print(f"[{company_index}/{total_companies}] Processing {display_name}...")
         
-        # Get list of missing score keys
-        missing_keys = [key for key in SCORE_DEFINITIONS if not company_scores[key]]
-        
         # Preserve existing model or determine from ticker
         existing_model = company_scores.get('model')
         if not existing_model:
             existing_model = get_model_for_ticker(ticker) if ticker else "grok-4-1-fast-reasoning"
         
         if missing_keys:
-            # Query missing scores in parallel (this uses ThreadPoolExecutor internally)
+            # Query all missing scores in one request (any the reply lacks are re-queried individually)
             # Run in executor to make it async-compatible
             try:
                 loop = asyncio.get_running_loop()
@@ -2047,8 +2476,8 @@ async def fill_single_company_async(grok, company_name, company_scores, ticker_l
             
             missing_scores, _, _, model_used = await loop.run_in_executor(
                 None,
-                lambda: query_all_scores_async(grok, actual_company_name, missing_keys,
-                                              batch_mode=True, silent=True, ticker=ticker)
+                lambda: query_all_scores_batched(grok, actual_company_name, missing_keys,
+                                                 batch_mode=True, silent=True, ticker=ticker)
             )
             # Update company_scores with the new scores
             company_scores.update(missing_scores)
@@ -2062,28 +2491,32 @@ async def fill_single_company_async(grok, company_name, company_scores, ticker_l
         return company_name, company_scores
 
 
+# Companies filled concurrently by fill_missing_barriers_scores
+FILL_MAX_CONCURRENT_COMPANIES = 20
+
+
 def fill_missing_barriers_scores():
     """Fill in missing scores for all companies using SCORE_DEFINITIONS.
-    Processes companies in batches of 20 using async."""
+    Keeps up to FILL_MAX_CONCURRENT_COMPANIES companies in flight at once using async,
+    starting the next company as soon as any one finishes."""
     try:
         scores_data = load_scores()
-        grok = OpenRouterClient(api_key=OPENROUTER_KEY)
+        grok = get_openrouter_client()
         
+        # Plan the work once: (company, current scores, missing score keys) per company
         companies_to_score = []
         for company_name, data in scores_data["companies"].items():
-            moat_score = data.get('moat_score', data.get('score'))
-            if not moat_score:
+            moat_score = data.get('moat_score')
+            if moat_score in (None, ''):
                 continue
             
-            missing_scores = []
             company_scores = {}
             for score_key in SCORE_DEFINITIONS:
                 company_scores[score_key] = data.get(score_key)
-                if not company_scores[score_key]:
-                    missing_scores.append(SCORE_DEFINITIONS[score_key]['display_name'])
             
-            if missing_scores:
-                companies_to_score.append((company_name, company_scores))
+            missing_keys = get_missing_score_keys(company_scores)
+            if missing_keys:
+                companies_to_score.append((company_name, company_scores, missing_keys))
         
         if not companies_to_score:
             print("\nAll companies already have all scores!")
@@ -2091,49 +2524,51 @@ def fill_missing_barriers_scores():
         
         print(f"\nFound {len(companies_to_score)} companies missing scores:")
         print("=" * 60)
-        for company_name, company_scores in companies_to_score:
+        for company_name, company_scores, missing_keys in companies_to_score:
             moat = company_scores.get('moat_score', 'N/A')
-            missing = [SCORE_DEFINITIONS[k]['display_name'] for k, v in company_scores.items() if not v]
+            missing = [SCORE_DEFINITIONS[k]['display_name'] for k in missing_keys]
             # Display ticker in uppercase if it looks like a ticker, otherwise capitalize
             display_name = company_name.upper() if len(company_name) <= 5 and company_name.replace(' ', '').isalpha() else company_name.capitalize()
             print(f"{display_name}: Moat {moat}/10 - Missing: {', '.join(missing)}")
         
-        print(f"\nQuerying missing scores in batches of 20...")
+        print(f"\nQuerying missing scores ({FILL_MAX_CONCURRENT_COMPANIES} companies at a time)...")
         print("=" * 60)
         
         ticker_lookup = load_ticker_lookup()
+        total_companies = len(companies_to_score)
         
-        # Process companies in batches of 20 using async
-        async def process_all_batches():
-            batch_size = 20
-            total_batches = (len(companies_to_score) + batch_size - 1) // batch_size
+        # A sliding window rather than fixed batches, so one slow company doesn't hold up the rest
+        async def process_all_companies():
+            # Each company's queries run on an executor thread, so size the pool to the window
+            asyncio.get_running_loop().set_default_executor(
+                ThreadPoolExecutor(max_workers=FILL_MAX_CONCURRENT_COMPANIES)
+            )
+            semaphore = asyncio.Semaphore(FILL_MAX_CONCURRENT_COMPANIES)
             
-            for batch_num in range(total_batches):
-                start_idx = batch_num * batch_size
-                end_idx = min(start_idx + batch_size, len(companies_to_score))
-                batch = companies_to_score[start_idx:end_idx]
-                
-                print(f"\nProcessing batch {batch_num + 1}/{total_batches} ({len(batch)} companies)...")
-                
-                # Create async tasks for this batch
-                tasks = []
-                for i, (company_name, company_scores) in enumerate(batch):
-                    company_index = start_idx + i + 1
-                    task = fill_single_company_async(grok, company_name, company_scores.copy(), ticker_lookup, company_index, len(companies_to_score))
-                    tasks.append(task)
-                
-                # Run all tasks in the batch concurrently
-                results = await asyncio.gather(*tasks)
-                
-                # Update scores_data with results and save
-                for company_name, updated_scores in results:
-                    scores_data["companies"][company_name] = updated_scores
+            async def fill_with_limit(company_index, company_name, company_scores, missing_keys):
+                async with semaphore:
+                    return await fill_single_company_async(grok, company_name, company_scores, missing_keys, ticker_lookup, company_index, total_companies)
+            
+            tasks = [
+                fill_with_limit(i, company_name, company_scores.copy(), missing_keys)
+                for i, (company_name, company_scores, missing_keys) in enumerate(companies_to_score, 1)
+            ]
+            
+            completed = 0
+            for next_result in asyncio.as_completed(tasks):
+                company_name, updated_scores = await next_result
+                scores_data["companies"][company_name] = updated_scores
+                completed += 1
                 
-                save_scores(scores_data)
-                print(f"  Batch {batch_num + 1} complete - saved progress")
+                if completed % SCORES_SAVE_EVERY == 0 and completed < total_companies:
+                    save_scores(scores_data)
+                    print(f"  {completed}/{total_companies} companies complete - saved progress")
         
-        # Run the async function
-        asyncio.run(process_all_batches())
+        # Run the async function, saving at the end (or on Ctrl-C) whatever has completed
+        try:
+            asyncio.run(process_all_companies())
+        finally:
+            save_scores(scores_data)
         
         print("\n" + "=" * 60)
         print("All missing scores have been filled!")
@@ -2176,6 +2611,7 @@ def view_scores(score_type=None):
         return key
     
     # Check if score_type is actually a ticker or company name
+    data = None
     if score_type:
         # Try direct match
         if score_type in scores_data["companies"]:
@@ -2193,10 +2629,12 @@ def view_scores(score_type=None):
                 data = scores_data["companies"][ticker]
             elif resolved_name.lower() in scores_data["companies"]:
                 data = scores_data["companies"][resolved_name.lower()]
-            else:
+            elif score_type.lower() not in SCORE_ALIAS_MAP:
                 print(f"Company '{score_type}' not found in scores.")
                 return
-        
+    
+    # A company was found; otherwise score_type names a metric, shown further down
+    if data is not None:
         # Determine display name - capitalize if it's a ticker
         if score_type.upper() in scores_data["companies"]:
             display_name = score_type.upper()
@@ -2253,104 +2691,61 @@ def view_scores(score_type=None):
         
         return
     
-    # Helper function to calculate total score
-    def get_total_score(item):
-        data = item[1]
-        total = 0
-        for score_key, score_def in SCORE_DEFINITIONS.items():
-            score_val = data.get(score_key, 'N/A')
-            weight = SCORE_WEIGHTS.get(score_key, 1.0)
-            if score_val == 'N/A':
-                if score_def['is_reverse']:
-                    total += 10 * weight
-                continue
-            
-            try:
-                val = float(score_val)
-                if score_def['is_reverse']:
-                    total += (10 - val) * weight
-                else:
-                    total += val * weight
-            except (ValueError, TypeError):
-                    pass
-        return total
-    
-    sorted_companies = sorted(scores_data["companies"].items(), key=get_total_score, reverse=True)
-    
     # If score_type not provided, show total scores for all companies
     if not score_type:
         print("\nStored Company Scores (Total only):")
         print("=" * 80)
-        print(f"Number of stocks scored: {len(sorted_companies)}")
+        print(f"Number of stocks scored: {len(scores_data['companies'])}")
         print()
         
-        max_name_len = max([len(company.capitalize()) for company, data in sorted_companies]) if sorted_companies else 0
-        
-        # Calculate all totals for percentile calculation
-        all_totals = []
-        company_totals = {}
-        for company, data in sorted_companies:
-            total = 0
-            all_present = True
-            for score_key, score_def in SCORE_DEFINITIONS.items():
-                score_val = data.get(score_key, 'N/A')
-                weight = SCORE_WEIGHTS.get(score_key, 1.0)
-                if score_val == 'N/A':
-                    all_present = False
-                    break
-                try:
-                    val = float(score_val)
-                    if score_def['is_reverse']:
-                        total += (10 - val) * weight
-                    else:
-                        total += val * weight
-                except (ValueError, TypeError):
-                    all_present = False
-                    break
-            
-            if all_present:
-                company_totals[company] = total
-                all_totals.append(total)
+        # Imported here rather than at module level so commands that don't show this table start faster
+        import numpy as np
+        
+        companies, values = build_score_matrix(scores_data["companies"])
+        # Name column width from the stored keys (capped at 30), measured in one C-level pass
+        name_width = min(max(map(len, companies)), 30)
+        
+        # Reverse scores count as (10 - score), so each total is values @ (sign * weight)
+        # plus 10 * weight for every reverse metric
+        reverse_mask = np.array([score_def['is_reverse'] for score_def in SCORE_DEFINITIONS.values()])
+        weights = np.array([SCORE_WEIGHTS.get(key, 1.0) for key in SCORE_DEFINITIONS])
+        signed_weights = np.where(reverse_mask, -weights, weights)
+        reverse_offset = 10 * weights[reverse_mask].sum()
+        # Any NaN carries through, so only companies with every score present get a total
+        totals = values @ signed_weights + reverse_offset
+        complete = np.flatnonzero(~np.isnan(totals))
+        # Highest total first; the stable sort keeps ties in file order
+        order = complete[np.argsort(-totals[complete], kind='stable')]
+        # Percentile rank (share of complete totals <= each total) for every row at once
+        ascending_totals = np.sort(totals[complete])
+        percentiles = (np.searchsorted(ascending_totals, totals[order], side='right') / len(complete) * 100).astype(int)
+        max_score = sum(SCORE_WEIGHTS.get(key, 1.0) for key in SCORE_DEFINITIONS) * 10
         
         # Print column headers
-        print(f"{'Company':<{min(max_name_len, 30)}} {'Score':>8} {'Percentile':>12}")
-        print("-" * (min(max_name_len, 30) + 8 + 12 + 2))
-        
-        # Display companies with percentiles (only show companies with complete scores)
-        for company, data in sorted_companies:
-            # Skip companies that don't have all scores
-            if company not in company_totals:
-                continue
-                
-            total = company_totals[company]
-            max_score = sum(SCORE_WEIGHTS.get(key, 1.0) for key in SCORE_DEFINITIONS) * 10
-            percentage = int((total / max_score) * 100)
+        print(f"{'Company':<{name_width}} {'Score':>8} {'Percentile':>12}")
+        print("-" * (name_width + 8 + 12 + 2))
+        
+        # Display companies with percentiles (only companies with complete scores have a total),
+        # collecting the rows so the table is written with one print
+        # The column width is fixed for the table, so build the row template once
+        row_format = f"{{:<{name_width}}} {{:>8}} {{:>12}}"
+        rows = []
+        for index, percentile in zip(order, percentiles):
+            percentage = int((totals[index] / max_score) * 100)
             percentage_str = f"{percentage}"
             
-            percentile = calculate_percentile_rank(total, all_totals) if len(all_totals) > 1 else None
-            if percentile is not None:
-                percentile_str = f"{percentile}"
-            else:
-                percentile_str = 'N/A'
+            # Percentiles need at least 2 scores to compare
+            percentile_str = f"{percentile}" if len(complete) > 1 else 'N/A'
             
             # Display ticker if available, otherwise company name
-            display_key = get_display_name(company)
-            if len(display_key) > 30:
-                display_key = display_key[:30]
-            print(f"{display_key:<{min(max_name_len, 30)}} {percentage_str:>8} {percentile_str:>12}")
+            display_key = get_display_name(companies[index])[:30]
+            rows.append(row_format.format(display_key, percentage_str, percentile_str))
+        if rows:
+            print("\n".join(rows))
         return
     
     # If we get here, score_type is a score type (not a company)
-    score_type_lower = score_type.lower()
-    
-    score_map = {name.lower() or key.lower(): key for key, val in SCORE_DEFINITIONS.items() 
-                for name in [val['display_name'], key] + key.split('_')}
-    
-    matching_key = None
-    for name, key in score_map.items():
-        if score_type_lower in name or name in score_type_lower:
-            matching_key = key
-            break
+    matching_key = find_score_key(score_type)
     
     if not matching_key:
         print(f"Unknown score type: {score_type}")
@@ -2361,31 +2756,31 @@ def view_scores(score_type=None):
     print(f"\nStored Company Scores ({score_def['display_name']}):")
     print("=" * 80)
     
-    def get_field_score(item):
-        data = item[1]
-        score = data.get(matching_key, 'N/A')
-        try:
-            return float(score) if score != 'N/A' else 0
-        except (ValueError, TypeError):
-            return 0
-    
-    sorted_by_field = sorted(scores_data["companies"].items(), key=get_field_score, reverse=True)
-    max_name_len = max([len(get_display_name(company)) for company, data in sorted_by_field]) if sorted_by_field else 0
-    
-    for company, data in sorted_by_field:
-        score = data.get(matching_key, 'N/A')
-        if score != 'N/A':
-            try:
-                score_float = float(score)
-                score = f"{int(score_float)}" if score_float == int(score_float) else f"{score_float:.1f}"
-            except (ValueError, TypeError):
-                pass
-        
-        # Display ticker if available, otherwise company name
-        display_key = get_display_name(company)
-        if len(display_key) > 30:
-            display_key = display_key[:30]
-        print(f"{display_key:<{min(max_name_len, 30)}} {score:>8}")
+    import numpy as np
+    
+    # This metric's column; missing or invalid scores sort as 0
+    companies, values = build_score_matrix(scores_data["companies"])
+    column = values[:, list(SCORE_DEFINITIONS).index(matching_key)]
+    # Highest first; the stable sort keeps ties in file order
+    order = np.argsort(-np.nan_to_num(column, nan=0.0), kind='stable')
+    # Display ticker if available, otherwise company name; resolved once per company
+    display_names = [get_display_name(companies[index]) for index in order]
+    name_width = min(max(map(len, display_names), default=0), 30)
+    row_format = f"{{:<{name_width}}} {{:>8}}"
+    
+    rows = []
+    for index, display_key in zip(order, display_names):
+        score_float = column[index]
+        if np.isnan(score_float):
+            # Show whatever is stored in place of a number
+            score = scores_data["companies"][companies[index]].get(matching_key)
+            if score is None:
+                score = 'N/A'
+        else:
+            score = _format_score(float(score_float))
+        rows.append(row_format.format(display_key[:30], score))
+    if rows:
+        print("\n".join(rows))
 
 
 def delete_company(input_str):
@@ -2537,14 +2932,12 @@ def rank_by_metric(metric_key):
     print(f"{'Rank':<6} {'Company':<40} {'Score':>8}")
     print("-" * 80)
     
+    # Collect the rows so the table is written with one print
+    rows = []
     for rank, (sort_value, original_val, display_name, company_key) in enumerate(rankings, 1):
         # Format the original value for display
         try:
-            score_float = float(original_val)
-            if score_float == int(score_float):
-                score_str = str(int(score_float))
-            else:
-                score_str = f"{score_float:.1f}"
+            score_str = _format_score(float(original_val))
         except (ValueError, TypeError):
             score_str = str(original_val)
         
@@ -2552,7 +2945,8 @@ def rank_by_metric(metric_key):
         if len(display_name) > 38:
             display_name = display_name[:35] + "..."
         
-        print(f"{rank:<6} {display_name:<40} {score_str:>8}")
+        rows.append(f"{rank:<6} {display_name:<40} {score_str:>8}")
+    print("\n".join(rows))
 
 
 def handle_rank_command():
@@ -2964,7 +3358,7 @@ Example format: "MSFT, GOOGL, META, AMZN, ..."
 Return only the ticker symbols in ranked order, nothing else."""
 
     try:
-        grok = OpenRouterClient(api_key=OPENROUTER_KEY)
+        grok = get_openrouter_client()
         model = get_model_for_ticker(ticker)
         
         # Track time
@@ -3240,7 +3634,7 @@ def main():
     print("  Type 'rank' to see rankings by metric")
     print("  Type 'delete' to remove a company's scores")
     print("  Type 'fill' to score companies with missing scores")
-    print("  Type 'migrate' to fix duplicate entries")
+    print("  Type 'migrate' to fix duplicate entries and convert text scores to numbers")
     print("  Type 'redo TICKER1 TICKER2 ...' to rescore ticker(s) (forces new scoring even if scores exist)")
     print("  Type 'upgrade' to rescore all tickers not using the current model")
     print("  Type 'define TICKER = Company Name' to add custom ticker definition")
@@ -3256,68 +3650,77 @@ def main():
     while True:
         try:
             user_input = input("Enter ticker or company name (or 'view'/'rank'/'delete'/'fill'/'redo'/'upgrade'/'define'/'redefine'/'correl'/'peer'/'clear'/'quit'): ").strip()
+            # Commands are matched case-insensitively; lowercase the input once per command
+            command = user_input.lower()
             
-            if user_input.lower() in ['quit', 'exit', 'q']:
+            if command in ['quit', 'exit', 'q']:
                 print("Goodbye!")
                 break
-            elif user_input.lower() == 'clear':
+            elif command == 'clear':
                 # Clear terminal - cross-platform
                 os.system('cls' if os.name == 'nt' else 'clear')
                 print()
-            elif user_input.lower() == 'view':
+            elif command == 'view':
                 view_scores()
                 print()
-            elif user_input.lower() == 'rank':
+            elif command == 'rank':
                 handle_rank_command()
                 print()
-            elif user_input.lower() == 'delete':
+            elif command == 'delete':
                 delete_input = input("Enter ticker or company name to delete: ").strip()
                 if delete_input:
                     delete_company(delete_input)
                 else:
                     print("Please enter a ticker symbol or company name to delete.")
                 print()
-            elif user_input.lower() == 'fill':
+            elif command == 'fill':
                 fill_missing_barriers_scores()
                 print()
-            elif user_input.lower() == 'migrate':
+            elif command == 'migrate':
                 count = migrate_scores_to_uppercase()
+                converted, unparseable = migrate_stringified_scores()
                 print(f"\nMigration complete! Now storing {count} unique companies.")
                 print("All tickers have been converted to uppercase.")
+                if converted:
+                    print(f"Converted {converted} text scores to numbers.")
+                if unparseable:
+                    print(f"Left {len(unparseable)} text scores that aren't a 0-10 number unchanged:")
+                    for ticker, score_key, value in unparseable:
+                        print(f"  {ticker} {score_key}: {value!r}")
                 print()
-            elif user_input.lower() == 'redo':
+            elif command == 'redo':
                 print("Please provide ticker symbol(s). Example: redo AAPL or redo AAPL MSFT GOOGL")
                 print()
-            elif user_input.lower().startswith('redo '):
+            elif command.startswith('redo '):
                 tickers = user_input[5:].strip()  # Remove 'redo ' prefix
                 handle_redo_command(tickers)
                 print()
-            elif user_input.lower() == 'upgrade':
+            elif command == 'upgrade':
                 handle_upgrade_command()
                 print()
-            elif user_input.lower() == 'define':
+            elif command == 'define':
                 print("Usage:")
                 print("  define SKH = SK Hynix          - Add/update a ticker definition")
                 print("  define -r SKH                  - Remove a ticker definition")
                 print("  define -l                      - List all custom ticker definitions")
                 print()
-            elif user_input.lower().startswith('define '):
+            elif command.startswith('define '):
                 command_input = user_input[7:].strip()  # Remove 'define ' prefix
                 handle_define_command(command_input)
                 print()
-            elif user_input.lower() == 'redefine':
+            elif command == 'redefine':
                 print("Usage:")
                 print("  redefine NEW_TICKER = OLD_TICKER    - Rename a ticker definition")
                 print()
-            elif user_input.lower().startswith('redefine '):
+            elif command.startswith('redefine '):
                 command_input = user_input[9:].strip()  # Remove 'redefine ' prefix
                 handle_redefine_command(command_input)
                 print()
-            elif user_input.lower() == 'correl':
+            elif command == 'correl':
                 print("Usage: correl TICKER1 TICKER2")
                 print("Example: correl AAPL MSFT")
                 print()
-            elif user_input.lower().startswith('correl '):
+            elif command.startswith('correl '):
                 command_input = user_input[7:].strip()  # Remove 'correl ' prefix
                 tickers = command_input.split()
                 if len(tickers) == 2:
@@ -3327,11 +3730,11 @@ def main():
                     print("Usage: correl TICKER1 TICKER2")
                     print("Example: correl AAPL MSFT")
                 print()
-            elif user_input.lower() == 'peer':
+            elif command == 'peer':
                 print("Usage: peer TICKER")
                 print("Example: peer AAPL")
                 print()
-            elif user_input.lower().startswith('peer '):
+            elif command.startswith('peer '):
                 command_input = user_input[5:].strip()  # Remove 'peer ' prefix
                 handle_peer_command(command_input)
                 print()
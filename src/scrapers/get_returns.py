@@ -6,10 +6,20 @@ Calculates total return from December 1st to today for each ticker
 
 import json
 import os
+import sys
 from datetime import datetime, date
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+import numpy as np
 import yfinance as yf
+# ijson is optional; it streams the ticker symbols out of the large ticker file without building every company dict
+try:
+    import ijson
+    TICKER_FILE_ERRORS = (json.JSONDecodeError, ijson.JSONError, FileNotFoundError)
+except ImportError:
+    ijson = None
+    TICKER_FILE_ERRORS = (json.JSONDecodeError, FileNotFoundError)
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.utils.json_utils import read_json_file
 
 SCORES_FILE = "data/scores.json"
 TICKER_FILE = "data/stock_tickers_clean.json"
@@ -23,8 +33,7 @@ def load_scores():
         return None
     
     try:
-        with open(SCORES_FILE, 'r') as f:
-            data = json.load(f)
+        data = read_json_file(SCORES_FILE)
         return data.get("companies", {})
     except (json.JSONDecodeError, FileNotFoundError) as e:
         print(f"Error loading {SCORES_FILE}: {e}")
@@ -38,13 +47,16 @@ def load_valid_tickers():
         return set()
     
     try:
-        with open(TICKER_FILE, 'r') as f:
-            data = json.load(f)
+        if ijson is not None:
+            # Only the ticker field of each company is needed
+            with open(TICKER_FILE, 'rb') as f:
+                return {ticker.upper() for ticker in ijson.items(f, 'companies.item.ticker') if ticker}
+        data = read_json_file(TICKER_FILE)
         companies = data.get("companies", [])
         # Extract ticker symbols and convert to uppercase
         valid_tickers = {company.get("ticker", "").upper() for company in companies if company.get("ticker")}
         return valid_tickers
-    except (json.JSONDecodeError, FileNotFoundError) as e:
+    except TICKER_FILE_ERRORS as e:
         print(f"Error loading {TICKER_FILE}: {e}")
         return set()
 
@@ -60,54 +72,100 @@ def get_december_start_date():
         return date(today.year - 1, 12, 1)
 
 
-def calculate_return(ticker):
-    """Calculate total return for a ticker from December 1st to today."""
+def download_closing_prices(tickers, start_date, end_date):
+    """Download closing prices for tickers with one yf.download call.
+    
+    Returns:
+        numpy array of shape (days, tickers), NaN where a ticker has no price
+    """
+    data = yf.download(list(tickers), start=start_date, end=end_date, group_by='ticker',
+                       auto_adjust=True, threads=True, progress=False)
     try:
-        # Get December start date
-        start_date = get_december_start_date()
-        end_date = date.today()
-        
-        # Download historical data
-        stock = yf.Ticker(ticker)
-        hist = stock.history(start=start_date, end=end_date)
-        
-        if hist.empty:
-            return None, "No data available"
-        
-        # Get first and last closing prices
-        first_price = hist.iloc[0]['Close']
-        last_price = hist.iloc[-1]['Close']
-        
-        # Calculate return percentage
-        if first_price == 0:
-            return None, "Invalid price data"
-        
-        return_pct = ((last_price - first_price) / first_price) * 100
-        
-        return return_pct, None
-        
-    except Exception as e:
-        return None, str(e)
+        # Columns are (ticker, field); older yfinance versions return flat columns for a single ticker
+        if data.columns.nlevels > 1:
+            close_frame = data.xs('Close', axis=1, level=1)
+        else:
+            close_frame = data[['Close']].set_axis(tickers[:1], axis=1)
+    except KeyError:
+        return np.full((0, len(tickers)), np.nan)
+    return close_frame.reindex(columns=tickers).to_numpy(dtype=np.float64)
 
 
-def process_ticker(ticker, total, completed_lock, completed_count):
-    """Wrapper function to process a ticker and update progress."""
-    return_pct, error = calculate_return(ticker)
+def returns_from_closing_prices(close):
+    """Calculate each column's return from its first to last closing price.
     
-    # Thread-safe progress update
-    with completed_lock:
-        completed_count[0] += 1
-        current = completed_count[0]
-        if error:
-            print(f"[{current}/{total}] {ticker}: Error - {error}")
+    Tickers that failed to download, or didn't trade on some days, have NaN prices;
+    each ticker's first and last closing prices are its first and last non-NaN rows.
+    
+    Returns:
+        tuple: (has_data, valid, return_pcts) arrays with one entry per column
+    """
+    has_price = ~np.isnan(close)
+    has_data = has_price.any(axis=0)
+    columns = np.arange(close.shape[1])
+    first_price = close[np.argmax(has_price, axis=0), columns] if close.shape[0] else np.full(close.shape[1], np.nan)
+    last_price = close[close.shape[0] - 1 - np.argmax(has_price[::-1], axis=0), columns] if close.shape[0] else first_price
+    
+    # Calculate return percentages for every ticker at once
+    valid = has_data & (first_price != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return_pcts = np.where(valid, (last_price - first_price) / first_price * 100, np.nan)
+    return has_data, valid, return_pcts
+
+
+def calculate_returns(tickers):
+    """Calculate total returns for tickers from December 1st to today.
+    
+    Price history for every ticker is fetched with a single yf.download call, which
+    downloads the tickers in parallel instead of one request per ticker. Tickers that
+    come back with no prices (or all of them, if the batch download fails) are retried
+    one at a time, so one bad ticker can't fail the rest and each keeps its own error.
+    
+    Returns:
+        dict: Ticker -> (return_pct, error), where exactly one of the two is None
+    """
+    # Get date range
+    start_date = get_december_start_date()
+    end_date = date.today()
+    
+    tickers = list(tickers)
+    try:
+        close = download_closing_prices(tickers, start_date, end_date)
+    except Exception as e:
+        print(f"Batch download failed ({e}); downloading tickers one at a time")
+        close = np.full((0, len(tickers)), np.nan)
+    
+    results = {}
+    retry_tickers = []
+    for ticker, ticker_has_data, ticker_valid, return_pct in zip(tickers, *returns_from_closing_prices(close)):
+        if not ticker_has_data:
+            retry_tickers.append(ticker)
+        elif not ticker_valid:
+            results[ticker] = (None, "Invalid price data")
         else:
-            print(f"[{current}/{total}] {ticker}: {return_pct:.2f}%")
+            results[ticker] = (float(return_pct), None)
     
-    return {
-        'ticker': ticker,
-        'return': return_pct,
-        'error': error
-    }
+    if retry_tickers and len(retry_tickers) < len(tickers):
+        print(f"No data for {len(retry_tickers)} tickers in the batch download; retrying them one at a time: "
+              f"{', '.join(retry_tickers)}")
+    for ticker in retry_tickers:
+        try:
+            has_data, valid, return_pcts = returns_from_closing_prices(
+                download_closing_prices([ticker], start_date, end_date))
+        except Exception as e:
+            results[ticker] = (None, str(e))
+            continue
+        if not has_data[0]:
+            results[ticker] = (None, "No data available")
+        elif not valid[0]:
+            results[ticker] = (None, "Invalid price data")
+        else:
+            results[ticker] = (float(return_pcts[0]), None)
+    
+    failed = [ticker for ticker in tickers if results[ticker][1]]
+    if failed:
+        print(f"Could not calculate returns for {len(failed)} tickers: {', '.join(failed)}")
+    return {ticker: results[ticker] for ticker in tickers}
 
 
 def main():
@@ -144,34 +202,27 @@ def main():
     start_date = get_december_start_date()
     end_date = date.today()
     print(f"Calculating returns from {start_date} to {end_date}")
-    print("Using multithreading to speed up processing...")
+    print("Downloading price history for all tickers in one batch...")
     print("=" * 60)
     print()
     
-    # Calculate returns for each ticker using multithreading
+    # Calculate returns for every ticker from one batched download
     results = []
     total = len(common_tickers)
     sorted_tickers = sorted(common_tickers)
+    returns_by_ticker = calculate_returns(sorted_tickers)
     
-    # Thread-safe progress tracking
-    completed_lock = Lock()
-    completed_count = [0]
-    
-    # Use ThreadPoolExecutor with reasonable number of workers
-    # Too many threads might overwhelm the API, 10-20 is usually good
-    max_workers = min(20, total)
-    
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_ticker = {
-            executor.submit(process_ticker, ticker, total, completed_lock, completed_count): ticker
-            for ticker in sorted_tickers
-        }
-        
-        # Collect results as they complete
-        for future in as_completed(future_to_ticker):
-            result = future.result()
-            results.append(result)
+    for current, ticker in enumerate(sorted_tickers, 1):
+        return_pct, error = returns_by_ticker[ticker]
+        if error:
+            print(f"[{current}/{total}] {ticker}: Error - {error}")
+        else:
+            print(f"[{current}/{total}] {ticker}: {return_pct:.2f}%")
+        results.append({
+            'ticker': ticker,
+            'return': return_pct,
+            'error': error
+        })
     
     # Sort by return (highest first), with errors at the end
     results.sort(key=lambda x: (x['return'] is None, x['return'] or 0), reverse=True)
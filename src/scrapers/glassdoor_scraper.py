@@ -7,31 +7,127 @@ Uses Grok 4.1 via OpenRouter with search RAG capabilities to get Glassdoor ratin
 import sys
 import json
 import os
+import re
 import time
+import tempfile
 import threading
+from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+# orjson is optional; fall back to the stdlib parser when it isn't installed
 try:
-    import sys
-    import os
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-    from src.clients.openrouter_client import OpenRouterClient
-    from config import OPENROUTER_KEY
-    OPENROUTER_AVAILABLE = True
+    import orjson
 except ImportError:
-    OPENROUTER_AVAILABLE = False
-    print("Warning: openrouter_client not found. Make sure openrouter_client.py is in the same directory.")
-    OPENROUTER_KEY = None
+    orjson = None
+
+
+def _dumps_indented(obj):
+    """Serialize obj as 2-space indented JSON text, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+TICKER_DEFINITIONS_FILE = 'data/ticker_definitions.json'
+
+# Patterns for pulling rating fields out of a non-JSON Grok response
+_RATING_RE = re.compile(r'rating["\']?\s*[:=]\s*(\d+\.?\d*)', re.IGNORECASE)
+_REVIEWS_RE = re.compile(r'reviews?["\']?\s*[:=]\s*(\d+[,\d]*)', re.IGNORECASE)
+_URL_RE = re.compile(r'https?://[^\s\)]+glassdoor[^\s\)]+', re.IGNORECASE)
+_JSON_DECODER = json.JSONDecoder()
+
+# On-disk cache of Grok Glassdoor lookups so repeated runs don't pay for the same query
+GLASSDOOR_CACHE_FILE = 'data/glassdoor_cache.json'
+GLASSDOOR_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+_cache_lock = threading.Lock()
+_rating_cache = None
+_rating_cache_dirty = False
+
+# Prompts for the Glassdoor lookup. The system message is kept byte-identical across
+# calls so OpenRouter can serve it from the prompt cache (billed at the cached input rate)
+GLASSDOOR_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a helpful assistant with web search capabilities. When asked to find current information, you should use your web search tools to retrieve up-to-date data from the internet. Use search RAG (Retrieval-Augmented Generation) to find and cite accurate information."
+}
+
+GLASSDOOR_PROMPT_TEMPLATE = """Search the web for the Glassdoor rating of {company_name} (stock ticker: {ticker}).
+
+Please search for "{company_name} Glassdoor rating" and find the current overall rating from Glassdoor.
+
+Extract and return:
+1. The overall rating (out of 5.0)
+2. The number of reviews (if available)
+3. A brief snippet of the rating information
+4. The Glassdoor URL if found
+
+Format your response as JSON with the following structure:
+{{
+    "rating": <number between 0 and 5>,
+    "num_reviews": <number or null>,
+    "snippet": "<brief description>",
+    "url": "<glassdoor url or null>"
+}}
+
+If you cannot find the rating, return null for the rating field."""
+
+
+_openrouter_client = None
+_openrouter_client_lock = threading.Lock()
+
+
+def _get_openrouter_client():
+    """
+    Import and construct the shared OpenRouter client on first use.
+    
+    The openrouter_client import pulls in the openai SDK, which dominates this
+    module's import time, so it is deferred until a Grok query is actually made.
+    The client is then reused by every call (and every batch worker thread) so
+    its HTTP connection pool stays warm between requests.
+    
+    Returns:
+        OpenRouterClient instance, or None if the client or config is not available
+    """
+    global _openrouter_client
+    if _openrouter_client is None:
+        with _openrouter_client_lock:
+            if _openrouter_client is None:
+                try:
+                    from src.clients.openrouter_client import OpenRouterClient
+                    from config import OPENROUTER_KEY
+                except ImportError:
+                    print("Warning: openrouter_client not found. Make sure openrouter_client.py is in the same directory.")
+                    return None
+                _openrouter_client = OpenRouterClient(api_key=OPENROUTER_KEY)
+    return _openrouter_client
+
+
+@lru_cache(maxsize=1)
+def _load_ticker_definitions(mtime):
+    """Parse ticker_definitions.json. Keyed on the file's mtime so edits are picked up."""
+    if orjson is not None:
+        with open(TICKER_DEFINITIONS_FILE, 'rb') as f:
+            definitions = orjson.loads(f.read())
+    else:
+        with open(TICKER_DEFINITIONS_FILE, 'r') as f:
+            definitions = json.load(f)
+    return definitions.get('definitions', {})
+
+
+# Company names found through yfinance. Failed lookups aren't stored, so they are retried
+_yfinance_company_names = {}
 
 
 def get_company_name_from_ticker(ticker):
     """
     Get company name from ticker symbol.
     First checks ticker_definitions.json, then falls back to yfinance.
+    Names found through yfinance are remembered for the life of the process.
     
     Args:
         ticker: Stock ticker symbol (e.g., 'AAPL')
@@ -43,22 +139,24 @@ def get_company_name_from_ticker(ticker):
     
     # First, check ticker_definitions.json
     try:
-        with open('data/ticker_definitions.json', 'r') as f:
-            definitions = json.load(f)
-            if ticker_upper in definitions.get('definitions', {}):
-                return definitions['definitions'][ticker_upper]
+        definitions = _load_ticker_definitions(os.path.getmtime(TICKER_DEFINITIONS_FILE))
+        if ticker_upper in definitions:
+            return definitions[ticker_upper]
     except FileNotFoundError:
         pass
     except Exception as e:
         print(f"Warning: Could not read ticker_definitions.json: {e}")
     
     # Fall back to yfinance
+    if ticker_upper in _yfinance_company_names:
+        return _yfinance_company_names[ticker_upper]
     try:
         import yfinance as yf
         stock = yf.Ticker(ticker_upper)
         info = stock.info
         company_name = info.get('longName') or info.get('shortName') or info.get('name')
         if company_name:
+            _yfinance_company_names[ticker_upper] = company_name
             return company_name
     except Exception as e:
         print(f"Warning: Could not get company name from yfinance: {e}")
@@ -72,6 +170,18 @@ MODEL_PRICING = {
     "grok-4-1-fast-reasoning": (0.20, 0.50, 0.05),  # $0.20 per 1M input tokens, $0.50 per 1M output tokens, $0.05 per 1M cached input tokens
 }
 
+# Pricing is quoted per 1M tokens
+TOKENS_TO_MILLIONS = 1e-6
+
+
+def _first_token_count(token_usage, *keys):
+    """Return the first non-None value among the given token_usage aliases, or 0."""
+    for key in keys:
+        value = token_usage.get(key)
+        if value is not None:
+            return value
+    return 0
+
 
 def calculate_token_cost(total_tokens, model="grok-4-1-fast-reasoning", token_usage=None):
     """Calculate the cost of tokens used.
@@ -100,34 +210,28 @@ def calculate_token_cost(total_tokens, model="grok-4-1-fast-reasoning", token_us
     output_cost_per_1M = pricing[1]
     cached_input_cost_per_1M = pricing[2] if len(pricing) > 2 else input_cost_per_1M
     
-    # If we have breakdown of input/output/cached tokens, use that for more accurate pricing
-    if token_usage:
-        # Get total input/prompt tokens (may be called input_tokens or prompt_tokens)
-        total_input_tokens = token_usage.get('input_tokens') if 'input_tokens' in token_usage else token_usage.get('prompt_tokens', 0)
-        # Get output tokens (may be called output_tokens or completion_tokens)
-        output_tokens = token_usage.get('output_tokens') if 'output_tokens' in token_usage else token_usage.get('completion_tokens', 0)
-        # Get cached tokens (may be called cached_tokens, cached_input_tokens, or prompt_cache_hit_tokens)
-        cached_tokens = (token_usage.get('cached_tokens') if 'cached_tokens' in token_usage else
-                        token_usage.get('cached_input_tokens') if 'cached_input_tokens' in token_usage else
-                        token_usage.get('prompt_cache_hit_tokens', 0))
-        
-        if total_input_tokens > 0 or output_tokens > 0 or cached_tokens > 0:
-            # Calculate regular (non-cached) input tokens
-            # Standard API format: prompt_tokens = regular_input + cached_input
-            regular_input_tokens = total_input_tokens - cached_tokens
-            
-            # Calculate costs
-            regular_input_cost = (regular_input_tokens / 1_000_000) * input_cost_per_1M
-            cached_input_cost = (cached_tokens / 1_000_000) * cached_input_cost_per_1M
-            output_cost = (output_tokens / 1_000_000) * output_cost_per_1M
-            
-            total_cost = regular_input_cost + cached_input_cost + output_cost
-            return total_cost
+    # Without a token breakdown, use total_tokens with the average of input and output costs
+    if not token_usage:
+        avg_cost_per_1M = (input_cost_per_1M + output_cost_per_1M) / 2
+        return total_tokens * TOKENS_TO_MILLIONS * avg_cost_per_1M
+    
+    # Get total input/prompt tokens (may be called input_tokens or prompt_tokens)
+    total_input_tokens = _first_token_count(token_usage, 'input_tokens', 'prompt_tokens')
+    # Get output tokens (may be called output_tokens or completion_tokens)
+    output_tokens = _first_token_count(token_usage, 'output_tokens', 'completion_tokens')
+    # Get cached tokens (may be called cached_tokens, cached_input_tokens, or prompt_cache_hit_tokens)
+    cached_tokens = _first_token_count(token_usage, 'cached_tokens', 'cached_input_tokens', 'prompt_cache_hit_tokens')
+    
+    # Calculate regular (non-cached) input tokens
+    # Standard API format: prompt_tokens = regular_input + cached_input
+    regular_input_tokens = total_input_tokens - cached_tokens
     
-    # Fallback: use total_tokens with average cost if no breakdown available
-    # Use average of input and output costs as approximation
-    avg_cost_per_1M = (input_cost_per_1M + output_cost_per_1M) / 2
-    return (total_tokens / 1_000_000) * avg_cost_per_1M
+    # Calculate costs (missing fields count as zero tokens)
+    regular_input_cost = regular_input_tokens * TOKENS_TO_MILLIONS * input_cost_per_1M
+    cached_input_cost = cached_tokens * TOKENS_TO_MILLIONS * cached_input_cost_per_1M
+    output_cost = output_tokens * TOKENS_TO_MILLIONS * output_cost_per_1M
+    
+    return regular_input_cost + cached_input_cost + output_cost
 
 
 def get_glassdoor_rating_with_grok(company_name, ticker, silent=False):
@@ -142,35 +246,16 @@ def get_glassdoor_rating_with_grok(company_name, ticker, silent=False):
     Returns:
         dict: Dictionary containing rating data and snippet, or None if error
     """
-    if not OPENROUTER_AVAILABLE:
-        print("Error: OpenRouterClient not available.")
-        return None
-    
     try:
         # Initialize OpenRouter client with API key from config
-        client = OpenRouterClient(api_key=OPENROUTER_KEY)
+        client = _get_openrouter_client()
+        if client is None:
+            print("Error: OpenRouterClient not available.")
+            return None
         
         # Create a prompt that asks Grok to search for Glassdoor rating
         # Grok 4.1 has built-in web search capabilities via tool calling
-        prompt = f"""Search the web for the Glassdoor rating of {company_name} (stock ticker: {ticker}).
-
-Please search for "{company_name} Glassdoor rating" and find the current overall rating from Glassdoor.
-
-Extract and return:
-1. The overall rating (out of 5.0)
-2. The number of reviews (if available)
-3. A brief snippet of the rating information
-4. The Glassdoor URL if found
-
-Format your response as JSON with the following structure:
-{{
-    "rating": <number between 0 and 5>,
-    "num_reviews": <number or null>,
-    "snippet": "<brief description>",
-    "url": "<glassdoor url or null>"
-}}
-
-If you cannot find the rating, return null for the rating field."""
+        prompt = GLASSDOOR_PROMPT_TEMPLATE.format(company_name=company_name, ticker=ticker)
 
         if not silent:
             print(f"Querying Grok 4.1 (same model as scorer.py) to search for Glassdoor rating of {company_name}...")
@@ -180,10 +265,7 @@ If you cannot find the rating, return null for the rating field."""
         # Grok 4.1 Fast is an agentic tool-calling model with built-in web search capabilities
         
         messages = [
-            {
-                "role": "system",
-                "content": "You are a helpful assistant with web search capabilities. When asked to find current information, you should use your web search tools to retrieve up-to-date data from the internet. Use search RAG (Retrieval-Augmented Generation) to find and cite accurate information."
-            },
+            GLASSDOOR_SYSTEM_MESSAGE,
             {
                 "role": "user",
                 "content": prompt
@@ -235,25 +317,23 @@ If you cannot find the rating, return null for the rating field."""
         
         # Try to extract JSON from the response
         try:
-            # Look for JSON in the response
+            # Decode the first JSON object in place; raw_decode stops at its closing
+            # brace, so any prose Grok appends after the object is ignored
             json_start = response_text.find('{')
-            json_end = response_text.rfind('}') + 1
-            if json_start >= 0 and json_end > json_start:
-                json_str = response_text[json_start:json_end]
-                parsed_data = json.loads(json_str)
+            if json_start >= 0:
+                parsed_data, _ = _JSON_DECODER.raw_decode(response_text, json_start)
                 rating_data.update(parsed_data)
             else:
                 # Try to extract rating from natural language
-                import re
-                rating_match = re.search(r'rating["\']?\s*[:=]\s*(\d+\.?\d*)', response_text, re.IGNORECASE)
+                rating_match = _RATING_RE.search(response_text)
                 if rating_match:
                     rating_data["rating"] = float(rating_match.group(1))
                 
-                reviews_match = re.search(r'reviews?["\']?\s*[:=]\s*(\d+[,\d]*)', response_text, re.IGNORECASE)
+                reviews_match = _REVIEWS_RE.search(response_text)
                 if reviews_match:
                     rating_data["num_reviews"] = int(reviews_match.group(1).replace(',', ''))
                 
-                url_match = re.search(r'https?://[^\s\)]+glassdoor[^\s\)]+', response_text, re.IGNORECASE)
+                url_match = _URL_RE.search(response_text)
                 if url_match:
                     rating_data["url"] = url_match.group(0)
         except json.JSONDecodeError:
@@ -269,19 +349,125 @@ If you cannot find the rating, return null for the rating field."""
         return None
 
 
-def get_glassdoor_rating(ticker, silent=False):
+def _load_rating_cache():
+    """Load the Glassdoor cache file into memory once. Caller must hold _cache_lock.
+    
+    An unreadable cache file is moved aside (to GLASSDOOR_CACHE_FILE + '.bad') rather
+    than being overwritten by the next flush.
+    """
+    global _rating_cache
+    if _rating_cache is None:
+        try:
+            with open(GLASSDOOR_CACHE_FILE, 'r') as f:
+                _rating_cache = json.load(f)
+        except FileNotFoundError:
+            _rating_cache = {}
+        except json.JSONDecodeError as e:
+            backup_file = GLASSDOOR_CACHE_FILE + '.bad'
+            print(f"Warning: Could not parse {GLASSDOOR_CACHE_FILE} ({e}); moving it to {backup_file}")
+            try:
+                os.replace(GLASSDOOR_CACHE_FILE, backup_file)
+            except OSError as move_error:
+                print(f"Warning: Could not move {GLASSDOOR_CACHE_FILE}: {move_error}")
+            _rating_cache = {}
+    return _rating_cache
+
+
+def get_cached_rating(ticker):
+    """
+    Get a cached Glassdoor lookup for a ticker if it is younger than GLASSDOOR_CACHE_TTL.
+    
+    Args:
+        ticker: Uppercase stock ticker symbol
+        
+    A hit costs nothing, so the returned copy reports zero tokens, time and cost,
+    sets cache_hit = True, and keeps the time of the original lookup as fetched_at.
+    
+    Returns:
+        dict: Copy of the cached rating data, or None if missing or expired
+    """
+    with _cache_lock:
+        entry = _load_rating_cache().get(ticker)
+    if entry and time.time() - entry.get('cached_at', 0) < GLASSDOOR_CACHE_TTL:
+        return dict(
+            entry['data'],
+            token_usage={'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0, 'cache_hit': True},
+            elapsed_time=0.0,
+            total_cost=0.0,
+            cache_hit=True,
+            fetched_at=time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry['cached_at'])),
+        )
+    return None
+
+
+def cache_rating(ticker, rating_data):
+    """
+    Store a Glassdoor lookup in the in-memory cache. Call flush_rating_cache()
+    to write it to disk.
+    
+    Args:
+        ticker: Uppercase stock ticker symbol
+        rating_data: Dictionary returned from get_glassdoor_rating_with_grok()
+    """
+    global _rating_cache_dirty
+    with _cache_lock:
+        _load_rating_cache()[ticker] = {'cached_at': time.time(), 'data': rating_data}
+        _rating_cache_dirty = True
+
+
+def flush_rating_cache():
+    """
+    Write the in-memory Glassdoor cache to disk if it has new entries.
+    
+    Writes to a temporary file first, then replaces the cache file, so a crash
+    mid-write can't leave a truncated cache behind.
+    """
+    global _rating_cache_dirty
+    with _cache_lock:
+        if not _rating_cache_dirty:
+            return
+        temp_dir = os.path.dirname(os.path.abspath(GLASSDOOR_CACHE_FILE)) or '.'
+        try:
+            temp_fd, temp_path = tempfile.mkstemp(dir=temp_dir, suffix='.json', prefix='.glassdoor_cache_temp_')
+        except OSError as e:
+            print(f"Warning: Could not write {GLASSDOOR_CACHE_FILE}: {e}")
+            return
+        try:
+            with os.fdopen(temp_fd, 'w') as f:
+                f.write(_dumps_indented(_rating_cache))
+            os.replace(temp_path, GLASSDOOR_CACHE_FILE)
+            _rating_cache_dirty = False
+        except Exception as e:
+            print(f"Warning: Could not write {GLASSDOOR_CACHE_FILE}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+
+def get_glassdoor_rating(ticker, silent=False, use_cache=True, flush_cache=True):
     """
     Main function to get Glassdoor rating for a ticker using Grok 4.1 with search RAG.
     
     Args:
         ticker: Stock ticker symbol (e.g., 'AAPL')
         silent: If True, suppress output messages
+        use_cache: If True, return a recent cached lookup instead of querying Grok
+        flush_cache: If True, write a new lookup to the cache file right away. Batch
+                     callers pass False and call flush_rating_cache() once at the end
         
     Returns:
         dict: Dictionary containing rating data and snippet, or None if error
     """
     ticker_upper = ticker.strip().upper()
     
+    if use_cache:
+        cached = get_cached_rating(ticker_upper)
+        if cached is not None:
+            if not silent:
+                print(f"Using cached Glassdoor lookup for {ticker_upper} (pass --no-cache to refresh)")
+            return cached
+    
     # Step 1: Get company name from ticker
     company_name = get_company_name_from_ticker(ticker_upper)
     if not company_name:
@@ -295,9 +481,39 @@ def get_glassdoor_rating(ticker, silent=False):
     # Step 2: Use Grok 4.1 with search RAG to get Glassdoor rating
     rating_data = get_glassdoor_rating_with_grok(company_name, ticker_upper, silent=silent)
     
+    # Only a lookup that found a rating is cached; "not found" or unparsed replies are asked again next time
+    if rating_data and rating_data.get("rating") is not None:
+        cache_rating(ticker_upper, rating_data)
+        if flush_cache:
+            flush_rating_cache()
+    
     return rating_data
 
 
+def get_glassdoor_ratings(tickers, max_workers=8, silent=True, use_cache=True):
+    """
+    Get Glassdoor ratings for several tickers concurrently.
+    
+    Args:
+        tickers: Iterable of stock ticker symbols
+        max_workers: Maximum number of concurrent Grok requests
+        silent: If True, suppress per-ticker output messages
+        use_cache: If True, reuse recent cached lookups
+        
+    Returns:
+        dict: Mapping of uppercase ticker -> rating data (None if the lookup failed),
+              in the same order as the input tickers
+    """
+    tickers = [ticker.strip().upper() for ticker in tickers]
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda ticker: get_glassdoor_rating(ticker, silent=silent, use_cache=use_cache,
+                                                                       flush_cache=False), tickers)
+            return dict(zip(tickers, results))
+    finally:
+        flush_rating_cache()
+
+
 def display_snippet(result):
     """
     Display Glassdoor rating information from Grok search RAG in a formatted way.
@@ -323,11 +539,8 @@ def display_snippet(result):
         # Visual representation (using ASCII-safe characters for Windows compatibility)
         stars = int(rating)
         half_star = (rating - stars) >= 0.5
-        star_chars = '*' * stars
-        if half_star:
-            star_chars += '.5'
         empty_stars = 5 - stars - (1 if half_star else 0)
-        star_chars += '-' * empty_stars
+        star_chars = f"{'*' * stars}{'.5' if half_star else ''}{'-' * empty_stars}"
         print(f"Stars: {star_chars} ({rating:.1f}/5.0)")
     else:
         print("\nRating: Not found in response")
@@ -352,7 +565,7 @@ def display_snippet(result):
     
     if 'token_usage' in result:
         print(f"\nToken Usage:")
-        print(json.dumps(result['token_usage'], indent=2))
+        print(_dumps_indented(result['token_usage']))
     
     if 'elapsed_time' in result:
         print(f"\nFetch Time: {result['elapsed_time']:.2f} seconds")
@@ -364,7 +577,7 @@ def display_snippet(result):
     print("=" * 80)
 
 
-def fetch_single_ticker(ticker, output_file, existing_data, lock):
+def fetch_single_ticker(ticker, output_file, existing_data, lock, use_cache=True):
     """
     Fetch Glassdoor rating for a single ticker and save it thread-safely.
     
@@ -373,12 +586,13 @@ def fetch_single_ticker(ticker, output_file, existing_data, lock):
         output_file: Path to output JSON file
         existing_data: Dictionary to store results (shared across threads)
         lock: Thread lock for safe file writing
+        use_cache: If True, reuse a recent cached lookup
         
     Returns:
         tuple: (ticker, success, result_dict or None)
     """
     # Fetch rating
-    result = get_glassdoor_rating(ticker, silent=True)
+    result = get_glassdoor_rating(ticker, silent=True, use_cache=use_cache, flush_cache=False)
     
     if result:
         # Prepare data to save
@@ -391,7 +605,8 @@ def fetch_single_ticker(ticker, output_file, existing_data, lock):
             "token_usage": result.get("token_usage"),
             "elapsed_time": result.get("elapsed_time"),
             "total_cost": result.get("total_cost"),
-            "fetched_at": time.strftime("%Y-%m-%d %H:%M:%S")
+            # Cache hits keep the time of the lookup they came from
+            "fetched_at": result.get("fetched_at") or time.strftime("%Y-%m-%d %H:%M:%S")
         }
         
         # Thread-safe update
@@ -411,7 +626,8 @@ def fetch_single_ticker(ticker, output_file, existing_data, lock):
         return (ticker, False, None)
 
 
-def fetch_all_glassdoor_ratings(scores_file="data/scores.json", output_file="data/glassdoor.json", max_workers=20):
+def fetch_all_glassdoor_ratings(scores_file="data/scores.json", output_file="data/glassdoor.json", max_workers=20,
+                                use_cache=True):
     """
     Fetch Glassdoor ratings for all tickers in scores.json and save to glassdoor.json.
     Uses threading to fetch multiple tickers concurrently.
@@ -420,6 +636,7 @@ def fetch_all_glassdoor_ratings(scores_file="data/scores.json", output_file="dat
         scores_file: Path to scores.json file
         output_file: Path to output glassdoor.json file
         max_workers: Maximum number of concurrent threads (default: 20)
+        use_cache: If True, reuse recent cached lookups
     """
     print("=" * 80)
     print("Batch Glassdoor Rating Fetcher (via Grok 4.1 Search RAG)")
@@ -483,42 +700,46 @@ def fetch_all_glassdoor_ratings(scores_file="data/scores.json", output_file="dat
     start_time = time.time()
     
     # Process tickers with thread pool
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_ticker = {
-            executor.submit(fetch_single_ticker, ticker, output_file, existing_data, lock): ticker
-            for ticker in tickers_to_fetch
-        }
-        
-        # Process completed tasks
-        completed = 0
-        for future in as_completed(future_to_ticker):
-            completed += 1
-            ticker = future_to_ticker[future]
+    # New lookups are written to the cache file once, after the whole batch
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Submit all tasks
+            future_to_ticker = {
+                executor.submit(fetch_single_ticker, ticker, output_file, existing_data, lock, use_cache): ticker
+                for ticker in tickers_to_fetch
+            }
             
-            try:
-                ticker_result, success, data = future.result()
+            # Process completed tasks
+            completed = 0
+            for future in as_completed(future_to_ticker):
+                completed += 1
+                ticker = future_to_ticker[future]
                 
-                if success and data:
-                    successful += 1
-                    total_cost += data.get("total_cost", 0)
-                    total_time += data.get("elapsed_time", 0)
-                    
-                    rating = data.get("rating")
-                    elapsed = data.get("elapsed_time", 0)
-                    cost_cents = data.get("total_cost", 0) * 100
+                try:
+                    ticker_result, success, data = future.result()
                     
-                    if rating:
-                        print(f"[{completed}/{len(tickers_to_fetch)}] ✓ {ticker}: {rating:.1f}/5.0 | {elapsed:.2f}s | {cost_cents:.4f} cents")
+                    if success and data:
+                        successful += 1
+                        total_cost += data.get("total_cost", 0)
+                        total_time += data.get("elapsed_time", 0)
+                        
+                        rating = data.get("rating")
+                        elapsed = data.get("elapsed_time", 0)
+                        cost_cents = data.get("total_cost", 0) * 100
+                        
+                        if rating:
+                            print(f"[{completed}/{len(tickers_to_fetch)}] ✓ {ticker}: {rating:.1f}/5.0 | {elapsed:.2f}s | {cost_cents:.4f} cents")
+                        else:
+                            print(f"[{completed}/{len(tickers_to_fetch)}] ✓ {ticker}: No rating found | {elapsed:.2f}s | {cost_cents:.4f} cents")
                     else:
-                        print(f"[{completed}/{len(tickers_to_fetch)}] ✓ {ticker}: No rating found | {elapsed:.2f}s | {cost_cents:.4f} cents")
-                else:
+                        failed += 1
+                        print(f"[{completed}/{len(tickers_to_fetch)}] ✗ {ticker}: Failed to fetch")
+                        
+                except Exception as e:
                     failed += 1
-                    print(f"[{completed}/{len(tickers_to_fetch)}] ✗ {ticker}: Failed to fetch")
-                    
-            except Exception as e:
-                failed += 1
-                print(f"[{completed}/{len(tickers_to_fetch)}] ✗ {ticker}: Error - {e}")
+                    print(f"[{completed}/{len(tickers_to_fetch)}] ✗ {ticker}: Error - {e}")
+    finally:
+        flush_rating_cache()
     
     # Final summary
     elapsed_total = time.time() - start_time
@@ -540,17 +761,33 @@ def fetch_all_glassdoor_ratings(scores_file="data/scores.json", output_file="dat
 def main():
     """Main function to get Glassdoor rating via Grok 4.1 with search RAG."""
     # By default, fetch all tickers from scores.json
-    # If a ticker is provided as argument, fetch only that ticker
-    if len(sys.argv) > 1:
+    # If one ticker is provided as argument, fetch only that ticker
+    # If several tickers are provided, fetch them concurrently and display each
+    # Pass --no-cache to ignore cached lookups and query Grok again
+    args = [arg for arg in sys.argv[1:] if arg != '--no-cache']
+    use_cache = len(args) == len(sys.argv) - 1
+    if len(args) > 1:
+        tickers = args
+        print("=" * 80)
+        print(f"Glassdoor Rating Fetcher (via Grok 4.1 Search RAG) - {len(tickers)} tickers")
+        print("=" * 80)
+        
+        results = get_glassdoor_ratings(tickers, use_cache=use_cache)
+        for ticker, result in results.items():
+            if result:
+                display_snippet(result)
+            else:
+                print(f"\nFailed to get Glassdoor rating for {ticker}")
+    elif args:
         # Single ticker mode
-        ticker = sys.argv[1]
+        ticker = args[0]
         print("=" * 80)
         print("Glassdoor Rating Fetcher (via Grok 4.1 Search RAG)")
         print("=" * 80)
         print()
         
         # Get the rating using Grok
-        result = get_glassdoor_rating(ticker)
+        result = get_glassdoor_rating(ticker, use_cache=use_cache)
         
         if result:
             display_snippet(result)
@@ -567,7 +804,7 @@ def main():
         print("\nNote: This uses Grok 4.1's search RAG capabilities to find and extract the rating.")
     else:
         # Batch mode - fetch all tickers
-        fetch_all_glassdoor_ratings()
+        fetch_all_glassdoor_ratings(use_cache=use_cache)
 
 
 if __name__ == "__main__":
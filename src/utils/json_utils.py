@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Shared JSON file helpers
+"""
+
+import json
+# orjson is optional; it parses large JSON files noticeably faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def read_json_file(path):
+    """Parse a JSON file, using orjson when it is installed.
+
+    orjson's parse error subclasses json.JSONDecodeError, so callers can catch that either way.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
@@ -1,20 +1,31 @@
 #!/usr/bin/env python3
 """
 Efficient Moat Score Sorter using Grok API
-Uses merge sort (O(n log n)) to rank companies by moat strength.
-Each comparison is done by asking Grok which company has a stronger moat.
-Expected API calls: ~n*log2(n) = ~33 calls for 10 companies
+Ranks companies by moat strength. By default Grok ranks the whole list in a
+single batched request (1 API call). Other methods, chosen with --method=:
+- score: Grok scores each company 0-100 independently (n calls, in parallel)
+- merge: merge sort where each comparison asks Grok which company has a stronger
+  moat (~n*log2(n) calls, e.g. ~33 for 10 companies). All merges at the same level
+  run concurrently, so wall-clock time grows with ~2n sequential round-trips.
+- listmerge: merge sort with one Grok request per merge (~n-1 calls)
 """
 
-from grok_client import GrokClient
-from config import XAI_API_KEY
+import json
+import math
+import re
 import time
 import sys
-
-# Import ticker lookup functions from scorer.py
-import sys
 import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.clients.grok_client import ConcurrentGrokClient
+from src.clients.response_cache import ResponseCache
+from config import XAI_API_KEY
+
+# Import ticker lookup functions from scorer.py
 try:
     from src.scoring.scorer import load_ticker_lookup, resolve_to_company_name
 except ImportError:
@@ -22,8 +33,151 @@ except ImportError:
     print("Make sure scorer.py is in the same directory.")
     sys.exit(1)
 
-# Track API calls
+# Comparison answers are cached on disk so reruns over the same companies are free
+RESPONSE_CACHE_FILE = os.path.join(os.path.dirname(__file__), '../../data/grok_response_cache.db')
+
+# Client-side limits kept under xAI's per-key rate limits so parallel merges wait instead of failing
+MAX_CONCURRENT_REQUESTS = 8
+REQUESTS_PER_MINUTE = 480
+TOKENS_PER_MINUTE = 1_000_000
+
+# Companies ranked when no tickers are entered
+DEFAULT_COMPANIES = (
+    ("AAPL", "Apple Inc"),
+    ("MSFT", "Microsoft Corporation"),
+    ("GOOGL", "Alphabet Inc"),
+    ("AMZN", "Amazon.com Inc"),
+    ("NVDA", "NVIDIA Corporation"),
+    ("META", "Meta Platforms Inc"),
+    ("TSLA", "Tesla Inc"),
+    ("JPM", "JPMorgan Chase & Co"),
+    ("V", "Visa Inc"),
+    ("JNJ", "Johnson & Johnson"),
+)
+
+# First integer in a scoring reply
+SCORE_RE = re.compile(r'\d+')
+
+# Model asked for pairwise comparisons and per-company scores. Cached winners are kept per model
+COMPARISON_MODEL = "grok-4-fast"
+
+# Completion cap for a pairwise comparison or score. The answer is one word, but a
+# cap of a couple of tokens can leave grok-4-fast with an empty reply.
+COMPARISON_MAX_TOKENS = 16
+# Requests per comparison or score before an unclear reply is given up on
+COMPARISON_ATTEMPTS = 2
+
+# Winners of past comparisons, keyed on the model and the alphabetically sorted
+# ticker pair so "A vs B" and "B vs A" share one entry. Persisted between runs.
+PAIR_CACHE_FILE = os.path.join(os.path.dirname(__file__), '../../data/pair_cache.json')
+pair_cache = {}
+pair_cache_lock = threading.Lock()
+
+# Transitive closure of COMPARISON_MODEL's known winners: stronger[t] is every ticker
+# t is known to beat, directly or through a chain (A > B and B > C gives A > C).
+# Guarded by pair_cache_lock.
+stronger = defaultdict(set)
+
+# Instructions shared by every pairwise comparison. Sending them as an identical
+# system message lets the API reuse its cached prefix instead of reprocessing it per call.
+COMPARISON_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": """You compare the competitive moat strength of two companies, given as Company 1 and Company 2.
+
+Decide which company has a STRONGER competitive moat. Consider factors like:
+- Brand strength and customer loyalty
+- Network effects
+- Switching costs
+- Economies of scale
+- Patents/intellectual property
+- Regulatory barriers
+- Unique resources or capabilities
+
+Respond with ONLY:
+- "1" if Company 1 has a stronger moat
+- "2" if Company 2 has a stronger moat
+- "equal" if they have equally strong moats (very rare)
+
+Just respond with the number or "equal", nothing else."""
+}
+
+# Track API calls (merges run on worker threads, so updates are locked)
 api_call_count = 0
+api_call_lock = threading.Lock()
+
+
+def pair_key(ticker1, ticker2, model=COMPARISON_MODEL):
+    """Order-invariant cache key for a pair of tickers (e.g. 'grok-4-fast|AAPL|MSFT')."""
+    return '|'.join((model, *sorted((ticker1, ticker2))))
+
+
+def record_winner(winner, loser):
+    """
+    Add winner > loser to the transitive closure in stronger.
+    
+    The winner, and everything already known to beat it, now also beats the
+    loser and everything the loser beats. Must be called with pair_cache_lock held.
+    """
+    beaten = stronger[loser] | {loser}
+    stronger[winner] |= beaten
+    for below in stronger.values():
+        if winner in below:
+            below |= beaten
+
+
+def load_pair_cache():
+    """
+    Load cached comparison winners from PAIR_CACHE_FILE into pair_cache, and
+    COMPARISON_MODEL's winners into stronger.
+    
+    Entries from older versions, keyed without a model, are dropped.
+    """
+    try:
+        with open(PAIR_CACHE_FILE, 'r') as f:
+            loaded = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        loaded = {}
+    
+    with pair_cache_lock:
+        for key, winner in loaded.items():
+            parts = key.split('|')
+            if len(parts) != 3:
+                continue
+            pair_cache[key] = winner
+            model, ticker1, ticker2 = parts
+            if model == COMPARISON_MODEL:
+                record_winner(winner, ticker2 if winner == ticker1 else ticker1)
+
+
+def save_pair_cache():
+    """Write pair_cache to PAIR_CACHE_FILE."""
+    try:
+        with pair_cache_lock:
+            with open(PAIR_CACHE_FILE, 'w') as f:
+                json.dump(pair_cache, f, indent=2, sort_keys=True)
+    except Exception as e:
+        print(f"Warning: Could not save {PAIR_CACHE_FILE}: {e}")
+
+
+def parse_comparison(response, ticker1, ticker2):
+    """
+    Read the winner out of a comparison reply.
+    
+    Returns:
+        ticker1 or ticker2 for the stronger company, "equal", or None if the reply
+        is empty or doesn't give a clear answer
+    """
+    response = (response or "").strip().lower()
+    if not response:
+        return None
+    if "equal" in response:
+        return "equal"
+    if "1" in response or ticker1.lower() in response:
+        return ticker1
+    if "2" in response or ticker2.lower() in response:
+        return ticker2
+    return None
+
 
 def compare_companies_grok(grok, company1, company2):
     """
@@ -44,56 +198,87 @@ def compare_companies_grok(grok, company1, company2):
     ticker1, name1 = company1
     ticker2, name2 = company2
     
-    prompt = f"""Compare the competitive moat strength of these two companies:
-
-Company 1: {name1} ({ticker1})
-Company 2: {name2} ({ticker2})
-
-Which company has a STRONGER competitive moat? Consider factors like:
-- Brand strength and customer loyalty
-- Network effects
-- Switching costs
-- Economies of scale
-- Patents/intellectual property
-- Regulatory barriers
-- Unique resources or capabilities
-
-Respond with ONLY:
-- "1" if {name1} ({ticker1}) has a stronger moat
-- "2" if {name2} ({ticker2}) has a stronger moat
-- "equal" if they have equally strong moats (very rare)
-
-Just respond with the number or "equal", nothing else."""
+    key = pair_key(ticker1, ticker2)
+    with pair_cache_lock:
+        cached_winner = pair_cache.get(key)
+    if cached_winner is not None:
+        print(f"  [cached] {ticker1} vs {ticker2} → {cached_winner} stronger")
+        return -1 if cached_winner == ticker1 else 1
+    
+    # Skip the call when the answer follows from earlier results by transitivity
+    with pair_cache_lock:
+        if ticker2 in stronger[ticker1]:
+            implied_winner = ticker1
+        elif ticker1 in stronger[ticker2]:
+            implied_winner = ticker2
+        else:
+            implied_winner = None
+    if implied_winner is not None:
+        print(f"  [implied] {ticker1} vs {ticker2} → {implied_winner} stronger")
+        return -1 if implied_winner == ticker1 else 1
+    
+    # Only the company pair varies between calls; the rubric is the shared system message
+    prompt = f"""Company 1: {name1} ({ticker1})
+Company 2: {name2} ({ticker2})"""
 
-    api_call_count += 1
-    print(f"  [Call #{api_call_count}] Comparing {ticker1} vs {ticker2}...", end=" ", flush=True)
+    with api_call_lock:
+        api_call_count += 1
+        call_number = api_call_count
+    
+    # Comparisons from concurrent merges interleave, so each result is printed on one line
+    label = f"  [Call #{call_number}] Comparing {ticker1} vs {ticker2}..."
+    
+    messages = [COMPARISON_SYSTEM_MESSAGE, {"role": "user", "content": prompt}]
     
     try:
-        response, _ = grok.simple_query_with_tokens(prompt, model="grok-4-fast")
-        response = response.strip().lower()
-        
-        if "1" in response or ticker1.lower() in response:
-            print(f"→ {ticker1} stronger")
-            return -1  # company1 has stronger moat (should come first)
-        elif "2" in response or ticker2.lower() in response:
-            print(f"→ {ticker2} stronger")
-            return 1   # company2 has stronger moat (should come first)
-        else:
-            # Default to company1 if unclear (shouldn't happen often)
-            print(f"→ unclear, defaulting to {ticker1}")
-            return -1
+        for _ in range(COMPARISON_ATTEMPTS):
+            # temperature=0 keeps answers deterministic so repeat comparisons hit the response cache
+            response, _ = grok.chat_completion_with_tokens(
+                messages,
+                model=COMPARISON_MODEL,
+                temperature=0,
+                max_tokens=COMPARISON_MAX_TOKENS
+            )
+            winner = parse_comparison(response, ticker1, ticker2)
+            if winner is not None:
+                break
+            # Drop the unclear reply from the response cache so the retry (and later runs) ask again
+            if getattr(grok, 'cache', None) is not None:
+                grok.cache.delete(grok.cache.make_key(COMPARISON_MODEL, messages, 0, COMPARISON_MAX_TOKENS))
     except Exception as e:
-        print(f"→ Error: {e}, defaulting to {ticker1}")
+        print(f"{label} → Error: {e}, defaulting to {ticker1}")
         return -1
+    
+    if winner == "equal":
+        print(f"{label} → equal")
+        return 0
+    if winner is None:
+        # Default to company1 if unclear (shouldn't happen often)
+        print(f"{label} → unclear, defaulting to {ticker1}")
+        return -1
+    
+    print(f"{label} → {winner} stronger")
+    with pair_cache_lock:
+        pair_cache[key] = winner
+        record_winner(winner, ticker2 if winner == ticker1 else ticker1)
+    return -1 if winner == ticker1 else 1
 
 
-def merge_sort_companies(grok, companies):
+def merge_sort_companies(grok, companies, max_workers=8, merge_runs=None):
     """
-    Merge sort implementation using Grok comparisons.
+    Bottom-up merge sort implementation using Grok comparisons.
+    
+    Each pass merges adjacent runs pairwise. The merges within a pass are
+    independent, so they are dispatched concurrently on a thread pool; only
+    the comparisons inside a single merge have to run in order.
     
     Args:
         grok: GrokClient instance
         companies: List of (ticker, company_name) tuples
+        max_workers: Maximum number of merges (and so API calls) in flight at once
+        merge_runs: Function (grok, left, right) -> merged list used for each merge.
+                    Defaults to merge (pairwise comparisons); merge_via_grok merges
+                    each pair of runs with a single request.
         
     Returns:
         Sorted list of companies (strongest moat first)
@@ -101,13 +286,20 @@ def merge_sort_companies(grok, companies):
     if len(companies) <= 1:
         return companies
     
-    # Split the list in half
-    mid = len(companies) // 2
-    left = merge_sort_companies(grok, companies[:mid])
-    right = merge_sort_companies(grok, companies[mid:])
+    merge_runs = merge_runs or merge
+    
+    runs = [[company] for company in companies]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while len(runs) > 1:
+            pairs = [(runs[i], runs[i + 1]) for i in range(0, len(runs) - 1, 2)]
+            merged = list(executor.map(lambda pair: merge_runs(grok, pair[0], pair[1]), pairs))
+            
+            # An odd run out waits for the next pass
+            if len(runs) % 2:
+                merged.append(runs[-1])
+            runs = merged
     
-    # Merge the two sorted halves
-    return merge(grok, left, right)
+    return runs[0]
 
 
 def merge(grok, left, right):
@@ -143,6 +335,205 @@ def merge(grok, left, right):
     return result
 
 
+def merge_via_grok(grok, left, right):
+    """
+    Merge two sorted lists of companies with a single Grok request.
+    
+    Grok is shown both lists and asked for the combined order, so a merge costs
+    one call instead of up to len(left) + len(right) - 1 comparisons. If the reply
+    can't be parsed or isn't an ordering of exactly the input tickers, falls back
+    to the pairwise merge.
+    
+    Args:
+        grok: GrokClient instance
+        left: Sorted list of companies (strongest moat first)
+        right: Sorted list of companies (strongest moat first)
+        
+    Returns:
+        Merged sorted list
+    """
+    global api_call_count
+    
+    if not left or not right:
+        return left + right
+    if len(left) == 1 and len(right) == 1:
+        # A single comparison is already one call, and can use the pair cache
+        return merge(grok, left, right)
+    
+    list_a = "\n".join(f"- {name} ({ticker})" for ticker, name in left)
+    list_b = "\n".join(f"- {name} ({ticker})" for ticker, name in right)
+    prompt = f"""Below are two lists of companies, each already sorted by competitive moat strength, strongest first.
+
+List A:
+{list_a}
+
+List B:
+{list_b}
+
+Merge them into one list sorted by competitive moat strength, strongest first, keeping each list's own order.
+
+Respond with ONLY a JSON object of the form {{"merged": ["TICKER1", "TICKER2", ...]}} containing every ticker above exactly once, nothing else."""
+
+    with api_call_lock:
+        api_call_count += 1
+        call_number = api_call_count
+    
+    label = f"  [Call #{call_number}] Merging {len(left)} + {len(right)} companies..."
+    
+    try:
+        response, _ = grok.chat_completion_with_tokens(
+            [{"role": "user", "content": prompt}],
+            model="grok-4-fast",
+            temperature=0
+        )
+        json_start = response.find('{')
+        parsed, _ = json.JSONDecoder().raw_decode(response, json_start)
+        merged_tickers = [str(ticker).strip().upper() for ticker in parsed["merged"]]
+    except Exception as e:
+        print(f"{label} → Error: {e}, falling back to pairwise comparisons")
+        return merge(grok, left, right)
+    
+    by_ticker = {company[0]: company for company in left + right}
+    if sorted(merged_tickers) != sorted(by_ticker):
+        print(f"{label} → incomplete merge, falling back to pairwise comparisons")
+        return merge(grok, left, right)
+    
+    print(f"{label} → {' > '.join(merged_tickers)}")
+    return [by_ticker[ticker] for ticker in merged_tickers]
+
+
+def rank_companies_batch(grok, companies):
+    """
+    Rank all companies by moat strength with a single Grok request.
+    
+    Args:
+        grok: GrokClient instance
+        companies: List of (ticker, company_name) tuples
+        
+    Returns:
+        Sorted list of companies (strongest moat first). Companies Grok leaves out
+        of its ranking keep their input order at the end of the list.
+    """
+    global api_call_count
+    
+    if len(companies) <= 1:
+        return companies
+    
+    company_lines = "\n".join(f"- {name} ({ticker})" for ticker, name in companies)
+    prompt = f"""Rank these companies by the strength of their competitive moat, strongest first:
+
+{company_lines}
+
+Consider factors like:
+- Brand strength and customer loyalty
+- Network effects
+- Switching costs
+- Economies of scale
+- Patents/intellectual property
+- Regulatory barriers
+- Unique resources or capabilities
+
+Respond with ONLY a JSON object of the form {{"ranking": ["TICKER1", "TICKER2", ...]}} containing every ticker above exactly once, nothing else."""
+
+    with api_call_lock:
+        api_call_count += 1
+    
+    try:
+        response, _ = grok.chat_completion_with_tokens(
+            [{"role": "user", "content": prompt}],
+            model="grok-4-fast",
+            temperature=0
+        )
+        ranking = []
+        json_start = response.find('{')
+        if json_start >= 0:
+            parsed, _ = json.JSONDecoder().raw_decode(response, json_start)
+            ranking = parsed.get("ranking", [])
+    except Exception as e:
+        print(f"Error ranking companies: {e}")
+        ranking = []
+    
+    by_ticker = {ticker: (ticker, name) for ticker, name in companies}
+    ranked = []
+    for ticker in ranking:
+        company = by_ticker.pop(str(ticker).strip().upper(), None)
+        if company:
+            ranked.append(company)
+    
+    if by_ticker:
+        print(f"Warning: Grok did not rank {', '.join(by_ticker)}; placing them last.")
+    ranked.extend(company for company in companies if company[0] in by_ticker)
+    return ranked
+
+
+def score_company(grok, company):
+    """
+    Ask Grok for an absolute 0-100 moat strength score for one company.
+    
+    Args:
+        grok: GrokClient instance
+        company: Tuple of (ticker, company_name)
+        
+    Returns:
+        int: Moat score from 0 to 100, or None if Grok's answer could not be parsed
+    """
+    global api_call_count
+    
+    ticker, name = company
+    prompt = f"Rate the competitive moat strength of {name} ({ticker}) from 0 to 100. Reply with only the number."
+    messages = [{"role": "user", "content": prompt}]
+    
+    try:
+        for _ in range(COMPARISON_ATTEMPTS):
+            with api_call_lock:
+                api_call_count += 1
+            # temperature=0 keeps answers deterministic so repeat runs hit the response cache
+            response, _ = grok.chat_completion_with_tokens(
+                messages,
+                model=COMPARISON_MODEL,
+                temperature=0,
+                max_tokens=COMPARISON_MAX_TOKENS
+            )
+            match = SCORE_RE.search(response or "")
+            if match:
+                score = min(int(match.group()), 100)
+                print(f"  {ticker}: {score}")
+                return score
+            if not (response or "").strip():
+                print(f"  {ticker}: empty reply")
+            else:
+                print(f"  {ticker}: could not parse score from {response!r}")
+            # Drop the reply from the response cache so the retry (and later runs) ask again
+            if getattr(grok, 'cache', None) is not None:
+                grok.cache.delete(grok.cache.make_key(COMPARISON_MODEL, messages, 0, COMPARISON_MAX_TOKENS))
+    except Exception as e:
+        print(f"  {ticker}: Error: {e}")
+    return None
+
+
+def rank_companies_by_score(grok, companies, max_workers=8):
+    """
+    Rank companies by independently scoring each one's moat, in parallel.
+    
+    Needs n API calls instead of the ~n*log2(n) comparisons of the merge sort.
+    
+    Args:
+        grok: GrokClient instance
+        companies: List of (ticker, company_name) tuples
+        max_workers: Maximum number of scoring requests in flight at once
+        
+    Returns:
+        Sorted list of companies (strongest moat first). Companies that could not
+        be scored are placed last in their input order.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        scores = list(executor.map(lambda company: score_company(grok, company), companies))
+    
+    # sorted() is stable, so ties keep their input order
+    ranked = sorted(zip(companies, scores), key=lambda item: -1 if item[1] is None else item[1], reverse=True)
+    return [company for company, _ in ranked]
+
+
 def parse_tickers_input(input_str):
     """
     Parse space-separated tickers and convert to (ticker, company_name) tuples.
@@ -208,9 +599,21 @@ def parse_tickers_input(input_str):
 
 
 def main():
-    """Main function to sort companies by moat strength."""
+    """
+    Main function to sort companies by moat strength.
+    
+    By default all companies are ranked with a single batched Grok request.
+    Pass --method=score to score each company independently (n calls),
+    --method=merge to rank with pairwise merge-sort comparisons, or
+    --method=listmerge to merge sort with one request per merge instead.
+    """
     global api_call_count
     
+    method = "batch"
+    for arg in sys.argv[1:]:
+        if arg in ("--method=merge", "--method=listmerge", "--method=score", "--method=batch"):
+            method = arg.split("=", 1)[1]
+    
     print("=" * 80)
     print("Grok-Powered Moat Score Sorter")
     print("=" * 80)
@@ -226,41 +629,35 @@ def main():
         companies = parse_tickers_input(user_input)
         if companies is None:
             print("\nUsing default companies instead...")
-            companies = [
-                ("AAPL", "Apple Inc"),
-                ("MSFT", "Microsoft Corporation"),
-                ("GOOGL", "Alphabet Inc"),
-                ("AMZN", "Amazon.com Inc"),
-                ("NVDA", "NVIDIA Corporation"),
-                ("META", "Meta Platforms Inc"),
-                ("TSLA", "Tesla Inc"),
-                ("JPM", "JPMorgan Chase & Co"),
-                ("V", "Visa Inc"),
-                ("JNJ", "Johnson & Johnson"),
-            ]
+            companies = list(DEFAULT_COMPANIES)
     else:
-        # Use default companies
-        companies = [
-            ("AAPL", "Apple Inc"),
-            ("MSFT", "Microsoft Corporation"),
-            ("GOOGL", "Alphabet Inc"),
-            ("AMZN", "Amazon.com Inc"),
-            ("NVDA", "NVIDIA Corporation"),
-            ("META", "Meta Platforms Inc"),
-            ("TSLA", "Tesla Inc"),
-            ("JPM", "JPMorgan Chase & Co"),
-            ("V", "Visa Inc"),
-            ("JNJ", "Johnson & Johnson"),
-        ]
+        companies = list(DEFAULT_COMPANIES)
+    
+    expected_merge_calls = int(len(companies) * math.log2(len(companies)))
     
     print(f"\nRanking {len(companies)} companies by competitive moat strength...")
-    print("Using merge sort (O(n log n)) with Grok API comparisons")
-    print(f"Expected API calls: ~{len(companies)} * log2({len(companies)}) ≈ {int(len(companies) * __import__('math').log2(len(companies)))}")
+    if method == "merge":
+        print("Using merge sort (O(n log n)) with Grok API comparisons")
+        print(f"Expected API calls: ~{len(companies)} * log2({len(companies)}) ≈ {expected_merge_calls}")
+    elif method == "listmerge":
+        print("Using merge sort with one Grok request per merge")
+        print(f"Expected API calls: ~{len(companies) - 1}")
+    elif method == "score":
+        print("Scoring each company's moat independently with Grok (0-100)")
+        print(f"Expected API calls: {len(companies)}")
+    else:
+        print("Using a single batched Grok ranking request (pass --method=score or --method=merge to change)")
     print()
     
     # Initialize Grok client
     try:
-        grok = GrokClient(api_key=XAI_API_KEY)
+        grok = ConcurrentGrokClient(
+            api_key=XAI_API_KEY,
+            cache=ResponseCache(RESPONSE_CACHE_FILE),
+            max_concurrent_requests=MAX_CONCURRENT_REQUESTS,
+            requests_per_minute=REQUESTS_PER_MINUTE,
+            tokens_per_minute=TOKENS_PER_MINUTE
+        )
     except Exception as e:
         print(f"Error initializing Grok client: {e}")
         print("\nTo fix this:")
@@ -272,12 +669,27 @@ def main():
     # Reset API call counter
     api_call_count = 0
     
+    # Reuse winners from previous runs
+    load_pair_cache()
+    
     # Start timing
     start_time = time.time()
     
-    # Sort companies using merge sort
-    print("Starting merge sort with Grok comparisons...\n")
-    sorted_companies = merge_sort_companies(grok, companies.copy())
+    if method == "merge":
+        # Sort companies using merge sort
+        print("Starting merge sort with Grok comparisons...\n")
+        sorted_companies = merge_sort_companies(grok, companies.copy())
+        save_pair_cache()
+    elif method == "listmerge":
+        print("Starting merge sort with one Grok request per merge...\n")
+        sorted_companies = merge_sort_companies(grok, companies.copy(), merge_runs=merge_via_grok)
+        save_pair_cache()
+    elif method == "score":
+        print("Scoring companies with Grok...\n")
+        sorted_companies = rank_companies_by_score(grok, companies)
+    else:
+        print("Requesting batched ranking from Grok...\n")
+        sorted_companies = rank_companies_batch(grok, companies)
     
     # End timing
     elapsed_time = time.time() - start_time
@@ -294,7 +706,8 @@ def main():
     print()
     print("=" * 80)
     print(f"Total Grok API calls: {api_call_count}")
-    print(f"Expected calls (n*log2(n)): {int(len(companies) * __import__('math').log2(len(companies)))}")
+    if method == "merge":
+        print(f"Expected calls (n*log2(n)): {expected_merge_calls}")
     print(f"Time elapsed: {elapsed_time:.2f} seconds")
     print("=" * 80)
 
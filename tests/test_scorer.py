@@ -184,6 +184,139 @@ class TestCalculatePercentileRank:
         assert percentile == 100
 
 
+class TestParseScore:
+    """Test the _parse_score and get_missing_score_keys functions."""
+
+    def test_parse_score_valid(self):
+        """Test that score replies are parsed to ints."""
+        assert scorer._parse_score(" 7\n") == 7
+        assert scorer._parse_score("0") == 0
+        assert scorer._parse_score("10") == 10
+        assert scorer._parse_score("8.0") == 8
+        assert scorer._parse_score("**7**") == 7
+        assert scorer._parse_score("`6` ") == 6
+
+    def test_parse_score_invalid(self):
+        """Test that non-numeric or out-of-range replies give None."""
+        assert scorer._parse_score("high") is None
+        assert scorer._parse_score("11") is None
+        assert scorer._parse_score("-1") is None
+        assert scorer._parse_score("") is None
+        assert scorer._parse_score("7.5") is None
+        assert scorer._parse_score("nan") is None
+
+    def test_zero_score_is_not_missing(self):
+        """Test that a score of 0 counts as present."""
+        scores = {key: 0 for key in scorer.SCORE_DEFINITIONS}
+        assert scorer.get_missing_score_keys(scores) == []
+
+        scores['moat_score'] = None
+        assert scorer.get_missing_score_keys(scores) == ['moat_score']
+
+
+class TestQueryWithCache:
+    """Test query_with_cache against a temporary ResponseCache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        from src.clients.response_cache import ResponseCache
+        response_cache = ResponseCache(str(tmp_path / "cache.db"))
+        with patch.object(scorer, '_score_response_cache', response_cache):
+            yield response_cache
+
+    @staticmethod
+    def make_client(*responses):
+        grok = MagicMock()
+        grok.chat_completion_with_tokens.side_effect = [
+            (response, {'prompt_tokens': 10, 'completion_tokens': 1, 'total_tokens': 11}) for response in responses
+        ]
+        return grok
+
+    @staticmethod
+    def is_valid(text):
+        return scorer._parse_score(text) is not None
+
+    def test_miss_then_hit(self, cache):
+        """Test that a valid reply is cached and served with zero tokens."""
+        grok = self.make_client("7")
+        response, usage = scorer.query_with_cache(grok, "prompt", "model", is_valid=self.is_valid)
+        assert response == "7"
+        assert usage['total_tokens'] == 11
+
+        response, usage = scorer.query_with_cache(grok, "prompt", "model", is_valid=self.is_valid)
+        assert response == "7"
+        assert usage['cache_hit'] is True
+        assert usage['total_tokens'] == 0
+        assert grok.chat_completion_with_tokens.call_count == 1
+
+    def test_invalid_reply_not_cached(self, cache):
+        """Test that a reply rejected by is_valid is queried again next time."""
+        grok = self.make_client("high", "8")
+        assert scorer.query_with_cache(grok, "prompt", "model", is_valid=self.is_valid)[0] == "high"
+        assert scorer.query_with_cache(grok, "prompt", "model", is_valid=self.is_valid)[0] == "8"
+        assert grok.chat_completion_with_tokens.call_count == 2
+
+    def test_poisoned_entry_is_evicted(self, cache):
+        """Test that an invalid cached reply is replaced by a fresh one."""
+        from src.clients.response_cache import ResponseCache
+        messages = [{"role": "user", "content": "prompt"}]
+        cache.set(ResponseCache.make_key("model", messages, 0.7, None), "garbage", {})
+
+        grok = self.make_client("6")
+        response, usage = scorer.query_with_cache(grok, "prompt", "model", is_valid=self.is_valid)
+        assert response == "6"
+        assert 'cache_hit' not in usage
+        assert scorer.query_with_cache(grok, "prompt", "model", is_valid=self.is_valid)[0] == "6"
+        assert grok.chat_completion_with_tokens.call_count == 1
+
+    def test_temperature_is_part_of_key(self, cache):
+        """Test that different temperatures don't share a cache entry."""
+        grok = self.make_client("5", "9")
+        assert scorer.query_with_cache(grok, "prompt", "model", temperature=0.7)[0] == "5"
+        assert scorer.query_with_cache(grok, "prompt", "model", temperature=0.0)[0] == "9"
+        assert grok.chat_completion_with_tokens.call_count == 2
+
+    def test_use_cache_false_bypasses_cache(self, cache):
+        """Test that use_cache=False always queries the API."""
+        grok = self.make_client("4", "4")
+        scorer.query_with_cache(grok, "prompt", "model", use_cache=False)
+        scorer.query_with_cache(grok, "prompt", "model", use_cache=False)
+        assert grok.chat_completion_with_tokens.call_count == 2
+
+
+class TestMigrateStringifiedScores:
+    """Test migrate_stringified_scores function."""
+    
+    @pytest.fixture
+    def scores_file(self, tmp_path):
+        """Point scorer at a temporary scores.json."""
+        path = tmp_path / 'scores.json'
+        with patch.object(scorer, 'SCORES_FILE', str(path)), patch.object(scorer, '_scores_cache', None):
+            yield path
+    
+    def test_converts_parseable_strings(self, scores_file):
+        """Test plain and markdown-wrapped numbers are converted to ints."""
+        scores_file.write_text(json.dumps({'companies': {
+            'TEST': {'moat_score': '7', 'barriers_score': '**8**', 'disruption_risk': 3}
+        }}))
+        converted, unparseable = scorer.migrate_stringified_scores()
+        assert converted == 2
+        assert unparseable == []
+        data = json.loads(scores_file.read_text())['companies']['TEST']
+        assert data == {'moat_score': 7, 'barriers_score': 8, 'disruption_risk': 3}
+    
+    def test_unparseable_strings_are_kept(self, scores_file):
+        """Test strings that aren't a 0-10 score are reported and left unchanged."""
+        scores_file.write_text(json.dumps({'companies': {
+            'TEST': {'moat_score': '7/10', 'barriers_score': 'high'}
+        }}))
+        converted, unparseable = scorer.migrate_stringified_scores()
+        assert converted == 0
+        assert sorted(unparseable) == [('TEST', 'barriers_score', 'high'), ('TEST', 'moat_score', '7/10')]
+        data = json.loads(scores_file.read_text())['companies']['TEST']
+        assert data == {'moat_score': '7/10', 'barriers_score': 'high'}
+
+
 class TestFormatTotalScore:
     """Test the format_total_score function."""
     
@@ -0,0 +1,147 @@
+"""
+Unit tests for the pair cache, transitive comparisons and per-company scoring in sorter.py
+"""
+
+import pytest
+import json
+from collections import defaultdict
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from src.utils import sorter
+
+
+@pytest.fixture(autouse=True)
+def fresh_pair_cache(tmp_path):
+    """Give each test an empty pair cache backed by a temporary file."""
+    with patch.object(sorter, 'pair_cache', {}), \
+            patch.object(sorter, 'stronger', defaultdict(set)), \
+            patch.object(sorter, 'PAIR_CACHE_FILE', str(tmp_path / 'pair_cache.json')):
+        yield
+
+
+def make_client(*responses):
+    """Grok client stub that returns the given replies in order, with no response cache."""
+    grok = MagicMock()
+    grok.cache = None
+    grok.chat_completion_with_tokens.side_effect = [(response, {}) for response in responses]
+    return grok
+
+
+class TestPairKey:
+    """Test pair_key function."""
+
+    def test_order_invariant(self):
+        """Test both orders of a pair share one key."""
+        assert sorter.pair_key('MSFT', 'AAPL') == sorter.pair_key('AAPL', 'MSFT')
+
+    def test_includes_model(self):
+        """Test winners from different models don't share a key."""
+        assert sorter.pair_key('AAPL', 'MSFT') == f'{sorter.COMPARISON_MODEL}|AAPL|MSFT'
+        assert sorter.pair_key('AAPL', 'MSFT', model='other-model') != sorter.pair_key('AAPL', 'MSFT')
+
+
+class TestRecordWinner:
+    """Test the transitive closure kept by record_winner."""
+
+    def test_chain_is_inferred(self):
+        """Test A > B and B > C gives A > C."""
+        sorter.record_winner('A', 'B')
+        sorter.record_winner('B', 'C')
+        assert sorter.stronger['A'] == {'B', 'C'}
+        assert sorter.stronger['B'] == {'C'}
+
+    def test_new_top_inherits_everything_below(self):
+        """Test a winner over the top of a chain beats the whole chain."""
+        sorter.record_winner('B', 'C')
+        sorter.record_winner('A', 'B')
+        sorter.record_winner('X', 'A')
+        assert sorter.stronger['X'] == {'A', 'B', 'C'}
+        assert 'X' not in sorter.stronger['A']
+
+
+class TestCompareCompanies:
+    """Test compare_companies_grok's use of the pair cache."""
+
+    def test_answer_is_cached(self):
+        """Test a comparison is stored and the repeat doesn't call Grok."""
+        grok = make_client('2')
+        assert sorter.compare_companies_grok(grok, ('AAPL', 'Apple'), ('MSFT', 'Microsoft')) == 1
+        assert sorter.pair_cache == {sorter.pair_key('AAPL', 'MSFT'): 'MSFT'}
+
+        # Reversed order is served from the cache
+        assert sorter.compare_companies_grok(grok, ('MSFT', 'Microsoft'), ('AAPL', 'Apple')) == -1
+        assert grok.chat_completion_with_tokens.call_count == 1
+
+    def test_implied_answer_skips_call(self):
+        """Test a comparison that follows by transitivity doesn't call Grok."""
+        grok = make_client('1', '1')
+        sorter.compare_companies_grok(grok, ('A', 'a'), ('B', 'b'))
+        sorter.compare_companies_grok(grok, ('B', 'b'), ('C', 'c'))
+        assert sorter.compare_companies_grok(grok, ('C', 'c'), ('A', 'a')) == 1
+        assert grok.chat_completion_with_tokens.call_count == 2
+
+    def test_unclear_reply_is_retried_and_not_cached(self):
+        """Test an empty reply is retried, and nothing is cached if no answer comes back."""
+        grok = make_client(None, '')
+        assert sorter.compare_companies_grok(grok, ('A', 'a'), ('B', 'b')) == -1
+        assert grok.chat_completion_with_tokens.call_count == sorter.COMPARISON_ATTEMPTS
+        assert sorter.pair_cache == {}
+
+    def test_equal_is_not_a_winner(self):
+        """Test an 'equal' reply compares as 0 and records no winner."""
+        grok = make_client('equal')
+        assert sorter.compare_companies_grok(grok, ('A', 'a'), ('B', 'b')) == 0
+        assert sorter.pair_cache == {}
+
+
+class TestLoadSavePairCache:
+    """Test load_pair_cache and save_pair_cache functions."""
+
+    def test_round_trip_rebuilds_closure(self):
+        """Test saved winners reload into pair_cache and the transitive closure."""
+        sorter.pair_cache[sorter.pair_key('A', 'B')] = 'A'
+        sorter.pair_cache[sorter.pair_key('B', 'C')] = 'B'
+        sorter.save_pair_cache()
+
+        with patch.object(sorter, 'pair_cache', {}), patch.object(sorter, 'stronger', defaultdict(set)):
+            sorter.load_pair_cache()
+            assert len(sorter.pair_cache) == 2
+            assert sorter.stronger['A'] == {'B', 'C'}
+
+    def test_other_models_and_legacy_keys(self):
+        """Test other models' winners aren't used for inference and legacy keys are dropped."""
+        with open(sorter.PAIR_CACHE_FILE, 'w') as f:
+            json.dump({
+                'A|B': 'A',
+                sorter.pair_key('C', 'D', model='other-model'): 'C',
+            }, f)
+
+        sorter.load_pair_cache()
+        assert list(sorter.pair_cache) == [sorter.pair_key('C', 'D', model='other-model')]
+        assert not any(sorter.stronger.values())
+
+
+class TestScoreCompany:
+    """Test score_company function."""
+
+    def test_parses_score(self):
+        """Test a numeric reply is returned as the score."""
+        grok = make_client('85')
+        assert sorter.score_company(grok, ('AAPL', 'Apple')) == 85
+
+    def test_empty_reply_is_retried(self):
+        """Test a None reply is retried and each request is counted."""
+        grok = make_client(None, '72')
+        with patch.object(sorter, 'api_call_count', 0):
+            assert sorter.score_company(grok, ('AAPL', 'Apple')) == 72
+            assert sorter.api_call_count == 2
+        assert grok.chat_completion_with_tokens.call_count == 2
+
+    def test_gives_up_after_attempts(self):
+        """Test None is returned when no attempt yields a number."""
+        grok = make_client('', 'strong')
+        assert sorter.score_company(grok, ('AAPL', 'Apple')) is None
+        assert grok.chat_completion_with_tokens.call_count == sorter.COMPARISON_ATTEMPTS